@@ -0,0 +1,178 @@
+# Bed allocation: atomic admit/discharge and a per-ward availability index
+#
+# Every allocation runs inside BEGIN IMMEDIATE, which takes SQLite's write
+# lock before the first read, and each UPDATE re-checks status = 'Available'
+# in its WHERE clause. Two desks admitting into the same ward therefore queue
+# on the lock and the second one gets the next free bed; nobody can occupy a
+# bed that was taken after their page was drawn. A patient already holding a
+# bed is not given a second one.
+#
+# BedIndex mirrors the beds table in memory, one per process, and is kept
+# current from the change log (see changes.py): a sync reads only the bed
+# events since its last seq and re-reads those rows by id, so the page's
+# per-ward counts and pickers never scan the table after the first load.
+import threading
+from datetime import datetime
+
+from changes import catch_up
+
+WARD_TYPES = ["General", "ICU", "Private", "Emergency", "Pediatric"]
+
+# first free bed of the ward, in bed_id order: one seek of idx_beds_status;
+# the patient checks are seeks of the primary key and idx_beds_patient
+ADMIT_TO_WARD_SQL = """
+    UPDATE beds SET status = 'Occupied', patient_id = :patient, admission_date = :day
+    WHERE bed_id = (SELECT bed_id FROM beds WHERE status = 'Available' AND ward_type = :ward
+                    ORDER BY bed_id LIMIT 1)
+      AND EXISTS (SELECT 1 FROM patients WHERE patient_id = :patient)
+      AND NOT EXISTS (SELECT 1 FROM beds WHERE patient_id = :patient AND status = 'Occupied')
+    RETURNING bed_id, bed_number
+"""
+
+ADMIT_TO_BED_SQL = """
+    UPDATE beds SET status = 'Occupied', patient_id = :patient, admission_date = :day
+    WHERE bed_id = :bed AND status = 'Available'
+      AND EXISTS (SELECT 1 FROM patients WHERE patient_id = :patient)
+      AND NOT EXISTS (SELECT 1 FROM beds WHERE patient_id = :patient AND status = 'Occupied')
+    RETURNING bed_id, bed_number
+"""
+
+BED_ROWS_SQL = "SELECT bed_id, bed_number, ward_type, status, patient_id FROM beds"
+
+def _immediate(conn, work):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        result = work()
+        conn.commit()
+        return result
+    except Exception:
+        conn.rollback()
+        raise
+
+def _admit(conn, patient_id, ward_type=None, bed_id=None, day=None):
+    params = {'patient': patient_id, 'ward': ward_type, 'bed': bed_id,
+              'day': day or datetime.now().strftime('%Y-%m-%d')}
+    return conn.execute(ADMIT_TO_BED_SQL if bed_id is not None else ADMIT_TO_WARD_SQL, params).fetchone()
+
+def _refusal(conn, patient_id, ward_type, bed_id):
+    if not conn.execute("SELECT 1 FROM patients WHERE patient_id = ?", (patient_id,)).fetchone():
+        return f"no patient #{patient_id}"
+    if conn.execute("SELECT 1 FROM beds WHERE patient_id = ? AND status = 'Occupied'", (patient_id,)).fetchone():
+        return f"patient #{patient_id} already occupies a bed"
+    if bed_id is not None:
+        return f"bed #{bed_id} is no longer available"
+    return f"no {ward_type} bed is available"
+
+def admit(conn, patient_id, ward_type=None, bed_id=None):
+    """Give patient_id bed_id, or the first free bed of ward_type; return (bed_id, bed_number).
+
+    Raises ValueError, with the transaction rolled back, when the bed was
+    taken, the ward is full, or the patient is unknown or already has a bed.
+    """
+    def work():
+        row = _admit(conn, patient_id, ward_type, bed_id)
+        if row is None:
+            raise ValueError(_refusal(conn, patient_id, ward_type, bed_id))
+        return tuple(row)
+    return _immediate(conn, work)
+
+def admit_many(conn, admissions):
+    """Admit each (patient_id, ward_type) in one transaction, in order.
+
+    Returns [(patient_id, bed_id or None, bed_number or reason)]; patients
+    who cannot be placed are reported and skipped, the rest are committed.
+    """
+    def work():
+        day = datetime.now().strftime('%Y-%m-%d')
+        results = []
+        for patient_id, ward_type in admissions:
+            row = _admit(conn, patient_id, ward_type, day=day)
+            if row is None:
+                results.append((patient_id, None, _refusal(conn, patient_id, ward_type, None)))
+            else:
+                results.append((patient_id, row[0], row[1]))
+        return results
+    return _immediate(conn, work)
+
+def discharge_many(conn, bed_ids):
+    """Free the given occupied beds in one transaction; return the ids actually freed."""
+    bed_ids = list(bed_ids)
+    if not bed_ids:
+        return []
+    marks = ', '.join('?' * len(bed_ids))
+    return _immediate(conn, lambda: [row[0] for row in conn.execute(
+        f"""UPDATE beds SET status = 'Available', patient_id = NULL, admission_date = NULL
+            WHERE bed_id IN ({marks}) AND status = 'Occupied' RETURNING bed_id""", bed_ids)])
+
+def discharge(conn, bed_id):
+    if not discharge_many(conn, [bed_id]):
+        raise ValueError(f"bed #{bed_id} is not occupied")
+
+class BedIndex:
+    """In-memory {bed_id: (bed_number, ward_type, status, patient_id)} synced from the change log."""
+
+    def __init__(self):
+        self.seq = None
+        self.loads = 0
+        self._beds = {}
+        self._free = {}  # ward_type -> set of available bed_ids
+        self._lock = threading.Lock()
+
+    def _put(self, bed_id, row):
+        old = self._beds.pop(bed_id, None)
+        if old is not None:
+            self._free.get(old[1], set()).discard(bed_id)
+        if row is not None:
+            self._beds[bed_id] = row
+            if row[2] == 'Available':
+                self._free.setdefault(row[1], set()).add(bed_id)
+
+    def _load(self, conn):
+        self._beds, self._free = {}, {}
+        for bed_id, *row in conn.execute(BED_ROWS_SQL):
+            self._put(bed_id, tuple(row))
+        self.loads += 1
+
+    def _apply(self, conn, ids):
+        rows = {bed_id: tuple(row) for bed_id, *row in conn.execute(
+            f"{BED_ROWS_SQL} WHERE bed_id IN ({', '.join('?' * len(ids))})", ids)}
+        for bed_id in ids:
+            self._put(bed_id, rows.get(bed_id))
+
+    def sync(self, conn):
+        """Apply bed changes committed since the last sync; the first sync loads the table."""
+        with self._lock:
+            conn.execute("BEGIN")
+            try:
+                self.seq = catch_up(conn, 'beds', self.seq, lambda: self._load(conn), lambda ids: self._apply(conn, ids))
+            finally:
+                conn.rollback()
+
+    def counts(self):
+        """{ward_type: (available, total)}."""
+        with self._lock:
+            totals = {}
+            for _, ward, _, _ in self._beds.values():
+                totals[ward] = totals.get(ward, 0) + 1
+            return {ward: (len(self._free.get(ward, ())), total) for ward, total in sorted(totals.items(), key=lambda item: str(item[0]))}
+
+    def available(self, ward_type):
+        """{bed_id: bed_number} of the ward's free beds, in bed_id order."""
+        with self._lock:
+            return {bed_id: self._beds[bed_id][0] for bed_id in sorted(self._free.get(ward_type, ()))}
+
+    def occupied(self):
+        """{bed_id: (bed_number, ward_type, patient_id)} of every occupied bed."""
+        with self._lock:
+            return {bed_id: (number, ward, patient_id) for bed_id, (number, ward, status, patient_id)
+                    in sorted(self._beds.items()) if status == 'Occupied'}
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def bed_index(conn, db_name):
+    """The process-wide BedIndex for db_name, synced through conn."""
+    with _indexes_lock:
+        index = _indexes.setdefault(db_name, BedIndex())
+    index.sync(conn)
+    return index
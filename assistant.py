@@ -0,0 +1,289 @@
+# Rule-based question answering for the AI Assistant page
+#
+# A question is tokenised by one precompiled alternation of every keyword
+# pattern (plus a second one over department and doctor names, rebuilt when
+# those tables change). The hits select an intent and its entities, which fill
+# a parameterized SQL template. Answers go through the shared query cache, so a
+# repeated question costs a dictionary lookup until its tables are written.
+import re
+from datetime import date, timedelta
+
+from cache import cached
+from pool import get_conn
+
+LIST_LIMIT = 10
+
+KEYWORDS = {
+    'count': r"how many|count|number of|total number",
+    'list': r"show|list|display|which|who|find|give me",
+    'top': r"most|top|busiest|highest|best",
+    'average': r"average|avg|mean",
+    'revenue': r"revenue|income|earnings?|collections?",
+    'low': r"low|short(?:age)?|running out|reorder",
+    'fee': r"fees?|charges?",
+}
+
+SUBJECTS = {
+    'patients': r"patients?",
+    'doctors': r"doctors?|physicians?|consultants?",
+    'staff': r"staff|employees?|nurses?",
+    'appointments': r"appointments?|visits?|bookings?",
+    'beds': r"beds?|wards?",
+    'tests': r"(?:lab )?tests?",
+    'ambulances': r"ambulances?",
+    'bills': r"bills?|invoices?",
+    'stock': r"stock|inventory|supplies|items?",
+    'blood': r"blood",
+}
+
+STATUSES = {
+    'Scheduled': r"scheduled|upcoming",
+    'Completed': r"completed|done|finished",
+    'Cancelled': r"cancell?ed",
+    'Pending': r"pending|unpaid|outstanding",
+    'Paid': r"paid",
+    'Available': r"available|free|vacant",
+    'Occupied': r"occupied",
+    'On Duty': r"on duty|dispatched",
+}
+
+DATES = r"today|yesterday|this week|last week|this month|last month|(?:last|past) \d+ days|\d{4}-\d{2}-\d{2}"
+
+def _group_name(prefix, name):
+    return prefix + '_' + name.replace(' ', '_')
+
+def _alternatives(prefix, patterns):
+    return [rf"(?P<{_group_name(prefix, name)}>\b(?:{pattern})\b)" for name, pattern in patterns.items()]
+
+_GROUPS = {_group_name(prefix, name): (prefix, name)
+           for prefix, patterns in (('kw', KEYWORDS), ('subj', SUBJECTS), ('status', STATUSES))
+           for name in patterns}
+
+MATCHER = re.compile(
+    '|'.join([rf"(?P<date>\b(?:{DATES})\b)"] + _alternatives('status', STATUSES)
+             + _alternatives('kw', KEYWORDS) + _alternatives('subj', SUBJECTS)),
+    re.IGNORECASE,
+)
+
+# subject -> how to count and list it, and which columns the entities filter on
+SOURCES = {
+    'patients': dict(source="patients p", count="COUNT(*)", columns="p.name, p.age, p.phone",
+                     date="p.registration_date", order="p.patient_id DESC", label="Patients"),
+    'visits': dict(source="""patients p JOIN appointments a ON a.patient_id = p.patient_id
+                             JOIN doctors d ON d.doctor_id = a.doctor_id""",
+                   count="COUNT(DISTINCT p.patient_id)", columns="DISTINCT p.name, p.age, p.phone",
+                   date="a.appointment_date", status="a.status", dept="d.dept_id", doctor="d.doctor_id",
+                   order="p.name", label="Patients"),
+    'appointments': dict(source="""appointments a JOIN patients p ON p.patient_id = a.patient_id
+                                   JOIN doctors d ON d.doctor_id = a.doctor_id""",
+                         count="COUNT(*)", columns="p.name, d.name, a.appointment_date, a.status, a.reason",
+                         date="a.appointment_date", status="a.status", dept="d.dept_id", doctor="d.doctor_id",
+                         order="a.appointment_date DESC", label="Appointments"),
+    'doctors': dict(source="doctors d", count="COUNT(*)", columns="d.name, d.specialization, d.consultation_fee",
+                    dept="d.dept_id", doctor="d.doctor_id", order="d.name", label="Doctors"),
+    'staff': dict(source="staff s", count="COUNT(*)", columns="s.name, s.role", date="s.join_date",
+                  dept="s.dept_id", order="s.name", label="Staff"),
+    'beds': dict(source="beds b", count="COUNT(*)", columns="b.bed_number, b.ward_type, b.status",
+                 status="b.status", order="b.bed_number", label="Beds"),
+    'tests': dict(source="lab_tests l JOIN patients p ON p.patient_id = l.patient_id", count="COUNT(*)",
+                  columns="p.name, l.test_name, l.status, l.test_date", date="l.test_date", status="l.status",
+                  order="l.test_date DESC", label="Lab Tests"),
+    'ambulances': dict(source="ambulance am", count="COUNT(*)", columns="am.vehicle_number, am.driver_name, am.status",
+                       status="am.status", order="am.vehicle_number", label="Ambulances"),
+    'bills': dict(source="billing b JOIN patients p ON p.patient_id = b.patient_id", count="COUNT(*), TOTAL(b.amount)",
+                  columns="b.bill_id, p.name, b.amount, b.payment_status", date="b.payment_date",
+                  status="b.payment_status", order="b.bill_id DESC", label="Bills"),
+    'stock': dict(source="inventory i", count="COUNT(*)", columns="i.item_name, i.quantity",
+                  low="i.quantity < i.reorder_level", order="i.quantity", label="Items"),
+}
+
+HELP = ("I can answer questions like: how many patients / appointments / beds / tests / bills, "
+        "with a status (scheduled, completed, pending, available...), a department or doctor name, "
+        "and a period (today, this week, last 30 days, 2024-03-15); top doctor; average fee; "
+        "revenue; pending bills; low stock items; blood stock; and 'show' or 'list' for any of these.")
+
+def _name_matcher():
+    """Regex over department and doctor names, rebuilt when either table changes."""
+    sql = "SELECT 'dept', dept_id, dept_name FROM departments UNION ALL SELECT 'doctor', doctor_id, name FROM doctors"
+
+    def build():
+        names = {}
+        for kind, entity_id, name in get_conn().execute(sql):
+            key = name.lower().replace('dr. ', '').strip()
+            names[key] = (kind, entity_id, name)
+            if kind == 'doctor':
+                names.setdefault(key.split()[-1], (kind, entity_id, name))
+        pattern = '|'.join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+        return re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE) if names else None, names
+
+    return cached(sql, build)
+
+def _date_range(text, today=None):
+    today = today or date.today()
+    text = text.lower()
+    if text == 'today':
+        return today, today
+    if text == 'yesterday':
+        return today - timedelta(days=1), today - timedelta(days=1)
+    if text == 'this week':
+        return today - timedelta(days=today.weekday()), today
+    if text == 'last week':
+        start = today - timedelta(days=today.weekday() + 7)
+        return start, start + timedelta(days=6)
+    if text == 'this month':
+        return today.replace(day=1), today
+    if text == 'last month':
+        end = today.replace(day=1) - timedelta(days=1)
+        return end.replace(day=1), end
+    if text[0].isdigit():
+        day = date.fromisoformat(text)
+        return day, day
+    days = int(re.search(r"\d+", text).group())
+    return today - timedelta(days=days - 1), today
+
+def parse(query):
+    """Return the keywords, subjects and entities found in query."""
+    parsed = {'kw': set(), 'subj': [], 'status': None, 'dates': None, 'dept': None, 'doctor': None}
+    for match in MATCHER.finditer(query):
+        if match.lastgroup == 'date':
+            parsed['dates'] = _date_range(match.group())
+            continue
+        prefix, name = _GROUPS[match.lastgroup]
+        if prefix == 'kw':
+            parsed['kw'].add(name)
+        elif prefix == 'subj':
+            if name not in parsed['subj']:
+                parsed['subj'].append(name)
+        elif parsed['status'] is None:
+            parsed['status'] = name
+    matcher, names = _name_matcher()
+    if matcher is not None:
+        for match in matcher.finditer(query):
+            kind, entity_id, name = names[match.group().lower()]
+            if parsed[kind] is None:
+                parsed[kind] = (entity_id, name)
+    parsed['low'] = 'low' in parsed['kw']
+    return parsed
+
+def _filters(spec, parsed):
+    clauses, params, described = [], [], []
+    if parsed['status'] and 'status' in spec:
+        clauses.append(f"{spec['status']} = ?")
+        params.append(parsed['status'])
+        described.append(parsed['status'].lower())
+    for kind in ('dept', 'doctor'):
+        if parsed[kind] and kind in spec:
+            clauses.append(f"{spec[kind]} = ?")
+            params.append(parsed[kind][0])
+            described.append(parsed[kind][1])
+    if parsed['dates'] and 'date' in spec:
+        clauses.append(f"{spec['date']} BETWEEN ? AND ?")
+        params.extend(d.isoformat() for d in parsed['dates'])
+        start, end = parsed['dates']
+        described.append(start.isoformat() if start == end else f"{start.isoformat()} to {end.isoformat()}")
+    if parsed['low'] and 'low' in spec:
+        clauses.append(spec['low'])
+        described.append("low stock")
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    return where, params, (f" ({', '.join(described)})" if described else "")
+
+def _run(sql, params, fetch):
+    return cached(sql, lambda: fetch(get_conn().execute(sql, params)), params)
+
+def _subject(parsed):
+    subject = parsed['subj'][0] if parsed['subj'] else None
+    if subject == 'patients' and (parsed['dept'] or parsed['doctor'] or parsed['status']):
+        return 'visits'
+    if subject is None and (parsed['dept'] or parsed['doctor']):
+        return 'appointments'
+    return subject
+
+def answer_count(parsed, subject):
+    spec = SOURCES[subject]
+    where, params, described = _filters(spec, parsed)
+    row = _run(f"SELECT {spec['count']} FROM {spec['source']}{where}", params, lambda c: c.fetchone())
+    text = f"{'' if described else 'Total '}{spec['label']}{described}: {row[0]:,}"
+    if len(row) > 1:
+        text += f" (Rs. {row[1]:,.0f})"
+    return text
+
+def answer_list(parsed, subject):
+    spec = SOURCES[subject]
+    where, params, described = _filters(spec, parsed)
+    sql = f"SELECT {spec['columns']} FROM {spec['source']}{where} ORDER BY {spec['order']} LIMIT {LIST_LIMIT + 1}"
+    rows = _run(sql, params, lambda c: c.fetchall())
+    if not rows:
+        return f"No {spec['label'].lower()} found{described}"
+    lines = ["- " + " | ".join("" if v is None else str(v) for v in row) for row in rows[:LIST_LIMIT]]
+    more = f"\n\nShowing the first {LIST_LIMIT}." if len(rows) > LIST_LIMIT else ""
+    return f"{spec['label']}{described}:\n\n" + "\n".join(lines) + more
+
+def answer_top_doctor(parsed):
+    clauses, params = [], []
+    if parsed['dept']:
+        clauses.append("d.dept_id = ?")
+        params.append(parsed['dept'][0])
+    if parsed['dates']:
+        clauses.append("s.day BETWEEN ? AND ?")
+        params.extend(d.isoformat() for d in parsed['dates'])
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    column = "s.completed" if parsed['status'] == 'Completed' else "s.appointments"
+    sql = f"""SELECT d.name, SUM({column}) as count FROM doctor_daily_stats s
+              JOIN doctors d ON d.doctor_id = s.doctor_id{where}
+              GROUP BY s.doctor_id ORDER BY count DESC LIMIT 1"""
+    row = _run(sql, params, lambda c: c.fetchone())
+    if row is None:
+        return "No appointments found"
+    return f"Top Doctor: {row[0]} with {row[1]:,} appointments"
+
+def answer_average_fee(parsed):
+    where, params = ("", [])
+    if parsed['dept']:
+        where, params = " WHERE dept_id = ?", [parsed['dept'][0]]
+    value = _run(f"SELECT AVG(consultation_fee) FROM doctors{where}", params, lambda c: c.fetchone()[0])
+    return f"Average Consultation Fee: Rs. {value or 0:.0f}"
+
+def answer_revenue(parsed):
+    if parsed['dept']:
+        where, params = " WHERE dept_id = ?", [parsed['dept'][0]]
+        if parsed['dates']:
+            where += " AND day BETWEEN ? AND ?"
+            params.extend(d.isoformat() for d in parsed['dates'])
+        value = _run(f"SELECT TOTAL(completed_fees) FROM dept_daily_stats{where}", params, lambda c: c.fetchone()[0])
+        return f"Consultation Revenue ({parsed['dept'][1]}): Rs. {value:,.0f}"
+    if parsed['dates']:
+        params = [d.isoformat() for d in parsed['dates']]
+        value = _run("SELECT TOTAL(amount) FROM billing WHERE payment_status = 'Paid' AND payment_date BETWEEN ? AND ?",
+                     params, lambda c: c.fetchone()[0])
+        return f"Revenue ({params[0]} to {params[1]}): Rs. {value:,.0f}"
+    value = _run("SELECT TOTAL(amount) FROM billing_totals WHERE payment_status = 'Paid'", [], lambda c: c.fetchone()[0])
+    return f"Total Revenue: Rs. {value:,.0f}"
+
+def answer_blood(parsed):
+    rows = _run("SELECT blood_group, SUM(units) FROM blood_bank GROUP BY blood_group ORDER BY blood_group", [],
+                lambda c: c.fetchall())
+    return "Blood Stock: " + ", ".join(f"{group} {units}" for group, units in rows)
+
+def ai_query(query):
+    try:
+        parsed = parse(query)
+        kw = parsed['kw']
+        subject = _subject(parsed)
+
+        if 'revenue' in kw:
+            return answer_revenue(parsed)
+        if 'average' in kw and ('fee' in kw or subject == 'doctors'):
+            return answer_average_fee(parsed)
+        if 'top' in kw and subject in ('doctors', None):
+            return answer_top_doctor(parsed)
+        if subject == 'blood':
+            return answer_blood(parsed)
+        if subject == 'stock' and not parsed['low'] and 'list' not in kw and 'count' not in kw:
+            parsed['low'] = True
+        if subject is None:
+            return HELP
+        if 'list' in kw and 'count' not in kw or subject == 'visits' and 'count' not in kw:
+            return answer_list(parsed, subject)
+        return answer_count(parsed, subject)
+    except Exception as e:
+        return f"Error: {str(e)}"
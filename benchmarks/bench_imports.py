@@ -0,0 +1,52 @@
+# Cold-start import cost: what app.py imported before pages were split out
+# (every helper module plus pandas and plotly.express) vs what it imports now,
+# plus the extra imports each page module pulls in on its first visit.
+# Every measurement runs in a fresh interpreter.
+#
+#   python -m benchmarks.bench_imports [--repeat 5]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from views import PAGES
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LEGACY = ['streamlit', 'pandas', 'plotly.express', 'db', 'pool', 'paging', 'search', 'cache', 'lookups',
+          'assistant', 'importer', 'exporter', 'profiler', 'rollups']
+STARTUP = ['streamlit', 'db', 'profiler', 'views']
+
+SNIPPET = """
+import importlib, sys, time
+for name in {before!r}:
+    importlib.import_module(name)
+start = time.perf_counter()
+for name in {measured!r}:
+    importlib.import_module(name)
+print((time.perf_counter() - start) * 1000)
+"""
+
+def import_ms(measured, before=(), repeat=5):
+    code = SNIPPET.format(before=list(before), measured=list(measured))
+    timings = [float(subprocess.run([sys.executable, '-c', code], cwd=REPO, capture_output=True, text=True,
+                                    check=True).stdout) for _ in range(repeat)]
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    legacy = import_ms(LEGACY, repeat=args.repeat)
+    startup = import_ms(STARTUP, repeat=args.repeat)
+    print(f"{'all pages up front (before)':<32} {legacy:9.1f} ms")
+    print(f"{'app startup (now)':<32} {startup:9.1f} ms")
+    print("\nfirst visit, on top of startup:")
+    for label, module in PAGES.items():
+        ms = import_ms([f"views.{module}"], STARTUP, args.repeat)
+        print(f"  {label.split(' ', 1)[1]:<30} {ms:9.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+# Per-page query latency at several data sizes, written as a JSON report that
+# can be compared across commits.
+#
+#   python -m benchmarks.bench_pages [--sizes 10000,100000,1000000] [--repeat 5]
+#                                    [--data-dir DIR] [--out report.json] [--compare old.json]
+#
+# Databases come from datagen.py with a fixed seed and are kept in --data-dir,
+# so later runs on the same day at the same size reuse them. Each query is run once to warm the
+# page cache, then --repeat times; the report holds median and p95 per query.
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime
+
+import datagen
+from charts import time_series_sql
+from db import (DASHBOARD_ROWS, STATS_SQL, DEPT_APPOINTMENTS_SQL, PATIENT_AGES_SQL, BED_STATUS_SQL,
+                LAB_STATUS_SQL, AMBULANCE_FLEET_SQL, BLOOD_STOCK_SQL, RECENT_APPOINTMENTS_SQL)
+from live import LIVE_METRICS_SQL, HOURLY_FLOW_SQL
+from paging import approx_count, fetch_page
+from pool import PRAGMAS
+from rollups import REVENUE_BY_DOCTOR_SQL, DEPT_PERFORMANCE_SQL, DEPT_LOAD_TODAY_SQL, PHARMACY_REVENUE_SQL
+from scheduler import CONFLICT_SQL
+from stock import LOW_STOCK_SQL
+
+SEED = 42
+
+def _all(sql, params=()):
+    return lambda conn: conn.execute(sql, params).fetchall()
+
+def _view(columns, source, key_col, sort_col, where=(), params=()):
+    """First page and row-count label of a paged_table view, as app.py renders it."""
+    def run(conn):
+        rows, _, _ = fetch_page(conn, columns, source, key_col, sort_col, True, where, params)
+        approx_count(conn, source, where, params)
+        return rows
+    return run
+
+# page -> [(query label, callable(conn) -> rows)], mirroring the queries app.py runs per render
+PAGES = {
+    'Dashboard': [
+        ('stats', _all(STATS_SQL)),
+        ('dept_appointments', _all(DEPT_APPOINTMENTS_SQL)),
+        ('patient_ages', _all(PATIENT_AGES_SQL)),
+        ('bed_status', _all(BED_STATUS_SQL, (DASHBOARD_ROWS,))),
+        ('lab_status', _all(LAB_STATUS_SQL, (DASHBOARD_ROWS,))),
+        ('ambulance_fleet', _all(AMBULANCE_FLEET_SQL)),
+        ('blood_stock', _all(BLOOD_STOCK_SQL)),
+        ('recent_appointments', _all(RECENT_APPOINTMENTS_SQL)),
+    ],
+    'Analytics': [
+        ('revenue_by_doctor', _all(REVENUE_BY_DOCTOR_SQL)),
+        ('appointment_status', _all("SELECT status, COUNT(*) as count FROM appointments GROUP BY status")),
+        ('dept_performance', _all(DEPT_PERFORMANCE_SQL)),
+        ('appointments_over_time', _all(time_series_sql('dept_daily_stats', 'day', 'month', ["day > ''"],
+                                                        "SUM(appointments)"))),
+    ],
+    'Live Monitoring': [
+        # per published snapshot; viewers between changes run no queries (see live.py)
+        ('data_version', _all("PRAGMA data_version")),
+        ('live_metrics', _all(LIVE_METRICS_SQL)),
+        ('hourly_flow', _all(HOURLY_FLOW_SQL)),
+        ('dept_load_today', _all(DEPT_LOAD_TODAY_SQL)),
+    ],
+    'Patients': [
+        ('view', _view("*", "patients", "patient_id", "patient_id")),
+    ],
+    'Appointments': [
+        ('view', _view("a.appointment_id, p.name, d.name, a.appointment_date, a.appointment_time, a.status, a.reason",
+                       "appointments a JOIN patients p ON a.patient_id = p.patient_id JOIN doctors d ON a.doctor_id = d.doctor_id",
+                       "a.appointment_id", "a.appointment_date")),
+        ('view_scheduled', _view("a.appointment_id, p.name, d.name, a.appointment_date, a.appointment_time, a.status, a.reason",
+                                 "appointments a JOIN patients p ON a.patient_id = p.patient_id JOIN doctors d ON a.doctor_id = d.doctor_id",
+                                 "a.appointment_id", "a.appointment_date", ["a.status = ?"], ["Scheduled"])),
+        # per booking; free slots come from the in-memory index (see scheduler.py)
+        ('slot_conflict', _all(CONFLICT_SQL, (1, '2030-01-01 09:30', '2030-01-01 10:30'))),
+    ],
+    'Medical Records': [
+        ('view', _view("m.record_id, p.name, d.name, m.diagnosis, m.prescription, m.notes, m.record_date",
+                       "medical_records m JOIN patients p ON m.patient_id = p.patient_id JOIN doctors d ON m.doctor_id = d.doctor_id",
+                       "m.record_id", "m.record_date")),
+    ],
+    'Billing': [
+        ('view', _view("b.bill_id, p.name, a.appointment_date, b.amount, b.payment_status, b.payment_date",
+                       "billing b JOIN patients p ON b.patient_id = p.patient_id LEFT JOIN appointments a ON b.appointment_id = a.appointment_id",
+                       "b.bill_id", "b.bill_id")),
+        ('view_pending', _view("b.bill_id, p.name, a.appointment_date, b.amount, b.payment_status, b.payment_date",
+                               "billing b JOIN patients p ON b.patient_id = p.patient_id LEFT JOIN appointments a ON b.appointment_id = a.appointment_id",
+                               "b.bill_id", "b.bill_id", ["b.payment_status = ?"], ["Pending"])),
+        ('totals', _all("""SELECT COALESCE(SUM(bills), 0), TOTAL(amount), TOTAL(CASE WHEN payment_status = 'Paid' THEN amount END),
+                                  TOTAL(CASE WHEN payment_status = 'Pending' THEN amount END) FROM billing_totals""")),
+    ],
+    'Staff': [
+        ('view', _all("""SELECT s.staff_id, s.name, s.role, d.dept_name, s.phone, s.email, s.salary, s.join_date
+                         FROM staff s LEFT JOIN departments d ON s.dept_id = d.dept_id""")),
+    ],
+    'Inventory': [
+        ('view', _view("*", "inventory", "item_id", "item_name")),
+        ('low_stock', _all(LOW_STOCK_SQL)),
+        ('history', _view("movement_id, moved_at, kind, change, balance, reference", "stock_movements",
+                          "movement_id", "movement_id", ["item_id = ?"], [1])),
+    ],
+    'Beds': [
+        ('view', _view("b.bed_id, b.bed_number, b.ward_type, b.status, p.name as patient_name, b.admission_date",
+                       "beds b LEFT JOIN patients p ON b.patient_id = p.patient_id", "b.bed_id", "b.bed_number")),
+        # per render the availability index only reads new bed events (see allocation.py)
+        ('bed_events', _all("SELECT seq, row_id FROM change_log WHERE table_name = 'beds' AND seq > ? ORDER BY seq",
+                            (2 ** 62,))),
+    ],
+    'Laboratory': [
+        ('view', _view("l.test_id, p.name, l.test_name, l.test_date, l.result, l.status, l.cost",
+                       "lab_tests l JOIN patients p ON l.patient_id = p.patient_id", "l.test_id", "l.test_date")),
+        # cached until the next write to lab_tests
+        ('revenue', _all("SELECT TOTAL(cost) FROM lab_tests WHERE status = 'Completed'")),
+    ],
+    'Pharmacy': [
+        ('view', _view("ph.prescription_id, p.name, d.name, ph.medicine_name, ph.dosage, ph.quantity, ph.price, ph.issue_date",
+                       "pharmacy ph JOIN patients p ON ph.patient_id = p.patient_id JOIN doctors d ON ph.doctor_id = d.doctor_id",
+                       "ph.prescription_id", "ph.issue_date")),
+        ('revenue', _all(PHARMACY_REVENUE_SQL)),
+    ],
+    'Blood Bank': [
+        ('view', _view("*", "blood_bank", "blood_id", "blood_group")),
+    ],
+}
+
+def database(data_dir, size):
+    # anchored on today so the date('now') queries of Live Monitoring find rows
+    today = date.today()
+    path = os.path.join(data_dir, f"hospital-{size}-seed{SEED}-{today.isoformat()}.db")
+    if not os.path.exists(path):
+        print(f"generating {path} ...", flush=True)
+        datagen.generate(path, size, SEED, today)
+    return path
+
+def time_query(run, conn, repeat):
+    rows = run(conn)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(conn)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'rows': len(rows),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report, baseline):
+    old = {(r['size'], r['page'], r['query']): r for r in baseline['results']}
+    print(f"\nvs {baseline.get('commit')} ({baseline.get('created')}): median ms, new / old")
+    for r in report['results']:
+        before = old.get((r['size'], r['page'], r['query']))
+        if before and before['median_ms']:
+            ratio = r['median_ms'] / before['median_ms']
+            flag = '  <-- slower' if ratio > 1.25 and r['median_ms'] - before['median_ms'] > 1 else ''
+            print(f"{r['size']:>10,} {r['page']:<16} {r['query']:<22} {before['median_ms']:9.2f} {r['median_ms']:9.2f} {ratio:6.2f}x{flag}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='10000,100000,1000000', help="appointment counts, comma separated")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'hospital-bench'))
+    parser.add_argument('--out', default='bench_pages.json')
+    parser.add_argument('--compare', help="earlier report to compare against")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {
+        'commit': git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'seed': SEED,
+        'repeat': args.repeat,
+        'results': [],
+    }
+    for size in (int(s) for s in args.sizes.split(',')):
+        conn = sqlite3.connect(database(args.data_dir, size))
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        page_totals = {}
+        for page, queries in PAGES.items():
+            for label, run in queries:
+                result = time_query(run, conn, args.repeat)
+                report['results'].append({'size': size, 'page': page, 'query': label, **result})
+                page_totals[page] = page_totals.get(page, 0) + result['median_ms']
+        print(f"\n{size:,} appointments")
+        for page, total in page_totals.items():
+            print(f"  {page:<16} {total:9.2f} ms")
+        conn.close()
+
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nreport written to {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+if __name__ == '__main__':
+    main()
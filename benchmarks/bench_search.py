@@ -0,0 +1,56 @@
+# Search-as-you-type latency of the FTS5 patient index.
+#
+#   python -m benchmarks.bench_search [--patients 1000000]
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from db import init_db
+from search import search_patients
+
+FIRST = ['Ali', 'Ayesha', 'Bilal', 'Zainab', 'Hamza', 'Sara', 'Usman', 'Fatima', 'Ahmed', 'Hassan',
+         'Imran', 'Maryam', 'Omar', 'Hina', 'Kamran', 'Sana', 'Tariq', 'Nadia', 'Faisal', 'Rabia']
+LAST = ['Khan', 'Ahmed', 'Ali', 'Malik', 'Hussain', 'Raza', 'Qureshi', 'Sheikh', 'Butt', 'Chaudhry',
+        'Siddiqui', 'Mirza', 'Javed', 'Iqbal', 'Anwar', 'Aslam', 'Rashid', 'Nawaz', 'Akhtar', 'Baig']
+CITIES = ['Karachi', 'Lahore', 'Islamabad', 'Peshawar', 'Quetta', 'Multan', 'Faisalabad', 'Hyderabad']
+
+QUERIES = ['kh', 'za', 'zain', 'zainab', 'zainab kh', 'zainab khan', 'zianab', 'khan lahore',
+           '0312', 'patient123', 'siddiqui multan']
+
+def build_db(path, patients, seed=7):
+    init_db(path)
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    rows = ((f"{rng.choice(FIRST)} {rng.choice(LAST)}", rng.randint(1, 90), rng.choice(['Male', 'Female']),
+             f"03{rng.randint(10, 49)}-{rng.randint(1000000, 9999999)}", f"patient{i}@email.com",
+             rng.choice(CITIES), 'O+', '2024-01-01') for i in range(patients))
+    conn.executemany("INSERT INTO patients (name, age, gender, phone, email, address, blood_group, registration_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--patients', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'search.db')
+        build_db(path, args.patients)
+        conn = sqlite3.connect(path)
+        print(f"patients: {args.patients:,}")
+        for query in QUERIES:
+            names, rows = search_patients(conn, query)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                search_patients(conn, query)
+            elapsed = (time.perf_counter() - start) / args.repeat * 1000
+            top = rows[0][names.index('name')] if rows else '-'
+            print(f"{query!r:20} {elapsed:8.2f} ms  {len(rows):3} hits  top: {top}")
+        conn.close()
+
+if __name__ == '__main__':
+    main()
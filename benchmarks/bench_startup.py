@@ -0,0 +1,63 @@
+# Per-rerun cost of the database startup path: init_db() as app.py used to call
+# it on every rerun (connect, 13 CREATE TABLE IF NOT EXISTS, seed check,
+# migration check) vs bootstrap(), which does that work once per process.
+# Also times the first headless render of the Dashboard (startup to first paint).
+#
+#   python -m benchmarks.bench_startup [--repeat 200]
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import db
+from db import bootstrap, init_db
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def first_paint():
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, db.DB_NAME)
+        init_db(path)
+
+        legacy = timed(lambda: init_db(path), args.repeat)
+        start = time.perf_counter()
+        bootstrap(path)
+        cold = (time.perf_counter() - start) * 1000
+        warm = timed(lambda: bootstrap(path), args.repeat)
+        print(f"init_db() per rerun        {legacy:9.3f} ms")
+        print(f"bootstrap() first call     {cold:9.3f} ms")
+        print(f"bootstrap() per rerun      {warm:9.3f} ms")
+
+        # app.py opens hospital.db relative to the working directory
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            print(f"first paint (Dashboard)    {first_paint():9.1f} ms")
+        finally:
+            os.chdir(cwd)
+
+if __name__ == '__main__':
+    main()
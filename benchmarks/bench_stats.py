@@ -0,0 +1,82 @@
+# Per-render cost of the Dashboard KPIs: legacy eleven-query get_stats() vs the
+# single-statement version in db.py.
+#
+#   python -m benchmarks.bench_stats [--rows 1000000] [--repeat 20]
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from db import init_db, get_stats
+
+LEGACY_QUERIES = [
+    "SELECT COUNT(*) as c FROM patients",
+    "SELECT COUNT(*) as c FROM doctors",
+    "SELECT COUNT(*) as c FROM appointments",
+    "SELECT COUNT(*) as c FROM appointments WHERE status='Scheduled'",
+    "SELECT COUNT(*) as c FROM staff",
+    "SELECT SUM(amount) as c FROM billing WHERE payment_status='Paid'",
+    "SELECT COUNT(*) as c FROM billing WHERE payment_status='Pending'",
+    "SELECT COUNT(*) as c FROM beds WHERE status='Available'",
+    "SELECT COUNT(*) as c FROM beds WHERE status='Occupied'",
+    "SELECT COUNT(*) as c FROM lab_tests WHERE status!='Completed'",
+    "SELECT COUNT(*) as c FROM ambulance WHERE status='Available'",
+]
+
+def build_db(path, rows):
+    init_db(path)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, status, reason)
+        SELECT i % 5 + 1, i % 5 + 1, date('2024-01-01', '+' || (i % 365) || ' days'), '10:00 AM',
+               CASE i % 3 WHEN 0 THEN 'Scheduled' WHEN 1 THEN 'Completed' ELSE 'Cancelled' END, 'Checkup'
+        FROM n
+    """, (rows,))
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO billing (patient_id, appointment_id, amount, payment_status, payment_date)
+        SELECT i % 5 + 1, i, 500 + i % 2000, CASE i % 4 WHEN 0 THEN 'Pending' ELSE 'Paid' END,
+               date('2024-01-01', '+' || (i % 365) || ' days')
+        FROM n
+    """, (rows,))
+    conn.commit()
+    conn.close()
+
+def legacy_stats(conn):
+    try:
+        import pandas as pd
+    except ImportError:
+        return [conn.execute(sql).fetchone()[0] for sql in LEGACY_QUERIES]
+    return [pd.read_sql(sql, conn).iloc[0]['c'] for sql in LEGACY_QUERIES]
+
+def timed(fn, conn, repeat):
+    fn(conn)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(conn)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='appointments and bills to generate')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        build_db(path, args.rows)
+        conn = sqlite3.connect(path)
+        legacy = timed(legacy_stats, conn, args.repeat)
+        single = timed(get_stats, conn, args.repeat)
+        assert [float(v) for v in legacy_stats(conn)] == [float(v) for v in get_stats(conn).values()]
+        conn.close()
+
+    print(f"rows: {args.rows:,} appointments, {args.rows:,} bills")
+    print(f"legacy get_stats (11 queries): {legacy:8.2f} ms/render")
+    print(f"single-pass get_stats:         {single:8.2f} ms/render")
+    print(f"speedup:                       {legacy / single:8.2f}x")
+
+if __name__ == '__main__':
+    main()
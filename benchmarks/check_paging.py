@@ -0,0 +1,104 @@
+# Keyset pagination regression check: pages through the list views' sources
+# with NULLs in their nullable sort columns, in both directions, and fails if
+# any row is skipped, repeated or out of order.
+#
+#   python -m benchmarks.check_paging [--rows 500] [--page-size 7]
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+
+from db import init_db
+from paging import fetch_page
+
+# (source, key_col, sort columns offered by the page) for the views whose sort
+# columns can be NULL
+VIEWS = {
+    'Appointments': ("""appointments a
+                        JOIN patients p ON a.patient_id = p.patient_id
+                        JOIN doctors d ON a.doctor_id = d.doctor_id""",
+                     "a.appointment_id", ("a.appointment_date", "a.appointment_id")),
+    'Billing': ("""billing b
+                   JOIN patients p ON b.patient_id = p.patient_id
+                   LEFT JOIN appointments a ON b.appointment_id = a.appointment_id""",
+                "b.bill_id", ("a.appointment_date", "b.amount", "b.bill_id")),
+    'Patients': ("patients", "patient_id", ("patient_id", "name", "registration_date")),
+    'Pharmacy': ("""pharmacy ph
+                    JOIN patients p ON ph.patient_id = p.patient_id
+                    JOIN doctors d ON ph.doctor_id = d.doctor_id""",
+                 "ph.prescription_id", ("ph.issue_date", "ph.prescription_id")),
+}
+
+def build_db(path, rows):
+    """About one in five values of each nullable sort column is NULL; the rest repeat, so ties span pages."""
+    init_db(path, sample_data=False)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO doctors (name, specialization, phone, email, consultation_fee) VALUES ('Dr. A', 'GP', '', '', 1000)")
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO patients (name, age, registration_date)
+        SELECT 'Patient ' || (i % 13), 30,
+               CASE WHEN i % 5 = 1 THEN NULL ELSE date('2024-01-01', '+' || (i % 11) || ' days') END
+        FROM n
+    """, (rows,))
+    conn.execute("""
+        INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, status)
+        SELECT patient_id, 1, CASE WHEN patient_id % 5 = 2 THEN NULL ELSE date('2024-02-01', '+' || (patient_id % 7) || ' days') END,
+               '10:00 AM', 'Completed'
+        FROM patients
+    """)
+    conn.execute("""
+        INSERT INTO billing (patient_id, appointment_id, amount, payment_status)
+        SELECT patient_id, CASE WHEN patient_id % 4 = 0 THEN NULL ELSE patient_id END,
+               CASE WHEN patient_id % 5 = 3 THEN NULL ELSE (patient_id % 9) * 100 END, 'Pending'
+        FROM patients
+    """)
+    conn.execute("""
+        INSERT INTO pharmacy (patient_id, doctor_id, medicine_name, quantity, price, issue_date)
+        SELECT patient_id, 1, 'Paracetamol', 10, 50,
+               CASE WHEN patient_id % 5 = 4 THEN NULL ELSE date('2024-03-01', '+' || (patient_id % 6) || ' days') END
+        FROM patients
+    """)
+    conn.commit()
+    conn.close()
+
+def page_through(conn, source, key_col, sort_col, descending, page_size):
+    keys, cursor = [], None
+    while True:
+        rows, _, cursor = fetch_page(conn, key_col, source, key_col, sort_col, descending,
+                                     after=cursor, page_size=page_size)
+        keys += [row[0] for row in rows]
+        if cursor is None:
+            return keys
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--page-size', type=int, default=7)
+    args = parser.parse_args()
+
+    checks = failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'paging.db')
+        build_db(path, args.rows)
+        conn = sqlite3.connect(path)
+        for view, (source, key_col, sort_cols) in VIEWS.items():
+            for sort_col in sort_cols:
+                for descending in (False, True):
+                    direction = 'DESC' if descending else 'ASC'
+                    expected = [row[0] for row in conn.execute(
+                        f"SELECT {key_col} FROM {source} ORDER BY {sort_col} {direction}, {key_col} {direction}")]
+                    got = page_through(conn, source, key_col, sort_col, descending, args.page_size)
+                    checks += 1
+                    if got != expected:
+                        failures += 1
+                        print(f"{view} by {sort_col} {direction}: paged {len(got):,} rows "
+                              f"({len(set(got)):,} distinct), expected {len(expected):,}")
+        conn.close()
+
+    print(f"{checks - failures}/{checks} view sort orders page through every row")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# EXPLAIN QUERY PLAN regression check for the Dashboard queries: builds a
+# migrated database with large appointment/billing/patient/lab/bed tables and
+# fails if any Dashboard query scans one of them, through an index or not,
+# without a LIMIT to stop it.
+#
+#   python -m benchmarks.check_query_plans [--rows 20000]
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+from db import DASHBOARD_QUERIES, DASHBOARD_ROWS, init_db
+
+LARGE_TABLES = ('appointments', 'billing', 'patients', 'lab_tests', 'beds')
+
+# "SCAN a", "SCAN a USING INDEX ..." and "SCAN a USING COVERING INDEX ..." all read
+# the whole table or index unless a LIMIT stops them. Only a scan in the outermost
+# query of a statement that ends in a LIMIT counts as stopped; one in a subquery
+# always fails.
+TABLE_SCAN = re.compile(r'^SCAN (\w+)\b')
+LIMIT = re.compile(r'\bLIMIT\b', re.I)
+PARENTHESIZED = re.compile(r'\([^()]*\)')
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|LEFT\b|JOIN\b|GROUP\b|ORDER\b)(\w+))?', re.I)
+
+def build_db(path, rows):
+    init_db(path)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO patients (name, age, gender, phone, email, address, blood_group, registration_date)
+        SELECT 'Patient ' || i, i % 90 + 1, 'Male', '', '', '', 'O+', '2024-01-01' FROM n
+    """, (rows,))
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, status, reason)
+        SELECT i, i % 5 + 1, date('2024-01-01', '+' || (i % 365) || ' days'), '10:00 AM',
+               CASE i % 3 WHEN 0 THEN 'Scheduled' WHEN 1 THEN 'Completed' ELSE 'Cancelled' END, 'Checkup'
+        FROM n
+    """, (rows,))
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO billing (patient_id, appointment_id, amount, payment_status, payment_date)
+        SELECT i, i, 1000, CASE i % 4 WHEN 0 THEN 'Pending' ELSE 'Paid' END, '2024-01-01' FROM n
+    """, (rows,))
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO lab_tests (patient_id, test_name, test_date, result, status, cost)
+        SELECT i, 'Blood Test', date('2024-01-01', '+' || (i % 365) || ' days'), NULL,
+               CASE i % 10 WHEN 0 THEN 'Scheduled' ELSE 'Completed' END, 1500
+        FROM n
+    """, (rows,))
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO beds (bed_number, ward_type, status, patient_id, admission_date)
+        SELECT 'B-' || i, 'General', CASE i % 2 WHEN 0 THEN 'Occupied' ELSE 'Available' END,
+               CASE i % 2 WHEN 0 THEN i END, CASE i % 2 WHEN 0 THEN '2024-01-01' END
+        FROM n
+    """, (rows // 10,))
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+def outer_limit(sql):
+    """True when the outermost SELECT of sql has a LIMIT."""
+    while PARENTHESIZED.search(sql):
+        sql = PARENTHESIZED.sub('', sql)
+    return bool(LIMIT.search(sql))
+
+def table_scans(conn, sql):
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    limited = outer_limit(sql)
+    scans = []
+    # every ? in a Dashboard query is its row limit
+    for _, parent, _, detail in conn.execute("EXPLAIN QUERY PLAN " + sql, [DASHBOARD_ROWS] * sql.count('?')):
+        match = TABLE_SCAN.match(detail)
+        if match and aliases.get(match.group(1)) in LARGE_TABLES and not (limited and parent == 0):
+            scans.append(detail)
+    return scans
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'plans.db')
+        build_db(path, args.rows)
+        conn = sqlite3.connect(path)
+        for sql in DASHBOARD_QUERIES:
+            scans = table_scans(conn, sql)
+            if scans:
+                failures += 1
+                print("UNBOUNDED SCAN:", ' '.join(sql.split())[:100])
+                for scan in scans:
+                    print("   ", scan)
+        conn.close()
+
+    print(f"{len(DASHBOARD_QUERIES) - failures}/{len(DASHBOARD_QUERIES)} dashboard queries avoid unbounded scans of large tables")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
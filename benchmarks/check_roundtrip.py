@@ -0,0 +1,66 @@
+# Export/import round-trip check: exports each import target of the sample
+# database with exporter.py, loads the file back with importer.py into a copy
+# whose table was emptied, and fails if any row is rejected or comes back
+# different.
+#
+#   python -m benchmarks.check_roundtrip
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+from db import init_db
+from exporter import export_table
+from importer import TARGETS, import_rows
+
+def formats():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return ('csv',)
+    return ('csv', 'parquet')
+
+def snapshot(conn, target):
+    columns = ', '.join(column for column, *_ in TARGETS[target]['columns'])
+    return conn.execute(f"SELECT {columns} FROM {target} ORDER BY rowid").fetchall()
+
+def main():
+    checks = failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source.db')
+        init_db(source)
+        for target in TARGETS:
+            for fmt in formats():
+                path = os.path.join(tmp, f"{target}.{fmt}")
+                copy = os.path.join(tmp, f"{target}-{fmt}.db")
+                shutil.copyfile(source, copy)
+                conn = sqlite3.connect(source)
+                exported = export_table(conn, target, path, fmt)
+                expected = snapshot(conn, target)
+                conn.close()
+
+                conn = sqlite3.connect(copy)
+                with conn:
+                    conn.execute(f"DELETE FROM {target}")
+                summary = import_rows(conn, target, path, fmt=fmt)
+                got = snapshot(conn, target)
+                conn.close()
+
+                checks += 1
+                if summary['rejected'] or got != expected:
+                    failures += 1
+                    print(f"{target} via {fmt}: {exported:,} exported, {summary['loaded']:,} loaded, "
+                          f"{summary['rejected']:,} rejected")
+                    for number, reason in summary['samples'][:5]:
+                        print(f"  row {number}: {reason}")
+                    for before, after in zip(expected, got):
+                        if before != after:
+                            print(f"  {before} came back as {after}")
+                            break
+
+    print(f"{checks - failures}/{checks} exports import back unchanged")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
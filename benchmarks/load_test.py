@@ -0,0 +1,293 @@
+# Headless load test: N concurrent Streamlit sessions driven through app.py with
+# AppTest, each walking a front-desk or ward script of page visits and form
+# submissions. Reports rerun latency percentiles per step, throughput, and
+# SQLite write latency / lock waits.
+#
+#   python -m benchmarks.load_test [--sessions 20] [--duration 60] [--appointments 100000]
+#                                  [--db existing.db] [--out load.json]
+#
+# Sessions share one process, as they do under `streamlit run`, so the GIL, the
+# connection pool and the query cache are contended the same way. The database
+# is a copy (or a datagen.py build) in a scratch directory; hospital.db is never
+# touched.
+import argparse
+import ast
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import datagen
+import pool
+
+# the pages import these lazily; a first import racing in several session
+# threads leaves the module half-initialized for some of them
+import pandas  # noqa: F401
+import plotly.express  # noqa: F401
+
+APP = os.path.join(REPO, 'app.py')
+LOCK_WAIT_MS = 20  # an uncontended WAL write commits well under this
+
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'BEGIN')
+
+class _Writes:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = []
+        self.errors = 0
+
+    def record(self, ms):
+        with self.lock:
+            self.timings.append(ms)
+
+writes = _Writes()
+
+def _timed(method, *args):
+    start = time.perf_counter()
+    try:
+        return method(*args)
+    except sqlite3.OperationalError as e:
+        if 'locked' in str(e):
+            writes.errors += 1
+        raise
+    finally:
+        writes.record((time.perf_counter() - start) * 1000)
+
+class TimedCursor(sqlite3.Cursor):
+    """Times write statements; a write that has to wait for another writer
+    spends the wait (SQLite's busy timeout) inside execute."""
+
+    def execute(self, sql, *args):
+        if sql.lstrip()[:7].upper().startswith(WRITE_PREFIXES):
+            return _timed(super().execute, sql, *args)
+        return super().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return _timed(super().executemany, sql, *args)
+
+class TimedConnection(sqlite3.Connection):
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # Connection.execute makes its cursor in C without calling cursor()
+    def execute(self, sql, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return self.cursor().executemany(sql, *args)
+
+    def commit(self):
+        return _timed(super().commit)
+
+class TimedPool(pool.ConnectionPool):
+    def _open(self):
+        conn = sqlite3.connect(self.db_name, timeout=10, check_same_thread=False,
+                               cached_statements=self.cached_statements, factory=TimedConnection)
+        for pragma in pool.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+def _button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+def _selectbox(at, label=None, key=None):
+    return next((s for s in at.selectbox if (key and s.key == key) or (label and s.label == label)), None)
+
+# the app's pickers hold ids and show labels through format_func, so set_value
+# needs ids parsed back out of the displayed options
+def _patient_ids(box):
+    # "Name (#123)"
+    return [int(option.rsplit('#', 1)[1].rstrip(')')) for option in box.options]
+
+def _bill_ids(box):
+    # "Bill #123 - Name - Rs. 1000.0"
+    return [int(option.split(' - ', 1)[0].removeprefix('Bill #')) for option in box.options]
+
+def go(page):
+    def step(at, rng):
+        at.sidebar.selectbox[0].set_value(page).run()
+    step.__name__ = f"page:{page.split(' ', 1)[1]}"
+    return step
+
+# A step returns False when the page has nothing to act on (no pending bills,
+# say); those are not timed.
+def book_appointment(at, rng):
+    patient = _selectbox(at, key="appointment_patient")
+    slot = _selectbox(at, label="Free slot*")
+    if patient is None or not patient.options or slot is None or not slot.options:
+        return False
+    patient.set_value(rng.choice(_patient_ids(patient)))
+    _button(at, "Book Appointment").click().run()
+
+def mark_bill_paid(at, rng):
+    bills = next((m for m in at.multiselect if m.key == "pay_bills"), None)
+    if bills is None or not bills.options:
+        return False
+    pending = _bill_ids(bills)
+    bills.set_value(rng.sample(pending, min(3, len(pending)))).run()
+    pay = next((b for b in at.button if b.label == "💳 Mark as Paid"), None)
+    if pay is None:
+        return False  # other sessions paid the last pending bills meanwhile
+    pay.click().run()
+
+def admit_patient(at, rng):
+    patient = _selectbox(at, key="admit_patient")
+    if patient is None or not patient.options:
+        return False
+    patient.set_value(rng.choice(_patient_ids(patient)))
+    admit = _button(at, "🛌 Admit")
+    if admit.disabled:
+        return False
+    admit.click().run()
+
+# role -> steps, repeated until the run ends
+SCRIPTS = {
+    'front_desk': [
+        go("🏠 Dashboard"), go("👥 Patient Management"), go("📅 Appointments"), book_appointment,
+        go("💰 Billing & Finance"), mark_bill_paid,
+    ],
+    'ward': [
+        go("🛏️ Bed Management"), admit_patient, go("🔬 Laboratory"), go("📊 Live Monitoring"),
+        go("🏠 Dashboard"),
+    ],
+}
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * p / 100))], 2)
+
+def summarize(timings):
+    return {'count': len(timings), 'p50_ms': percentile(timings, 50),
+            'p95_ms': percentile(timings, 95), 'p99_ms': percentile(timings, 99)}
+
+MAX_CONSECUTIVE_ERRORS = 20
+
+# ast.parse is not safe to run from several threads at once on some CPython
+# versions, and AppTest compiles app.py afresh on every run, so parsing is
+# serialized for the whole process
+_parse_lock = threading.Lock()
+_parse = ast.parse
+
+def _serialized_parse(*args, **kwargs):
+    with _parse_lock:
+        return _parse(*args, **kwargs)
+
+ast.parse = _serialized_parse
+
+def start_session():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    return at
+
+def session(index, deadline, results, errors, seed):
+    rng = random.Random(seed + index)
+    role = list(SCRIPTS)[index % len(SCRIPTS)]
+    at = start_session()
+    failures = 0
+    while time.monotonic() < deadline and failures < MAX_CONSECUTIVE_ERRORS:
+        for step in SCRIPTS[role]:
+            if time.monotonic() >= deadline:
+                break
+            start = time.perf_counter()
+            try:
+                done = step(at, rng)
+            except Exception as e:
+                errors.append(f"{step.__name__}: {e!r}")
+                failures += 1
+                # the widget tree may be half-updated; start over as a fresh session
+                at = start_session()
+                break
+            elapsed = (time.perf_counter() - start) * 1000
+            if done is False:
+                continue
+            if at.exception:
+                errors.append(f"{step.__name__}: {at.exception[0].value[:200]}")
+                failures += 1
+            else:
+                failures = 0
+            results.append((role, step.__name__, elapsed))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=60, help="seconds")
+    parser.add_argument('--appointments', type=int, default=100000, help="size of the generated database")
+    parser.add_argument('--db', help="copy this database instead of generating one")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', help="write the report as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='hospital-load-')
+    db_path = os.path.join(workdir, 'hospital.db')
+    if args.db:
+        shutil.copy(args.db, db_path)
+    else:
+        print(f"generating {args.appointments:,} appointments ...", flush=True)
+        datagen.generate(db_path, args.appointments, args.seed, date.today())
+    # app.py opens hospital.db relative to the working directory
+    os.chdir(workdir)
+    pool._pool = TimedPool(db_path)
+
+    results, errors = [], []
+    deadline = time.monotonic() + args.duration
+    threads = [threading.Thread(target=session, args=(i, deadline, results, errors, args.seed), daemon=True)
+               for i in range(args.sessions)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    by_step = {}
+    for role, step, ms in results:
+        by_step.setdefault(step, []).append(ms)
+    write_timings = list(writes.timings)
+    report = {
+        'sessions': args.sessions,
+        'duration_s': round(wall, 1),
+        'steps': len(results),
+        'throughput_steps_per_s': round(len(results) / wall, 2),
+        'rerun': summarize([ms for _, _, ms in results]),
+        'by_step': {step: summarize(timings) for step, timings in sorted(by_step.items())},
+        'writes': {**summarize(write_timings),
+                   'lock_waits': sum(ms > LOCK_WAIT_MS for ms in write_timings),
+                   'lock_wait_ms_total': round(sum(ms for ms in write_timings if ms > LOCK_WAIT_MS), 1),
+                   'locked_errors': writes.errors},
+        'errors': len(errors),
+        'error_samples': errors[:10],
+    }
+
+    print(f"\n{args.sessions} sessions, {wall:.1f}s, {len(results)} steps, "
+          f"{report['throughput_steps_per_s']} steps/s, {len(errors)} errors")
+    print(f"{'step':<32} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for step, s in [('all reruns', report['rerun'])] + list(report['by_step'].items()):
+        print(f"{step:<32} {s['count']:>6} {s['p50_ms']:>9} {s['p95_ms']:>9} {s['p99_ms']:>9}")
+    w = report['writes']
+    print(f"\nwrites: {w['count']} p50 {w['p50_ms']} ms p99 {w['p99_ms']} ms, "
+          f"{w['lock_waits']} waited > {LOCK_WAIT_MS} ms ({w['lock_wait_ms_total']} ms total), "
+          f"{w['locked_errors']} 'database is locked' errors")
+    for e in report['error_samples']:
+        print(f"  ! {e}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"report written to {args.out}")
+    shutil.rmtree(workdir, ignore_errors=True)
+    sys.exit(1 if errors else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# Query-result cache invalidated by process-wide table version counters
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from pool import get_conn
+from profiler import note_cache_hit, note_frame
+
+MAX_ENTRIES = 256
+TTL_SECONDS = 300
+
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)', re.I)
+
+# Tables (and views) whose rows change whenever the key table changes
+DERIVED_TABLES = {
+    'appointments': ('doctor_daily_stats', 'dept_daily_stats', 'row_counts'),
+    'billing': ('billing_totals', 'doctor_revenue'),
+    'inventory': ('low_stock', 'stock_movements'),
+    'lab_tests': ('row_counts',),
+    'patients': ('row_counts',),
+    'pharmacy': ('pharmacy_daily',),
+}
+
+_versions = defaultdict(int)
+_lock = threading.Lock()
+
+def bump(*tables):
+    """Record a committed write to tables; cached reads over them go stale."""
+    with _lock:
+        for table in tables:
+            _versions[table] += 1
+            for derived in DERIVED_TABLES.get(table, ()):
+                _versions[derived] += 1
+
+def versions(tables):
+    return tuple(_versions[table] for table in tables)
+
+def tables_in(sql):
+    return tuple(sorted(set(TABLE_REF.findall(sql))))
+
+class QueryCache:
+    """LRU of query results keyed by (SQL, params).
+
+    An entry is served only while the version of every table the SQL reads is
+    unchanged and it is younger than the TTL. Writes made by other processes
+    reach the versions through the change log (see changes.follow_cache); the
+    TTL still covers queries that depend on date('now').
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetch(self, sql, params, loader):
+        key = (sql, tuple(params))
+        tables = tables_in(sql)
+        current = versions(tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == current and entry[1] > now:
+                self._entries.move_to_end(key)
+                note_cache_hit(sql)
+                return entry[2]
+        value = loader()
+        with self._lock:
+            self._entries[key] = (current, now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+query_cache = QueryCache()
+
+def cached(sql, loader, params=()):
+    return query_cache.fetch(sql, params, loader)
+
+def cached_df(sql, params=()):
+    """pd.read_sql through the cache; the DataFrame is shared, so treat it as read-only."""
+    import pandas as pd
+
+    df = query_cache.fetch(sql, params, lambda: pd.read_sql(sql, get_conn(), params=params or None))
+    note_frame(sql, df)
+    return df
+
+def cached_value(sql, params=()):
+    return query_cache.fetch(sql, params, lambda: get_conn().execute(sql, params).fetchone()[0])
@@ -0,0 +1,188 @@
+# Change data capture: every write to the base tables, in commit order
+#
+# Triggers append one change_log row per inserted, updated or deleted row. seq
+# is AUTOINCREMENT, so it only grows and is never reused; SQLite has a single
+# writer, so a reader that has seen seq N will never later find a new row
+# below N. Consumers remember the last seq they processed (in memory, or in
+# change_checkpoints under a name) and read only what came after it.
+#
+# The log records which row changed, not its values: a consumer reads the
+# current row by row_id, or drops it when the last op is 'delete'. A bulk
+# import with deferred triggers logs a single 'reload' (row_id NULL) for the
+# whole table instead of one event per row.
+#
+#   python changes.py [--db hospital.db] [--after SEQ] [--table T] [--limit N]
+#   python changes.py --consumers | --prune
+import argparse
+import sqlite3
+import sys
+import threading
+from collections import namedtuple
+
+TABLES = ('departments', 'doctors', 'patients', 'appointments', 'medical_records', 'billing', 'staff',
+          'inventory', 'beds', 'lab_tests', 'pharmacy', 'ambulance', 'blood_bank')
+
+BATCH_SIZE = 1000
+
+Change = namedtuple('Change', 'seq table op row_id changed_at')
+
+def _trigger(table, event, row):
+    return f"""CREATE TRIGGER IF NOT EXISTS {table}_cdc_{event} AFTER {event.upper()} ON {table} BEGIN
+        INSERT INTO change_log (table_name, op, row_id) VALUES ('{table}', '{event}', {row}.rowid);
+    END"""
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        op TEXT NOT NULL,
+        row_id INTEGER,
+        changed_at DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+    )""",
+    """CREATE TABLE IF NOT EXISTS change_checkpoints (
+        consumer TEXT PRIMARY KEY,
+        seq INTEGER NOT NULL,
+        updated_at DATETIME
+    ) WITHOUT ROWID""",
+    # per-table reads ("what changed in billing since N") seek this instead of scanning the log
+    "CREATE INDEX IF NOT EXISTS idx_change_log_table ON change_log(table_name, seq)",
+] + [_trigger(table, event, 'old' if event == 'delete' else 'new')
+     for table in TABLES for event in ('insert', 'update', 'delete')]
+
+RELOAD_SQL = "INSERT INTO change_log (table_name, op) VALUES (?, 'reload')"
+
+def latest_seq(conn):
+    # sqlite_sequence keeps the high-water mark even after prune() empties the log
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return row[0] if row else 0
+
+def read_changes(conn, after=0, tables=None, limit=BATCH_SIZE):
+    """Up to limit Changes with seq > after, oldest first, optionally only for tables."""
+    sql = "SELECT seq, table_name, op, row_id, changed_at FROM change_log WHERE seq > ?"
+    params = [after]
+    if tables:
+        sql += f" AND table_name IN ({', '.join('?' * len(tables))})"
+        params += list(tables)
+    sql += " ORDER BY seq LIMIT ?"
+    return [Change(*row) for row in conn.execute(sql, (*params, limit))]
+
+def changed_tables(conn, after):
+    """{table: last seq} for every table written since after; one range read of the log."""
+    return dict(conn.execute("SELECT table_name, MAX(seq) FROM change_log WHERE seq > ? GROUP BY table_name",
+                             (after,)).fetchall())
+
+def net_changes(changes):
+    """{(table, row_id): last op} over changes; a 'reload' is keyed (table, None)."""
+    return {(change.table, change.row_id): change.op for change in changes}
+
+def catch_up(conn, table, after, reload, apply, batch_size=BATCH_SIZE):
+    """Bring an in-memory mirror of table from log position after up to date; return the new position.
+
+    apply(row_ids) refreshes the given rows; reload() rebuilds the mirror from
+    the table, which happens on first use (after is None), on a 'reload' event
+    and when prune() has removed events the mirror has not seen. Run it in one
+    read transaction so the rows read agree with the position returned.
+    """
+    low, high = conn.execute("""SELECT (SELECT MIN(seq) FROM change_log),
+        (SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'change_log')""").fetchone()
+    if after is None or (high > after and (low is None or low > after + 1)):
+        reload()
+        return high
+    while True:
+        batch = read_changes(conn, after, (table,), batch_size)
+        if not batch:
+            return after
+        if any(change.op == 'reload' for change in batch):
+            reload()
+        else:
+            apply(sorted({change.row_id for change in batch}))
+        after = batch[-1].seq
+
+def get_checkpoint(conn, consumer):
+    row = conn.execute("SELECT seq FROM change_checkpoints WHERE consumer = ?", (consumer,)).fetchone()
+    return row[0] if row else 0
+
+def set_checkpoint(conn, consumer, seq):
+    """Record that consumer has processed everything up to seq; the caller commits."""
+    conn.execute("""INSERT INTO change_checkpoints (consumer, seq, updated_at) VALUES (?, ?, datetime('now'))
+                    ON CONFLICT (consumer) DO UPDATE SET seq = MAX(seq, excluded.seq), updated_at = excluded.updated_at""",
+                 (consumer, seq))
+
+def consume(conn, consumer, handle, tables=None, batch_size=BATCH_SIZE):
+    """Feed the changes after consumer's checkpoint to handle(batch) and advance it; return the count.
+
+    The checkpoint moves only after handle returns, so delivery is at least
+    once: a handler that raises sees the same batch again on the next call.
+    """
+    done = 0
+    while True:
+        after = get_checkpoint(conn, consumer)
+        batch = read_changes(conn, after, tables, batch_size)
+        if not batch:
+            return done
+        handle(batch)
+        with conn:
+            set_checkpoint(conn, consumer, batch[-1].seq)
+        done += len(batch)
+
+def prune(conn, upto=None):
+    """Delete events every named consumer has processed (or those up to upto); return the count."""
+    if upto is None:
+        upto = conn.execute("SELECT MIN(seq) FROM change_checkpoints").fetchone()[0]
+        if upto is None:
+            return 0
+    with conn:
+        return conn.execute("DELETE FROM change_log WHERE seq <= ?", (upto,)).rowcount
+
+# The query cache's table versions only see writes made by this process; the
+# app follows the log once per rerun so that writes from other processes
+# (imports, the CLI tools, another server) invalidate it too.
+_followed = {}
+_follow_lock = threading.Lock()
+
+def follow_cache(conn, db_name):
+    """Bump the cache version of every table written since the previous call for db_name."""
+    from cache import bump
+
+    with _follow_lock:
+        after = _followed.get(db_name)
+        if after is None:
+            _followed[db_name] = latest_seq(conn)
+            return ()
+        written = changed_tables(conn, after)
+        if written:
+            _followed[db_name] = max(written.values())
+            bump(*written)
+        return tuple(written)
+
+def main(argv=None):
+    from db import DB_NAME
+
+    parser = argparse.ArgumentParser(description="Read the change log")
+    parser.add_argument('--db', default=DB_NAME)
+    parser.add_argument('--after', type=int, default=0, help="show events with seq above this")
+    parser.add_argument('--table', action='append', choices=TABLES, help="only this table (repeatable)")
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--consumers', action='store_true', help="list consumer checkpoints")
+    parser.add_argument('--prune', action='store_true', help="delete events all consumers have processed")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, timeout=10)
+    try:
+        if args.consumers:
+            for consumer, seq, updated_at in conn.execute(
+                    "SELECT consumer, seq, updated_at FROM change_checkpoints ORDER BY consumer"):
+                print(f"{consumer:<24} {seq:>10}  {updated_at}")
+        elif args.prune:
+            print(f"pruned {prune(conn)} events")
+        else:
+            for change in read_changes(conn, args.after, args.table, args.limit):
+                print(f"{change.seq:>10}  {change.changed_at}  {change.op:<7} {change.table}"
+                      f"{'' if change.row_id is None else f' #{change.row_id}'}")
+            print(f"latest seq {latest_seq(conn)}", file=sys.stderr)
+    finally:
+        conn.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
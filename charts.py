@@ -0,0 +1,101 @@
+# Chart data layer: aggregate in SQL, cap the points, cache the figure JSON
+#
+# Every chart query returns one row per bar, slice or time bucket, so the rows
+# read and the figure sent to the browser stay small whatever the table size.
+# Figures are built from those rows, serialized once, and served from the query
+# cache until a write to one of the tables behind them (see cache.bump).
+import json
+
+from cache import cached
+from pool import get_conn
+
+MAX_POINTS = 500  # per line chart; longer series are merged into wider buckets
+MAX_SLICES = 25   # bars or pie slices; the smallest beyond this are summed into "Other"
+
+# date bucket -> SQLite expression over the date column, from finest to coarsest
+BUCKETS = {
+    'hour': "strftime('%Y-%m-%d %H:00', {col})",
+    'day': "date({col})",
+    'week': "date({col}, 'weekday 0', '-6 days')",
+    'month': "strftime('%Y-%m', {col})",
+    'year': "strftime('%Y', {col})",
+}
+BUCKET_DAYS = {'hour': 1 / 24, 'day': 1, 'week': 7, 'month': 30.44, 'year': 365.25}
+
+def _figure(sql, params, title, build):
+    """Cached plotly figure dict for the rows of sql, or None when it returns no rows."""
+    def load():
+        rows = get_conn().execute(sql, params).fetchall()
+        return build(rows).to_json() if rows else None
+    # the figure entry is keyed apart from any data entry for the same SQL
+    data = cached(sql, load, (*params, 'figure', title))
+    return json.loads(data) if data else None
+
+def _cap(rows):
+    """Keep the MAX_SLICES - 1 largest (label, value) rows and sum the rest into "Other"."""
+    if len(rows) <= MAX_SLICES:
+        return rows
+    rows = sorted(rows, key=lambda row: row[1] or 0, reverse=True)
+    return rows[:MAX_SLICES - 1] + [("Other", sum(row[1] or 0 for row in rows[MAX_SLICES - 1:]))]
+
+def _columns(rows, x, y):
+    return {x: [row[0] for row in rows], y: [row[1] for row in rows]}
+
+def bar(sql, x, y, title, params=(), color=True):
+    """Bar chart of (label, value) rows, in query order."""
+    def build(rows):
+        import plotly.express as px
+
+        rows = _cap(rows)
+        return px.bar(_columns(rows, x, y), x=x, y=y, title=title, color=y if color else None)
+    return _figure(sql, params, title, build)
+
+def pie_figure(rows, names, values, title):
+    import plotly.express as px
+
+    return px.pie(_columns(_cap(rows), names, values), names=names, values=values, title=title)
+
+def pie(sql, names, values, title, params=()):
+    """Pie chart of (label, value) rows."""
+    return _figure(sql, params, title, lambda rows: pie_figure(rows, names, values, title))
+
+def line_figure(rows, x, y, title):
+    import plotly.express as px
+
+    return px.line(_columns(rows, x, y), x=x, y=y, title=title)
+
+def pick_bucket(first, last):
+    """Finest BUCKETS entry that keeps the span first..last (ISO dates) within MAX_POINTS."""
+    from datetime import date
+
+    span = (date.fromisoformat(last[:10]) - date.fromisoformat(first[:10])).days + 1
+    return next((bucket for bucket, days in BUCKET_DAYS.items() if span / days <= MAX_POINTS), 'year')
+
+def time_series_sql(table, date_col, bucket, where=(), value="COUNT(*)"):
+    clauses = [f"{date_col} IS NOT NULL", *where]
+    period = BUCKETS[bucket].format(col=date_col)
+    return f"""SELECT {period} AS period, {value} AS value FROM {table}
+               WHERE {' AND '.join(clauses)} GROUP BY period ORDER BY period"""
+
+def _span_end(value, table, where, params):
+    sql = f"SELECT {value} FROM {table} WHERE {' AND '.join(where) or '1'}"
+    return cached(sql, lambda: get_conn().execute(sql, params).fetchone()[0], params)
+
+def time_series(table, date_col, title, y='count', where=(), params=(), value="COUNT(*)", bucket=None):
+    """Line chart of value per date bucket; the bucket defaults to the finest one that fits MAX_POINTS."""
+    if bucket is None:
+        # MIN and MAX of an indexed column are single index seeks, but only as
+        # separate statements: together in one SELECT they scan the index
+        first, last = (_span_end(f"{end}({date_col})", table, where, params) for end in ('MIN', 'MAX'))
+        if first is None:
+            return None
+        bucket = pick_bucket(str(first), str(last))
+    sql = time_series_sql(table, date_col, bucket, where, value)
+
+    def build(rows):
+        if len(rows) > MAX_POINTS:
+            # merge runs of adjacent buckets, labelled by their first period
+            step = -(-len(rows) // MAX_POINTS)
+            rows = [(rows[i][0], sum(row[1] or 0 for row in rows[i:i + step])) for i in range(0, len(rows), step)]
+        return line_figure(rows, bucket, y, title)
+    return _figure(sql, params, title, build)
@@ -0,0 +1,366 @@
+# Deterministic synthetic hospital data at any scale
+#
+#   python datagen.py big.db --appointments 1000000 [--seed 42] [--today 2025-01-01] [--force]
+#
+# Everything is sized from the appointment count and drawn from one seeded
+# random.Random, with dates laid out around an anchor day (three years of
+# history, a month of bookings ahead), so the same seed and anchor always
+# produce the same database. Rows are written with explicit ids, so every
+# foreign key points at a real row. Indexes and triggers are dropped for the
+# load and rebuilt at the end, along with the search index, rollups and the
+# opening movements of the stock ledger.
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+import rollups
+import stock
+from importer import defer_objects
+
+BATCH_SIZE = 100000
+TABLES = ('departments', 'doctors', 'patients', 'appointments', 'medical_records', 'billing', 'staff',
+          'inventory', 'beds', 'lab_tests', 'pharmacy', 'ambulance', 'blood_bank')
+
+DEPARTMENTS = [
+    ('Cardiology', 'Cardiologist'), ('Neurology', 'Neurologist'), ('Orthopedics', 'Orthopedic Surgeon'),
+    ('Pediatrics', 'Pediatrician'), ('Emergency', 'Emergency Physician'), ('General Medicine', 'General Physician'),
+    ('Gynecology', 'Gynecologist'), ('Dermatology', 'Dermatologist'), ('ENT', 'ENT Specialist'),
+    ('Ophthalmology', 'Ophthalmologist'), ('Oncology', 'Oncologist'), ('Psychiatry', 'Psychiatrist'),
+]
+# share of appointments each department gets, in DEPARTMENTS order
+DEPARTMENT_WEIGHTS = [10, 6, 8, 12, 9, 20, 8, 6, 5, 5, 4, 3]
+
+FIRST_NAMES = ['Ahmed', 'Ali', 'Ayesha', 'Bilal', 'Fatima', 'Hamza', 'Hassan', 'Imran', 'Khadija', 'Maryam',
+               'Omar', 'Rabia', 'Saad', 'Sana', 'Sara', 'Tariq', 'Usman', 'Zainab', 'Zara', 'Yusuf',
+               'Hina', 'Kamran', 'Nadia', 'Faisal', 'Amna', 'Asad', 'Mehwish', 'Junaid', 'Iqra', 'Danish']
+LAST_NAMES = ['Khan', 'Ali', 'Ahmed', 'Malik', 'Raza', 'Hussain', 'Sheikh', 'Butt', 'Chaudhry', 'Qureshi',
+              'Siddiqui', 'Mirza', 'Abbasi', 'Javed', 'Iqbal', 'Noor', 'Shah', 'Aslam', 'Rehman', 'Farooq']
+CITIES = [('Karachi', 30), ('Lahore', 25), ('Islamabad', 10), ('Rawalpindi', 8), ('Faisalabad', 8),
+          ('Multan', 6), ('Peshawar', 6), ('Quetta', 4), ('Hyderabad', 3)]
+# approximate population shares
+BLOOD_GROUPS = [('O+', 35), ('A+', 27), ('B+', 22), ('AB+', 6), ('O-', 4), ('A-', 3), ('B-', 2), ('AB-', 1)]
+
+REASONS = [
+    ('Routine checkup', 'Healthy', None), ('Fever', 'Viral Fever', 'Paracetamol'), ('Chest pain', 'Angina Pectoris', 'Aspirin'),
+    ('Headache', 'Migraine', 'Sumatriptan'), ('Back pain', 'Lumbar Strain', 'Ibuprofen'), ('Cough', 'Bronchitis', 'Amoxicillin'),
+    ('Knee pain', 'Osteoarthritis', 'Diclofenac'), ('Skin rash', 'Dermatitis', 'Hydrocortisone'),
+    ('Follow-up', 'Stable', None), ('Stomach ache', 'Gastritis', 'Omeprazole'), ('High blood pressure', 'Hypertension', 'Amlodipine'),
+    ('Emergency', 'Trauma', 'Tramadol'), ('Child checkup', 'Healthy', None), ('Diabetes review', 'Type 2 Diabetes', 'Metformin'),
+]
+LAB_TESTS = [('Blood Test', 1500, 40), ('Urine Test', 800, 15), ('X-Ray', 2000, 15), ('ECG', 1200, 10),
+             ('Ultrasound', 3500, 10), ('CT Scan', 12000, 6), ('MRI Scan', 18000, 4)]
+LAB_RESULTS = ['Normal', 'Normal', 'Normal', 'Mildly elevated', 'Abnormal - review', 'Within limits']
+MEDICINES = [('Paracetamol', '500mg', 5), ('Aspirin', '75mg', 5), ('Sumatriptan', '50mg', 50), ('Ibuprofen', '400mg', 10),
+             ('Amoxicillin', '500mg', 25), ('Diclofenac', '50mg', 12), ('Hydrocortisone', '1%', 90),
+             ('Omeprazole', '20mg', 15), ('Amlodipine', '5mg', 18), ('Tramadol', '50mg', 30), ('Metformin', '500mg', 8),
+             ('Atorvastatin', '20mg', 22), ('Cetirizine', '10mg', 6), ('Azithromycin', '250mg', 45)]
+SUPPLIES = [('Surgical Gloves', 'Equipment', 50), ('Syringes', 'Equipment', 10), ('Bandages', 'Supplies', 20),
+            ('Gauze Pads', 'Supplies', 15), ('IV Sets', 'Surgical', 120), ('Face Masks', 'Supplies', 8),
+            ('Catheters', 'Surgical', 200), ('Sutures', 'Surgical', 150), ('Cotton Rolls', 'Supplies', 60),
+            ('Thermometers', 'Equipment', 400), ('BP Cuffs', 'Equipment', 2500), ('Scalpels', 'Surgical', 90)]
+SUPPLIERS = ['PharmaCorp', 'MedSupply', 'HealthCare Ltd', 'CurePlus', 'Getz Pharma', 'Searle']
+STAFF_ROLES = [('Nurse', 55000, 50), ('Receptionist', 35000, 10), ('Lab Technician', 45000, 10),
+               ('Pharmacist', 60000, 5), ('Ward Boy', 28000, 15), ('Administrator', 70000, 5), ('Security', 30000, 5)]
+WARDS = [('General', 'B', 60), ('ICU', 'I', 10), ('Private', 'P', 20), ('Maternity', 'M', 10)]
+TIMES = [f"{h % 12 or 12:02d}:{m:02d} {'AM' if h < 12 else 'PM'}" for h in range(9, 18) for m in (0, 15, 30, 45)]
+
+def plan_sizes(appointments):
+    """Row counts for every table, derived from the number of appointments."""
+    doctors = max(5, appointments // 2500)
+    return {
+        'departments': len(DEPARTMENTS),
+        'doctors': doctors,
+        'patients': max(5, appointments // 4),
+        'appointments': appointments,
+        'staff': doctors * 3,
+        'inventory': len(MEDICINES) + len(SUPPLIES) * 10,
+        'beds': max(10, doctors * 2),
+        'ambulance': max(3, doctors // 40),
+        'blood_bank': max(10, appointments // 100),
+    }
+
+def _cumulative(weights):
+    total, out = 0, []
+    for w in weights:
+        total += w
+        out.append(total)
+    return out
+
+class Generator:
+    """Yields the rows of each table in batches. Call the methods in TABLES order."""
+
+    def __init__(self, appointments, seed=42, today=None):
+        self.rng = random.Random(seed)
+        self.today = today or date.today()
+        self.sizes = plan_sizes(appointments)
+        self.start = self.today - timedelta(days=3 * 365)
+        self.doctor_fees = []
+        self.doctor_weights = []
+
+    def _name(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def _phone(self):
+        return f"03{self.rng.randint(0, 49):02d}-{self.rng.randint(0, 9999999):07d}"
+
+    def _day(self, offset):
+        return (self.start + timedelta(days=offset)).isoformat()
+
+    def departments(self):
+        yield [(i, name, f"Building {chr(65 + i % 8)}") for i, (name, _) in enumerate(DEPARTMENTS, 1)]
+
+    def doctors(self):
+        rng, rows = self.rng, []
+        dept_cum = _cumulative(DEPARTMENT_WEIGHTS)
+        for doctor_id in range(1, self.sizes['doctors'] + 1):
+            dept = rng.choices(range(len(DEPARTMENTS)), cum_weights=dept_cum)[0]
+            experience = rng.randint(1, 35)
+            fee = round(min(10000, 800 + experience * 60 + rng.lognormvariate(6, 0.6)), -2)
+            name = f"Dr. {self._name()}"
+            rows.append((doctor_id, name, DEPARTMENTS[dept][1], dept + 1, self._phone(),
+                         f"doctor{doctor_id}@hospital.com", experience, fee))
+            self.doctor_fees.append(fee)
+            # a few doctors carry most of the load (Zipf-like)
+            self.doctor_weights.append(1 / (rng.random() * 9 + 1) ** 1.5)
+        yield rows
+
+    def patients(self):
+        rng, days = self.rng, (self.today - self.start).days
+        city_cum = _cumulative(w for _, w in CITIES)
+        blood_cum = _cumulative(w for _, w in BLOOD_GROUPS)
+        cities, groups = [c for c, _ in CITIES], [g for g, _ in BLOOD_GROUPS]
+        rows = []
+        for patient_id in range(1, self.sizes['patients'] + 1):
+            age = rng.randint(0, 17) if rng.random() < 0.22 else min(95, int(rng.gauss(42, 17)))
+            rows.append((patient_id, self._name(), max(1, age), rng.choice(('Male', 'Female')), self._phone(),
+                         f"patient{patient_id}@email.com", rng.choices(cities, cum_weights=city_cum)[0],
+                         rng.choices(groups, cum_weights=blood_cum)[0], self._day(rng.randint(0, days))))
+            if len(rows) == BATCH_SIZE:
+                yield rows
+                rows = []
+        yield rows
+
+    def appointments(self):
+        """Appointments plus the records, bills, lab tests and prescriptions that follow from them."""
+        rng, sizes = self.rng, self.sizes
+        days = (self.today - self.start).days
+        doctor_cum = _cumulative(self.doctor_weights)
+        doctor_ids = range(1, sizes['doctors'] + 1)
+        patients = sizes['patients']
+        lab_cum = _cumulative(w for _, _, w in LAB_TESTS)
+        # medicines are the first inventory items, in MEDICINES order
+        medicines = {name: (dose, price, item_id) for item_id, (name, dose, price) in enumerate(MEDICINES, 1)}
+        batch = {table: [] for table in ('appointments', 'medical_records', 'billing', 'lab_tests', 'pharmacy')}
+        for appointment_id in range(1, sizes['appointments'] + 1):
+            doctor = rng.choices(doctor_ids, cum_weights=doctor_cum)[0]
+            # returning patients: low ids (registered earlier) visit more often
+            patient = 1 + int(patients * rng.random() ** 1.6)
+            # volume grows over time, and a month of bookings lies ahead
+            offset = min(days + 30, int((days + 30) * rng.random() ** 0.7))
+            day = self._day(offset)
+            reason, diagnosis, medicine = REASONS[rng.randrange(len(REASONS))]
+            past = offset < days
+            roll = rng.random()
+            status = ('Scheduled' if not past else
+                      'Completed' if roll < 0.8 else 'Cancelled' if roll < 0.92 else 'Scheduled')
+            batch['appointments'].append((appointment_id, patient, doctor, day, rng.choice(TIMES), status, reason))
+
+            if status == 'Completed':
+                if rng.random() < 0.6:
+                    batch['medical_records'].append((patient, doctor, diagnosis, medicine and f"{medicine} {medicines[medicine][0]}",
+                                                     None, day))
+                recent = days - offset < 30
+                paid = rng.random() < (0.5 if recent else 0.95)
+                batch['billing'].append((patient, appointment_id, self.doctor_fees[doctor - 1],
+                                         'Paid' if paid else 'Pending',
+                                         self._day(min(days, offset + rng.randint(0, 14))) if paid else None))
+                if medicine and rng.random() < 0.7:
+                    quantity = rng.choice((10, 14, 20, 30))
+                    batch['pharmacy'].append((patient, doctor, medicines[medicine][2], medicine, medicines[medicine][0],
+                                              quantity, quantity * medicines[medicine][1], day))
+            if status != 'Cancelled' and rng.random() < 0.3:
+                test, cost, _ = LAB_TESTS[rng.choices(range(len(LAB_TESTS)), cum_weights=lab_cum)[0]]
+                age = days - offset
+                test_status = 'Completed' if age > 3 else 'In Progress' if age >= 0 else 'Scheduled'
+                batch['lab_tests'].append((patient, test, day,
+                                           rng.choice(LAB_RESULTS) if test_status == 'Completed' else None,
+                                           test_status, cost))
+            if len(batch['appointments']) == BATCH_SIZE:
+                yield batch
+                batch = {table: [] for table in batch}
+        yield batch
+
+    def staff(self):
+        rng, days = self.rng, (self.today - self.start).days
+        role_cum = _cumulative(w for _, _, w in STAFF_ROLES)
+        rows = []
+        for staff_id in range(1, self.sizes['staff'] + 1):
+            role, salary, _ = STAFF_ROLES[rng.choices(range(len(STAFF_ROLES)), cum_weights=role_cum)[0]]
+            rows.append((staff_id, self._name(), role, rng.randint(1, len(DEPARTMENTS)), self._phone(),
+                         f"staff{staff_id}@hospital.com", round(salary * rng.uniform(0.85, 1.3), -2),
+                         self._day(rng.randint(0, days))))
+        yield rows
+
+    def inventory(self):
+        rng, rows = self.rng, []
+        items = [(name, 'Medicine', price) for name, _, price in MEDICINES]
+        items += [(f"{name} ({size})", category, price) for name, category, price in SUPPLIES
+                  for size in ('S', 'M', 'L', 'XL', 'Box of 10', 'Box of 50', 'Box of 100', 'Pack', 'Case', 'Single')]
+        for item_id, (name, category, price) in enumerate(items, 1):
+            # roughly one item in ten is below the low-stock line
+            quantity = rng.randint(0, 99) if rng.random() < 0.1 else int(rng.lognormvariate(6.2, 0.8)) + 100
+            rows.append((item_id, name, category, quantity, price, rng.choice(SUPPLIERS),
+                         (self.today - timedelta(days=rng.randint(0, 60))).isoformat()))
+        yield rows
+
+    def beds(self):
+        rng, rows = self.rng, []
+        ward_cum = _cumulative(w for _, _, w in WARDS)
+        counters = {}
+        for bed_id in range(1, self.sizes['beds'] + 1):
+            ward, prefix, _ = WARDS[rng.choices(range(len(WARDS)), cum_weights=ward_cum)[0]]
+            counters[ward] = counters.get(ward, 0) + 1
+            occupied = rng.random() < 0.75
+            # length of stay so far: mostly a few days, occasionally weeks
+            stay = int(rng.expovariate(1 / 4))
+            rows.append((bed_id, f"{prefix}-{counters[ward]:04d}", ward, 'Occupied' if occupied else 'Available',
+                         rng.randint(1, self.sizes['patients']) if occupied else None,
+                         (self.today - timedelta(days=stay)).isoformat() if occupied else None))
+        yield rows
+
+    def ambulance(self):
+        rng, rows = self.rng, []
+        for ambulance_id in range(1, self.sizes['ambulance'] + 1):
+            on_duty = rng.random() < 0.3
+            rows.append((ambulance_id, f"AMB-{ambulance_id:03d}", self._name(), 'On Duty' if on_duty else 'Available',
+                         rng.randint(1, self.sizes['patients']) if on_duty else None,
+                         rng.choice(CITIES)[0] if on_duty else None, 'Hospital' if on_duty else None,
+                         f"{self.today.isoformat()} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00" if on_duty else None))
+        yield rows
+
+    def blood_bank(self):
+        rng, rows = self.rng, []
+        blood_cum = _cumulative(w for _, w in BLOOD_GROUPS)
+        groups = [g for g, _ in BLOOD_GROUPS]
+        for blood_id in range(1, self.sizes['blood_bank'] + 1):
+            # red cells keep 42 days, so donations older than that are expired stock
+            donated = self.today - timedelta(days=rng.randint(0, 120))
+            rows.append((blood_id, rng.choices(groups, cum_weights=blood_cum)[0], rng.randint(1, 3), self._name(),
+                         donated.isoformat(), (donated + timedelta(days=42)).isoformat()))
+            if len(rows) == BATCH_SIZE:
+                yield rows
+                rows = []
+        yield rows
+
+INSERTS = {
+    'departments': "INSERT INTO departments (dept_id, dept_name, location) VALUES (?, ?, ?)",
+    'doctors': """INSERT INTO doctors (doctor_id, name, specialization, dept_id, phone, email, experience, consultation_fee)
+                  VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+    'patients': """INSERT INTO patients (patient_id, name, age, gender, phone, email, address, blood_group, registration_date)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    'appointments': """INSERT INTO appointments (appointment_id, patient_id, doctor_id, appointment_date, appointment_time, status, reason)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+    'medical_records': """INSERT INTO medical_records (patient_id, doctor_id, diagnosis, prescription, notes, record_date)
+                          VALUES (?, ?, ?, ?, ?, ?)""",
+    'billing': "INSERT INTO billing (patient_id, appointment_id, amount, payment_status, payment_date) VALUES (?, ?, ?, ?, ?)",
+    'lab_tests': "INSERT INTO lab_tests (patient_id, test_name, test_date, result, status, cost) VALUES (?, ?, ?, ?, ?, ?)",
+    'pharmacy': """INSERT INTO pharmacy (patient_id, doctor_id, item_id, medicine_name, dosage, quantity, price, issue_date)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+    'staff': "INSERT INTO staff (staff_id, name, role, dept_id, phone, email, salary, join_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    'inventory': """INSERT INTO inventory (item_id, item_name, category, quantity, unit_price, supplier, last_updated)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
+    'beds': "INSERT INTO beds (bed_id, bed_number, ward_type, status, patient_id, admission_date) VALUES (?, ?, ?, ?, ?, ?)",
+    'ambulance': """INSERT INTO ambulance (ambulance_id, vehicle_number, driver_name, status, patient_id, pickup_location,
+                                           destination, request_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+    'blood_bank': "INSERT INTO blood_bank (blood_id, blood_group, units, donor_name, donation_date, expiry_date) VALUES (?, ?, ?, ?, ?, ?)",
+}
+
+def generate(path, appointments, seed=42, today=None, force=False, progress=None):
+    """Create a database at path filled with synthetic data; return {table: row count}."""
+    from db import init_db
+
+    if os.path.exists(path):
+        if not force:
+            raise FileExistsError(f"{path} exists; pass force=True to replace it")
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    init_db(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-262144")
+
+    conn.execute("BEGIN IMMEDIATE")
+    deferred = []
+    for table in TABLES:
+        deferred += defer_objects(conn, table)
+    conn.execute("DELETE FROM stock_movements")
+    for table in TABLES:
+        conn.execute(f"DELETE FROM {table}")
+    conn.execute("DELETE FROM sqlite_sequence")
+    conn.commit()
+
+    generator = Generator(appointments, seed, today)
+    counts = dict.fromkeys(TABLES, 0)
+
+    def load(table, rows):
+        conn.executemany(INSERTS[table], rows)
+        counts[table] += len(rows)
+
+    for table in ('departments', 'doctors', 'patients', 'appointments', 'staff', 'inventory', 'beds',
+                  'ambulance', 'blood_bank'):
+        for batch in getattr(generator, table)():
+            conn.execute("BEGIN")
+            if isinstance(batch, dict):
+                for name, rows in batch.items():
+                    load(name, rows)
+            else:
+                load(table, batch)
+            conn.commit()
+            if progress:
+                progress(table, counts)
+
+    conn.execute("BEGIN IMMEDIATE")
+    for sql in deferred:
+        conn.execute(sql)
+    conn.execute("INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')")
+    for sql in (rollups.REBUILD_SQL + rollups.REVENUE_REBUILD_SQL + rollups.PHARMACY_REBUILD_SQL
+                + rollups.COUNTS_REBUILD_SQL):
+        conn.execute(sql)
+    conn.execute(stock.OPENING_SQL)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic hospital database.")
+    parser.add_argument('path')
+    parser.add_argument('--appointments', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--today', type=date.fromisoformat, help="anchor date, YYYY-MM-DD (default: today)")
+    parser.add_argument('--force', action='store_true', help="replace the file if it exists")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    def report(table, counts):
+        print(f"{time.perf_counter() - started:8.1f}s  {table:<13} {counts[table]:>12,}", flush=True)
+
+    try:
+        counts = generate(args.path, args.appointments, args.seed, args.today, args.force, progress=report)
+    except FileExistsError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(counts, indent=2))
+    print(f"{args.path}: {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
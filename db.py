@@ -0,0 +1,408 @@
+# Database schema, seed data and shared queries
+import argparse
+import sqlite3
+import sys
+import threading
+
+from migrations import SCHEMA_VERSION, get_version, migrate
+
+DB_NAME = 'hospital.db'
+
+def create_schema(conn):
+    c = conn.cursor()
+    c.execute('''CREATE TABLE IF NOT EXISTS departments (
+        dept_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        dept_name TEXT NOT NULL,
+        location TEXT
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS doctors (
+        doctor_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        specialization TEXT,
+        dept_id INTEGER,
+        phone TEXT,
+        email TEXT,
+        experience INTEGER,
+        consultation_fee REAL,
+        FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS patients (
+        patient_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        age INTEGER,
+        gender TEXT,
+        phone TEXT,
+        email TEXT,
+        address TEXT,
+        blood_group TEXT,
+        registration_date DATE
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS appointments (
+        appointment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        patient_id INTEGER,
+        doctor_id INTEGER,
+        appointment_date DATE,
+        appointment_time TEXT,
+        status TEXT,
+        reason TEXT,
+        FOREIGN KEY (patient_id) REFERENCES patients(patient_id),
+        FOREIGN KEY (doctor_id) REFERENCES doctors(doctor_id)
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS medical_records (
+        record_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        patient_id INTEGER,
+        doctor_id INTEGER,
+        diagnosis TEXT,
+        prescription TEXT,
+        notes TEXT,
+        record_date DATE,
+        FOREIGN KEY (patient_id) REFERENCES patients(patient_id),
+        FOREIGN KEY (doctor_id) REFERENCES doctors(doctor_id)
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS billing (
+        bill_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        patient_id INTEGER,
+        appointment_id INTEGER,
+        amount REAL,
+        payment_status TEXT,
+        payment_date DATE,
+        FOREIGN KEY (patient_id) REFERENCES patients(patient_id),
+        FOREIGN KEY (appointment_id) REFERENCES appointments(appointment_id)
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS staff (
+        staff_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        role TEXT,
+        dept_id INTEGER,
+        phone TEXT,
+        email TEXT,
+        salary REAL,
+        join_date DATE,
+        FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS inventory (
+        item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        item_name TEXT NOT NULL,
+        category TEXT,
+        quantity INTEGER,
+        unit_price REAL,
+        supplier TEXT,
+        last_updated DATE
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS beds (
+        bed_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bed_number TEXT NOT NULL,
+        ward_type TEXT,
+        status TEXT,
+        patient_id INTEGER,
+        admission_date DATE,
+        FOREIGN KEY (patient_id) REFERENCES patients(patient_id)
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS lab_tests (
+        test_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        patient_id INTEGER,
+        test_name TEXT,
+        test_date DATE,
+        result TEXT,
+        status TEXT,
+        cost REAL,
+        FOREIGN KEY (patient_id) REFERENCES patients(patient_id)
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS pharmacy (
+        prescription_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        patient_id INTEGER,
+        doctor_id INTEGER,
+        medicine_name TEXT,
+        dosage TEXT,
+        quantity INTEGER,
+        price REAL,
+        issue_date DATE,
+        FOREIGN KEY (patient_id) REFERENCES patients(patient_id),
+        FOREIGN KEY (doctor_id) REFERENCES doctors(doctor_id)
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS ambulance (
+        ambulance_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        vehicle_number TEXT,
+        driver_name TEXT,
+        status TEXT,
+        patient_id INTEGER,
+        pickup_location TEXT,
+        destination TEXT,
+        request_time DATETIME,
+        FOREIGN KEY (patient_id) REFERENCES patients(patient_id)
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS blood_bank (
+        blood_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        blood_group TEXT,
+        units INTEGER,
+        donor_name TEXT,
+        donation_date DATE,
+        expiry_date DATE
+    )''')
+
+    conn.commit()
+
+def seed(conn):
+    """Insert the sample hospital into an empty database; return False if it already has departments."""
+    c = conn.cursor()
+    c.execute("SELECT COUNT(*) FROM departments")
+    if c.fetchone()[0] == 0:
+        depts = [('Cardiology', 'Building A'), ('Neurology', 'Building B'), ('Orthopedics', 'Building C'),
+                 ('Pediatrics', 'Building D'), ('Emergency', 'Building E')]
+        c.executemany("INSERT INTO departments (dept_name, location) VALUES (?, ?)", depts)
+
+        doctors = [
+            ('Dr. Ahmed Khan', 'Cardiologist', 1, '0300-1234567', 'ahmed@hospital.com', 15, 2000),
+            ('Dr. Sara Ali', 'Neurologist', 2, '0301-2345678', 'sara@hospital.com', 10, 2500),
+            ('Dr. Hassan Raza', 'Orthopedic Surgeon', 3, '0302-3456789', 'hassan@hospital.com', 12, 1800),
+            ('Dr. Fatima Noor', 'Pediatrician', 4, '0303-4567890', 'fatima@hospital.com', 8, 1500),
+            ('Dr. Usman Malik', 'Emergency Physician', 5, '0304-5678901', 'usman@hospital.com', 7, 1200)
+        ]
+        c.executemany("INSERT INTO doctors (name, specialization, dept_id, phone, email, experience, consultation_fee) VALUES (?, ?, ?, ?, ?, ?, ?)", doctors)
+
+        patients = [
+            ('Ali Hassan', 35, 'Male', '0311-1111111', 'ali@email.com', 'Karachi', 'O+', '2024-01-15'),
+            ('Ayesha Khan', 28, 'Female', '0312-2222222', 'ayesha@email.com', 'Lahore', 'A+', '2024-01-20'),
+            ('Bilal Ahmed', 42, 'Male', '0313-3333333', 'bilal@email.com', 'Islamabad', 'B+', '2024-02-10'),
+            ('Zainab Ali', 55, 'Female', '0314-4444444', 'zainab@email.com', 'Karachi', 'AB+', '2024-02-15'),
+            ('Hamza Malik', 30, 'Male', '0315-5555555', 'hamza@email.com', 'Lahore', 'O-', '2024-03-01')
+        ]
+        c.executemany("INSERT INTO patients (name, age, gender, phone, email, address, blood_group, registration_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", patients)
+
+        appointments = [
+            (1, 1, '2024-03-15', '10:00 AM', 'Completed', 'Chest pain'),
+            (2, 2, '2024-03-16', '11:00 AM', 'Completed', 'Headache'),
+            (3, 3, '2024-03-17', '02:00 PM', 'Scheduled', 'Knee pain'),
+            (4, 4, '2024-03-18', '09:00 AM', 'Scheduled', 'Child checkup'),
+            (5, 5, '2024-03-19', '03:00 PM', 'Cancelled', 'Emergency')
+        ]
+        c.executemany("INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, status, reason) VALUES (?, ?, ?, ?, ?, ?)", appointments)
+
+        medical_records = [
+            (1, 1, 'Angina Pectoris', 'Aspirin 75mg, Atorvastatin 20mg', 'Patient advised rest', '2024-03-15'),
+            (2, 2, 'Migraine', 'Sumatriptan 50mg', 'Avoid stress triggers', '2024-03-16')
+        ]
+        c.executemany("INSERT INTO medical_records (patient_id, doctor_id, diagnosis, prescription, notes, record_date) VALUES (?, ?, ?, ?, ?, ?)", medical_records)
+
+        billing = [
+            (1, 1, 2000, 'Paid', '2024-03-15'),
+            (2, 2, 2500, 'Paid', '2024-03-16'),
+            (3, 3, 1800, 'Pending', None)
+        ]
+        c.executemany("INSERT INTO billing (patient_id, appointment_id, amount, payment_status, payment_date) VALUES (?, ?, ?, ?, ?)", billing)
+
+        staff = [
+            ('Nurse Sarah', 'Nurse', 1, '0320-1111111', 'sarah.nurse@hospital.com', 50000, '2023-01-10'),
+            ('Receptionist Ali', 'Receptionist', 5, '0321-2222222', 'ali.reception@hospital.com', 35000, '2023-05-15'),
+            ('Lab Tech Hassan', 'Lab Technician', 2, '0322-3333333', 'hassan.lab@hospital.com', 45000, '2023-03-20')
+        ]
+        c.executemany("INSERT INTO staff (name, role, dept_id, phone, email, salary, join_date) VALUES (?, ?, ?, ?, ?, ?, ?)", staff)
+
+        inventory = [
+            ('Paracetamol', 'Medicine', 500, 5, 'PharmaCorp', '2024-03-01'),
+            ('Surgical Gloves', 'Equipment', 200, 50, 'MedSupply', '2024-03-05'),
+            ('Syringes', 'Equipment', 1000, 10, 'MedSupply', '2024-03-10'),
+            ('Bandages', 'Supplies', 300, 20, 'HealthCare Ltd', '2024-03-12')
+        ]
+        c.executemany("INSERT INTO inventory (item_name, category, quantity, unit_price, supplier, last_updated) VALUES (?, ?, ?, ?, ?, ?)", inventory)
+
+        beds = [
+            ('B-101', 'General', 'Occupied', 1, '2024-03-15'),
+            ('B-102', 'General', 'Available', None, None),
+            ('B-201', 'ICU', 'Occupied', 2, '2024-03-16'),
+            ('B-202', 'ICU', 'Available', None, None),
+            ('B-301', 'Private', 'Available', None, None)
+        ]
+        c.executemany("INSERT INTO beds (bed_number, ward_type, status, patient_id, admission_date) VALUES (?, ?, ?, ?, ?)", beds)
+
+        lab_tests = [
+            (1, 'Blood Test', '2024-03-15', 'Normal', 'Completed', 1500),
+            (2, 'MRI Scan', '2024-03-16', 'Pending', 'In Progress', 8000),
+            (3, 'X-Ray', '2024-03-17', None, 'Scheduled', 2000)
+        ]
+        c.executemany("INSERT INTO lab_tests (patient_id, test_name, test_date, result, status, cost) VALUES (?, ?, ?, ?, ?, ?)", lab_tests)
+
+        pharmacy = [
+            (1, 1, 'Aspirin', '75mg', 30, 150, '2024-03-15'),
+            (2, 2, 'Sumatriptan', '50mg', 10, 500, '2024-03-16'),
+            (3, 3, 'Ibuprofen', '400mg', 20, 200, '2024-03-17')
+        ]
+        c.executemany("INSERT INTO pharmacy (patient_id, doctor_id, medicine_name, dosage, quantity, price, issue_date) VALUES (?, ?, ?, ?, ?, ?, ?)", pharmacy)
+
+        ambulance = [
+            ('AMB-001', 'Rashid Khan', 'Available', None, None, None, None),
+            ('AMB-002', 'Imran Ali', 'On Duty', 5, 'Gulshan', 'Hospital', '2024-03-19 15:30:00'),
+            ('AMB-003', 'Salman Ahmed', 'Available', None, None, None, None)
+        ]
+        c.executemany("INSERT INTO ambulance (vehicle_number, driver_name, status, patient_id, pickup_location, destination, request_time) VALUES (?, ?, ?, ?, ?, ?, ?)", ambulance)
+
+        blood_bank = [
+            ('A+', 15, 'Donor 1', '2024-03-01', '2024-06-01'),
+            ('B+', 10, 'Donor 2', '2024-03-05', '2024-06-05'),
+            ('O+', 20, 'Donor 3', '2024-03-10', '2024-06-10'),
+            ('AB+', 5, 'Donor 4', '2024-03-12', '2024-06-12'),
+            ('O-', 8, 'Donor 5', '2024-03-14', '2024-06-14')
+        ]
+        c.executemany("INSERT INTO blood_bank (blood_group, units, donor_name, donation_date, expiry_date) VALUES (?, ?, ?, ?, ?)", blood_bank)
+
+        conn.commit()
+        return True
+    return False
+
+def init_db(db_name=DB_NAME, sample_data=True):
+    """Create and migrate the schema and, with sample_data, seed an empty database."""
+    conn = sqlite3.connect(db_name)
+    try:
+        create_schema(conn)
+        if sample_data:
+            seed(conn)
+        migrate(conn)
+    finally:
+        conn.close()
+
+_bootstrapped = {}
+_bootstrap_lock = threading.Lock()
+
+def bootstrap(db_name=DB_NAME):
+    """Bring db_name up to SCHEMA_VERSION once per process; later calls return at once.
+
+    This is the app's startup path: it runs no DDL at all when the stored
+    schema version is current, and never seeds (see `python db.py --seed`).
+    """
+    if _bootstrapped.get(db_name) == SCHEMA_VERSION:
+        return
+    with _bootstrap_lock:
+        if _bootstrapped.get(db_name) == SCHEMA_VERSION:
+            return
+        conn = sqlite3.connect(db_name)
+        try:
+            try:
+                version = get_version(conn)
+            except sqlite3.DatabaseError as e:
+                raise sqlite3.DatabaseError(f"{db_name} is not a usable SQLite database ({e}); "
+                                            "restore it from a backup or move it aside") from e
+            if version != SCHEMA_VERSION:
+                create_schema(conn)
+                migrate(conn)
+        finally:
+            conn.close()
+        _bootstrapped[db_name] = SCHEMA_VERSION
+
+# Every dashboard KPI in one statement and one cursor fetch. Each filtered
+# count is a scalar subquery on its own filter column so that it is answered
+# by a range search of the matching index (see migrations.py); unfiltered counts
+# of the large tables come from the row_counts rollup and billing figures from
+# the billing_totals rollup (see rollups.py).
+STATS_SQL = """
+    SELECT (SELECT COALESCE(SUM(value), 0) FROM row_counts WHERE name = 'patients'),
+           (SELECT COUNT(*) FROM doctors),
+           (SELECT COALESCE(SUM(value), 0) FROM row_counts WHERE name = 'appointments'),
+           (SELECT COUNT(*) FROM appointments WHERE status = 'Scheduled'),
+           (SELECT COUNT(*) FROM staff),
+           (SELECT COALESCE(SUM(amount), 0) FROM billing_totals WHERE payment_status = 'Paid'),
+           (SELECT COALESCE(SUM(bills), 0) FROM billing_totals WHERE payment_status = 'Pending'),
+           (SELECT COUNT(*) FROM beds WHERE status = 'Available'),
+           (SELECT COUNT(*) FROM beds WHERE status = 'Occupied'),
+           (SELECT COALESCE(SUM(value), 0) FROM row_counts WHERE name = 'open_lab_tests'),
+           (SELECT COUNT(*) FROM ambulance WHERE status = 'Available')
+"""
+
+STATS_KEYS = ('patients', 'doctors', 'appointments', 'pending', 'staff', 'revenue',
+              'pending_bills', 'available_beds', 'occupied_beds', 'pending_tests',
+              'ambulance_available')
+
+def get_stats(conn):
+    row = conn.execute(STATS_SQL).fetchone()
+    return dict(zip(STATS_KEYS, row))
+
+# Dashboard charts and tables; the bed and lab tables show the first DASHBOARD_ROWS
+DASHBOARD_ROWS = 20
+
+DEPT_APPOINTMENTS_SQL = """
+    SELECT d.dept_name, COALESCE(SUM(s.appointments), 0) as count
+    FROM departments d
+    LEFT JOIN dept_daily_stats s ON s.dept_id = d.dept_id
+    GROUP BY d.dept_name
+"""
+
+# ten-year age bands, counted along idx_patients_age
+PATIENT_AGES_SQL = """
+    SELECT (age / 10) * 10 || '-' || ((age / 10) * 10 + 9) as age_group, COUNT(*) as patients
+    FROM patients
+    WHERE age IS NOT NULL
+    GROUP BY age / 10
+    ORDER BY age / 10
+"""
+
+BED_STATUS_SQL = """
+    SELECT b.bed_number, b.ward_type, b.status, p.name as patient_name
+    FROM beds b
+    LEFT JOIN patients p ON b.patient_id = p.patient_id
+    ORDER BY b.bed_number LIMIT ?
+"""
+
+LAB_STATUS_SQL = """
+    SELECT p.name as Patient, l.test_name as Test, l.status as Status, l.test_date as Date
+    FROM lab_tests l
+    JOIN patients p ON l.patient_id = p.patient_id
+    ORDER BY l.test_date DESC LIMIT ?
+"""
+
+AMBULANCE_FLEET_SQL = """
+    SELECT a.vehicle_number as Vehicle, a.driver_name as Driver,
+           a.status as Status, p.name as Patient
+    FROM ambulance a
+    LEFT JOIN patients p ON a.patient_id = p.patient_id
+"""
+
+BLOOD_STOCK_SQL = """
+    SELECT blood_group as 'Blood Group', SUM(units) as 'Total Units'
+    FROM blood_bank
+    GROUP BY blood_group
+    ORDER BY blood_group
+"""
+
+RECENT_APPOINTMENTS_SQL = """
+    SELECT p.name as Patient, d.name as Doctor, a.appointment_date as Date,
+           a.appointment_time as Time, a.status as Status, a.reason as Reason
+    FROM appointments a
+    JOIN patients p ON a.patient_id = p.patient_id
+    JOIN doctors d ON a.doctor_id = d.doctor_id
+    ORDER BY a.appointment_date DESC LIMIT 10
+"""
+
+DASHBOARD_QUERIES = (
+    STATS_SQL, DEPT_APPOINTMENTS_SQL, PATIENT_AGES_SQL, BED_STATUS_SQL,
+    LAB_STATUS_SQL, AMBULANCE_FLEET_SQL, BLOOD_STOCK_SQL, RECENT_APPOINTMENTS_SQL,
+)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create or upgrade the hospital database.")
+    parser.add_argument('--db', default=DB_NAME)
+    parser.add_argument('--seed', action='store_true', help="add the sample hospital if the database is empty")
+    args = parser.parse_args(argv)
+
+    init_db(args.db, sample_data=False)
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.seed:
+            print("sample data added" if seed(conn) else "database already has data; nothing seeded")
+        print(f"{args.db}: schema version {get_version(conn)}")
+    finally:
+        conn.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# Pharmacy dispensing: prescriptions issued from inventory stock
+#
+# A prescription is one or more lines (medicine, dosage, quantity) for a
+# patient from a doctor. Each line names an inventory item, found by id or,
+# for typed names, by idx_inventory_medicine (case-insensitive names of the
+# Medicine category). dispense() writes the pharmacy rows and takes the stock
+# through the ledger (see stock.py) in one BEGIN IMMEDIATE transaction: if
+# any line is short, nothing is issued. Lines are priced at the item's
+# unit_price. The pharmacy_daily rollup (see rollups.py) keeps revenue
+# current, so nothing here or on the page sums the pharmacy table.
+#
+# dispense_many() works through a queue of prescriptions in one transaction,
+# with a savepoint per prescription: a short or invalid one is reported and
+# skipped, the others are committed together.
+import json
+from datetime import datetime
+
+from stock import move_many
+
+SCHEMA = [
+    "ALTER TABLE pharmacy ADD COLUMN item_id INTEGER REFERENCES inventory(item_id)",
+    "CREATE INDEX IF NOT EXISTS idx_inventory_medicine ON inventory(item_name COLLATE NOCASE) WHERE category = 'Medicine'",
+]
+
+# primary-key reads of every item on a prescription
+ITEMS_SQL = """
+    SELECT i.item_id, i.item_name, i.unit_price
+    FROM json_each(?) j JOIN inventory i ON i.item_id = j.value
+"""
+
+RESOLVE_SQL = """
+    SELECT item_id FROM inventory
+    WHERE category = 'Medicine' AND item_name = ? COLLATE NOCASE
+    ORDER BY item_id LIMIT 1
+"""
+
+INSERT_SQL = """
+    INSERT INTO pharmacy (patient_id, doctor_id, item_id, medicine_name, dosage, quantity, price, issue_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    RETURNING prescription_id
+"""
+
+def resolve(conn, names):
+    """{name: item_id} for medicine names typed by hand; ValueError lists those not in inventory."""
+    found, missing = {}, []
+    for name in dict.fromkeys(names):
+        row = conn.execute(RESOLVE_SQL, (name.strip(),)).fetchone()
+        if row is None:
+            missing.append(name)
+        else:
+            found[name] = row[0]
+    if missing:
+        raise ValueError(f"not a medicine in inventory: {', '.join(missing)}")
+    return found
+
+def _dispense(conn, patient_id, doctor_id, lines, day):
+    if not lines:
+        raise ValueError("a prescription needs at least one medicine")
+    if not conn.execute("SELECT 1 FROM patients WHERE patient_id = ?", (patient_id,)).fetchone():
+        raise ValueError(f"no patient #{patient_id}")
+    if not conn.execute("SELECT 1 FROM doctors WHERE doctor_id = ?", (doctor_id,)).fetchone():
+        raise ValueError(f"no doctor #{doctor_id}")
+    items = {item_id: (name, price) for item_id, name, price in
+             conn.execute(ITEMS_SQL, (json.dumps([item_id for item_id, _, _ in lines]),))}
+    unknown = [str(item_id) for item_id, _, _ in lines if item_id not in items]
+    if unknown:
+        raise ValueError(f"no inventory item #{', #'.join(unknown)}")
+    issued, movements = [], []
+    for item_id, dosage, quantity in lines:
+        if quantity <= 0:
+            raise ValueError(f"{items[item_id][0]}: quantity must be positive")
+        name, unit_price = items[item_id]
+        price = quantity * (unit_price or 0)
+        prescription_id = conn.execute(INSERT_SQL, (patient_id, doctor_id, item_id, name, dosage, quantity,
+                                                    price, day)).fetchone()[0]
+        issued.append((prescription_id, name, quantity, price))
+        movements.append((item_id, -quantity, f"prescription #{prescription_id}"))
+    move_many(conn, movements, 'dispense', in_transaction=True)
+    return issued
+
+def dispense(conn, patient_id, doctor_id, lines):
+    """Issue [(item_id, dosage, quantity)] to patient_id; return [(prescription_id, medicine, quantity, price)].
+
+    Raises ValueError, with nothing written, for a stock shortfall or an
+    unknown patient, doctor or item.
+    """
+    day = datetime.now().strftime('%Y-%m-%d')
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        issued = _dispense(conn, patient_id, doctor_id, lines, day)
+        conn.commit()
+        return issued
+    except Exception:
+        conn.rollback()
+        raise
+
+def dispense_many(conn, prescriptions):
+    """Issue each (patient_id, doctor_id, lines) in one transaction, in order.
+
+    Returns [(issued or None, reason or None)] per prescription; those that
+    cannot be issued are rolled back to their savepoint and skipped.
+    """
+    day = datetime.now().strftime('%Y-%m-%d')
+    results = []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for patient_id, doctor_id, lines in prescriptions:
+            conn.execute("SAVEPOINT prescription")
+            try:
+                results.append((_dispense(conn, patient_id, doctor_id, lines, day), None))
+            except ValueError as e:
+                conn.execute("ROLLBACK TO prescription")
+                results.append((None, str(e)))
+            conn.execute("RELEASE prescription")
+        conn.commit()
+        return results
+    except Exception:
+        conn.rollback()
+        raise
@@ -0,0 +1,231 @@
+# Streaming export of a table to CSV, Parquet or Excel
+#
+#   python exporter.py billing billing-2024-03.csv --status Paid --from 2024-03-01 --to 2024-03-31
+#
+# Rows come off one cursor with fetchmany and each batch is written before the
+# next is read: a CSV chunk, a Parquet row group or a run of Excel rows. Memory
+# stays at one batch whatever the size of the table.
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+
+BATCH_SIZE = 100000
+EXCEL_MAX_ROWS = 1048575  # per sheet, after the header row
+
+# table -> (date column, status column, status values); None where the table has no such filter
+EXPORTS = {
+    'billing': ('payment_date', 'payment_status', ('Paid', 'Pending')),
+    'pharmacy': ('issue_date', None, ()),
+    'lab_tests': ('test_date', 'status', ('Scheduled', 'In Progress', 'Completed')),
+    'appointments': ('appointment_date', 'status', ('Scheduled', 'Completed', 'Cancelled')),
+    'patients': ('registration_date', None, ()),
+    'medical_records': ('record_date', None, ()),
+    'inventory': ('last_updated', None, ()),
+    'staff': ('join_date', None, ()),
+    'doctors': (None, None, ()),
+    'departments': (None, None, ()),
+    'beds': ('admission_date', 'status', ('Available', 'Occupied')),
+    'ambulance': ('request_time', 'status', ('Available', 'On Duty')),
+    'blood_bank': ('donation_date', None, ()),
+}
+
+FORMATS = {'csv': 'text/csv', 'parquet': 'application/octet-stream',
+           'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'}
+
+def detect_format(name):
+    ext = os.path.splitext(name)[1].lower().lstrip('.')
+    return {'pq': 'parquet', 'xls': 'xlsx'}.get(ext, ext if ext in FORMATS else 'csv')
+
+def export_query(table, status=None, start=None, end=None):
+    """SELECT for table with the optional status and inclusive date-range filters."""
+    if table not in EXPORTS:
+        raise ValueError(f"unknown export table {table!r}; expected one of {', '.join(EXPORTS)}")
+    date_col, status_col, _ = EXPORTS[table]
+    if status and not status_col:
+        raise ValueError(f"{table} has no status to filter on")
+    if (start or end) and not date_col:
+        raise ValueError(f"{table} has no date to filter on")
+    clauses, params = [], []
+    if status:
+        clauses.append(f"{status_col} = ?")
+        params.append(status)
+    if start:
+        clauses.append(f"{date_col} >= ?")
+        params.append(str(start))
+    if end:
+        # DATETIME columns hold times on the last day too
+        clauses.append(f"{date_col} < date(?, '+1 day')")
+        params.append(str(end))
+    # no ORDER BY: rows stream in index or rowid order instead of going through a sort
+    sql = f"SELECT * FROM {table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    return sql, params
+
+def fetch_batches(conn, sql, params, batch_size=BATCH_SIZE):
+    """Return (column names, iterator of row batches) for one cursor."""
+    cursor = conn.execute(sql, params)
+    names = [d[0] for d in cursor.description]
+
+    def batches():
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    return names, batches()
+
+def csv_chunks(names, batches):
+    """Yield UTF-8 encoded CSV, one chunk per batch; usable as an HTTP response body."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def write_csv(names, batches, out):
+    for chunk in csv_chunks(names, batches):
+        out.write(chunk)
+
+def _arrow_schema(conn, table, names):
+    import pyarrow as pa
+
+    declared = {row[1]: (row[2] or '').upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+    fields = []
+    for name in names:
+        kind = declared.get(name, '')
+        fields.append(pa.field(name, pa.int64() if 'INT' in kind else pa.float64() if kind == 'REAL' else pa.string()))
+    return pa.schema(fields)
+
+def write_parquet(names, batches, out, schema):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)")
+    with pq.ParquetWriter(out, schema) as writer:
+        for rows in batches:
+            columns = list(zip(*rows))
+            arrays = [pa.array([None if v is None else str(v) for v in column], field.type)
+                      if pa.types.is_string(field.type) else pa.array(column, field.type)
+                      for column, field in zip(columns, schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+def write_excel(names, batches, out, table):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImportError("Excel export needs openpyxl (pip install openpyxl)")
+    # write-only mode spools rows to a temp file instead of keeping cells in memory
+    workbook = Workbook(write_only=True)
+    sheet, sheet_rows, sheets = None, EXCEL_MAX_ROWS, 0
+    for rows in batches:
+        for row in rows:
+            if sheet_rows == EXCEL_MAX_ROWS:
+                sheets += 1
+                sheet = workbook.create_sheet(table if sheets == 1 else f"{table}_{sheets}")
+                sheet.append(names)
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+    if sheet is None:
+        workbook.create_sheet(table).append(names)
+    workbook.save(out)
+
+def export_table(conn, table, out, fmt='csv', status=None, start=None, end=None,
+                 batch_size=BATCH_SIZE, on_batch=None):
+    """Write the filtered rows of table to out (a path or binary file object); return the row count.
+
+    on_batch is called with the running row count after each batch is written.
+    """
+    sql, params = export_query(table, status, start, end)
+    names, batches = fetch_batches(conn, sql, params, batch_size)
+    written = [0]
+
+    def counted():
+        for rows in batches:
+            yield rows
+            written[0] += len(rows)
+            if on_batch:
+                on_batch(written[0])
+
+    if fmt == 'parquet':
+        schema = _arrow_schema(conn, table, names)
+        write_parquet(names, counted(), out, schema)
+    elif fmt == 'xlsx':
+        write_excel(names, counted(), out, table)
+    elif isinstance(out, (str, os.PathLike)):
+        with open(out, 'wb') as f:
+            write_csv(names, counted(), f)
+    else:
+        write_csv(names, counted(), out)
+    return written[0]
+
+def export_panel(table, status=None):
+    """Export expander body: filter, write to a temp file on the server, then offer it for download."""
+    import streamlit as st
+    from pool import get_conn
+
+    date_col, status_col, statuses = EXPORTS[table]
+    col1, col2, col3 = st.columns(3)
+    if status_col:
+        options = ["All", *statuses]
+        status = col1.selectbox("Status", options, index=options.index(status) if status in options else 0,
+                                key=f"export_{table}_status")
+    dates = col2.date_input("Date range", (), key=f"export_{table}_dates") if date_col else ()
+    fmt = col3.radio("Format", list(FORMATS), horizontal=True, key=f"export_{table}_format")
+    if st.button("📤 Export", key=f"export_{table}_go"):
+        start, end = (dates[0], dates[-1]) if dates else (None, None)
+        progress = st.empty()
+        handle, path = tempfile.mkstemp(prefix=f"{table}-", suffix=f".{fmt}")
+        os.close(handle)
+        try:
+            count = export_table(get_conn(), table, path, fmt, None if status == "All" else status, start, end,
+                                 on_batch=lambda n: progress.info(f"{n:,} rows written"))
+            progress.success(f"✅ {count:,} rows exported")
+            with open(path, 'rb') as f:
+                st.download_button(f"⬇️ Download {table}.{fmt}", f, file_name=f"{table}.{fmt}",
+                                   mime=FORMATS[fmt], key=f"export_{table}_download")
+        except ImportError as e:
+            st.error(str(e))
+        finally:
+            os.remove(path)
+
+def main(argv=None):
+    import sqlite3
+    from db import DB_NAME
+
+    parser = argparse.ArgumentParser(description="Export a table to CSV, Parquet or Excel in constant memory.")
+    parser.add_argument('table', choices=sorted(EXPORTS))
+    parser.add_argument('path', help="output file; the extension picks the format unless --format is given")
+    parser.add_argument('--db', default=DB_NAME)
+    parser.add_argument('--format', choices=sorted(FORMATS))
+    parser.add_argument('--status')
+    parser.add_argument('--from', dest='start', help="first date, YYYY-MM-DD")
+    parser.add_argument('--to', dest='end', help="last date, YYYY-MM-DD")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        count = export_table(conn, args.table, args.path, args.format or detect_format(args.path),
+                             args.status, args.start, args.end, args.batch_size,
+                             on_batch=lambda n: print(f"{n:>12,} rows", flush=True))
+    except (ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    print(f"{args.table}: {count:,} rows written to {args.path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
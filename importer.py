@@ -0,0 +1,402 @@
+# Bulk CSV/Parquet import into patients, appointments and inventory
+#
+#   python importer.py patients patients.csv [--db hospital.db] [--batch-size 50000]
+#                      [--defer-indexes] [--restart]
+#
+# Rows are read as a stream, validated and mapped onto the init_db() columns,
+# and inserted with executemany one batch per transaction. The batch and its
+# progress row in import_jobs (migration 5) commit together, so running the same
+# file again after a failure resumes after the last committed batch.
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from datetime import date, datetime
+
+import rollups
+import stock
+from changes import RELOAD_SQL
+
+BATCH_SIZE = 50000
+MAX_REJECT_SAMPLES = 20
+
+# 24-hour '14:30' / '14:30:00', or 12-hour '02:30 PM' as exported from the booking form
+TIME = re.compile(r'(\d{1,2}):(\d{2})(?::(\d{2}))?(?:\s*([AaPp][Mm]))?')
+
+def _text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+def _number(value):
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"not a number: {value!r}")
+
+def _int(value):
+    value = _text(value)
+    if value is None:
+        return None
+    number = _number(value)
+    if not number.is_integer():
+        raise ValueError(f"not a whole number: {value!r}")
+    return int(number)
+
+def _real(value):
+    value = _text(value)
+    return None if value is None else _number(value)
+
+def _date(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    value = _text(value)
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value[:10]).isoformat()
+    except ValueError:
+        raise ValueError(f"not a YYYY-MM-DD date: {value!r}")
+
+def _time(value):
+    """HH:MM[:SS] or the booking form's '02:30 PM', stored the way the form writes it."""
+    value = _text(value)
+    if value is None:
+        return None
+    match = TIME.fullmatch(value)
+    if not match:
+        raise ValueError(f"not an HH:MM or hh:MM AM/PM time: {value!r}")
+    hour, minute, second, meridiem = match.groups()
+    hour = int(hour)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ValueError(f"not an hh:MM AM/PM time: {value!r}")
+        hour = hour % 12 + (12 if meridiem.upper() == 'PM' else 0)
+    if hour > 23 or int(minute) > 59 or int(second or 0) > 59:
+        raise ValueError(f"not a time of day: {value!r}")
+    return f"{hour % 12 or 12:02d}:{minute} {'AM' if hour < 12 else 'PM'}"
+
+def _choice(*allowed):
+    by_lower = {a.lower(): a for a in allowed}
+
+    def convert(value):
+        value = _text(value)
+        if value is None:
+            return None
+        if value.lower() not in by_lower:
+            raise ValueError(f"expected one of {', '.join(allowed)}, got {value!r}")
+        return by_lower[value.lower()]
+    return convert
+
+def _today():
+    return date.today().isoformat()
+
+# target table -> (column, converter, required, default) in INSERT order, plus
+# header aliases, foreign keys checked per batch and what to rebuild after a
+# deferred load
+TARGETS = {
+    'patients': {
+        'columns': [
+            ('name', _text, True, None),
+            ('age', _int, False, None),
+            ('gender', _text, False, None),
+            ('phone', _text, False, None),
+            ('email', _text, False, None),
+            ('address', _text, False, None),
+            ('blood_group', _text, False, None),
+            ('registration_date', _date, False, _today),
+        ],
+        'aliases': {'patient_name': 'name', 'full_name': 'name', 'mobile': 'phone', 'phone_number': 'phone',
+                    'email_address': 'email', 'blood': 'blood_group', 'registered': 'registration_date'},
+        'references': {},
+        'rebuild': ["INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')"] + rollups.COUNTS_REBUILD_SQL,
+    },
+    'appointments': {
+        'columns': [
+            ('patient_id', _int, True, None),
+            ('doctor_id', _int, True, None),
+            ('appointment_date', _date, True, None),
+            ('appointment_time', _time, False, None),
+            ('status', _choice('Scheduled', 'Completed', 'Cancelled'), False, lambda: 'Scheduled'),
+            ('reason', _text, False, None),
+        ],
+        'aliases': {'patient': 'patient_id', 'doctor': 'doctor_id', 'date': 'appointment_date',
+                    'time': 'appointment_time'},
+        'references': {'patient_id': ('patients', 'patient_id'), 'doctor_id': ('doctors', 'doctor_id')},
+        'rebuild': rollups.REBUILD_SQL + rollups.COUNTS_REBUILD_SQL,
+    },
+    'inventory': {
+        'columns': [
+            ('item_name', _text, True, None),
+            ('category', _text, False, None),
+            ('quantity', _int, False, lambda: 0),
+            ('unit_price', _real, False, None),
+            ('supplier', _text, False, None),
+            ('last_updated', _date, False, _today),
+        ],
+        'aliases': {'name': 'item_name', 'item': 'item_name', 'qty': 'quantity', 'price': 'unit_price'},
+        'references': {},
+        'rebuild': [stock.OPENING_SQL],
+    },
+}
+
+def detect_format(name):
+    return 'parquet' if name.lower().endswith(('.parquet', '.pq')) else 'csv'
+
+def open_rows(source, fmt, skip=0):
+    """Return (header, iterator of row tuples) for a path or binary file object."""
+    if fmt == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet import needs pyarrow (pip install pyarrow)")
+        parquet = pq.ParquetFile(source)
+
+        def rows():
+            remaining = skip
+            for batch in parquet.iter_batches(batch_size=BATCH_SIZE):
+                if remaining >= batch.num_rows:
+                    remaining -= batch.num_rows
+                    continue
+                batch, remaining = batch.slice(remaining), 0
+                yield from zip(*(column.to_pylist() for column in batch.columns))
+        return parquet.schema_arrow.names, rows()
+
+    if isinstance(source, (str, os.PathLike)):
+        text = open(source, newline='', encoding='utf-8-sig')
+    else:
+        text = io.TextIOWrapper(source, newline='', encoding='utf-8-sig')
+    reader = csv.reader(text)
+    header = next(reader, [])
+    return header, itertools.islice(reader, skip, None)
+
+def column_plan(target, header):
+    """Map each target column to its index in header; raise if a required one is missing."""
+    spec = TARGETS[target]
+    positions = {}
+    for index, name in enumerate(header):
+        key = str(name).strip().lower().replace(' ', '_').replace('-', '_')
+        positions.setdefault(spec['aliases'].get(key, key), index)
+    missing = [column for column, _, required, _ in spec['columns'] if required and column not in positions]
+    if missing:
+        raise ValueError(f"{target}: missing required column(s) {', '.join(missing)}; file has {', '.join(map(str, header))}")
+    return [(column, convert, required, default, positions.get(column))
+            for column, convert, required, default in spec['columns']]
+
+def validate(conn, target, plan, chunk, first_row):
+    """Split chunk into insertable tuples and (row number, reason) rejects."""
+    valid, numbers, rejects = [], [], []
+    for number, raw in enumerate(chunk, first_row):
+        try:
+            values = []
+            for column, convert, required, default, index in plan:
+                try:
+                    value = convert(raw[index]) if index is not None and index < len(raw) else None
+                except ValueError as e:
+                    raise ValueError(f"{column}: {e}")
+                if value is None and default is not None:
+                    value = default()
+                if value is None and required:
+                    raise ValueError(f"{column} is required")
+                values.append(value)
+            valid.append(tuple(values))
+            numbers.append(number)
+        except ValueError as e:
+            rejects.append((number, str(e)))
+
+    columns = [column for column, *_ in plan]
+    for column, (table, key) in TARGETS[target]['references'].items():
+        position = columns.index(column)
+        wanted = sorted({row[position] for row in valid})
+        found = {row[0] for row in conn.execute(
+            f"SELECT j.value FROM json_each(?) j WHERE EXISTS (SELECT 1 FROM {table} WHERE {key} = j.value)",
+            (json.dumps(wanted),))}
+        if len(found) < len(wanted):
+            kept = [(n, row) for n, row in zip(numbers, valid) if row[position] in found]
+            rejects += [(n, f"{column}: no {table} row with {key} {row[position]}")
+                        for n, row in zip(numbers, valid) if row[position] not in found]
+            numbers, valid = [n for n, _ in kept], [row for _, row in kept]
+    return valid, sorted(rejects)
+
+def defer_objects(conn, target):
+    """Drop the target's indexes and triggers; return the SQL that recreates them."""
+    objects = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (target,)).fetchall()
+    for kind, name, _ in objects:
+        conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+    return [sql for _, _, sql in objects]
+
+def _restore_objects(conn, target, deferred):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for sql in deferred:
+            conn.execute(sql)
+        for sql in TARGETS[target]['rebuild']:
+            conn.execute(sql)
+        # the load bypassed the change-log triggers; tell consumers to resync the table
+        conn.execute(RELOAD_SQL, (target,))
+        conn.execute(f"ANALYZE {target}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def import_rows(conn, target, source, name=None, size=None, fmt=None, batch_size=BATCH_SIZE,
+                defer_indexes=False, restart=False, on_batch=None):
+    """Load source (a path or binary file object) into target; return a summary dict.
+
+    name and size identify the job for resuming; they default to the path and
+    its size. With defer_indexes the target's indexes and triggers are dropped
+    for the load and recreated (with FTS/rollups rebuilt) once it finishes.
+    on_batch is called with the running summary after each committed batch.
+    """
+    if target not in TARGETS:
+        raise ValueError(f"unknown import target {target!r}; expected one of {', '.join(TARGETS)}")
+    if name is None:
+        name = os.path.abspath(source)
+        size = os.path.getsize(source)
+    fmt = fmt or detect_format(name)
+    job_key = f"{target}:{name}:{size}"
+
+    job = conn.execute("SELECT rows_done, rows_loaded, rows_rejected, deferred_sql, status FROM import_jobs WHERE job_key = ?",
+                       (job_key,)).fetchone()
+    if job and job[4] == 'done' and not restart:
+        raise ValueError(f"{name} was already imported into {target}; restart the import to load it again")
+    if job is None or restart:
+        job = (0, 0, 0, job[3] if job else None, 'running')
+        conn.execute("""INSERT INTO import_jobs (job_key, target, source, rows_done, rows_loaded, rows_rejected,
+                                                 deferred_sql, status, started_at)
+                        VALUES (?, ?, ?, 0, 0, 0, ?, 'running', datetime('now'))
+                        ON CONFLICT (job_key) DO UPDATE SET rows_done = 0, rows_loaded = 0, rows_rejected = 0,
+                            status = 'running', started_at = datetime('now'), finished_at = NULL""",
+                     (job_key, target, name, job[3]))
+        conn.commit()
+    rows_done, loaded, rejected, deferred_sql, _ = job
+
+    header, rows = open_rows(source, fmt, skip=rows_done)
+    plan = column_plan(target, header)
+    if defer_indexes and deferred_sql is None:
+        conn.execute("BEGIN IMMEDIATE")
+        deferred_sql = json.dumps(defer_objects(conn, target))
+        conn.execute("UPDATE import_jobs SET deferred_sql = ? WHERE job_key = ?", (deferred_sql, job_key))
+        conn.commit()
+
+    columns = [column for column, *_ in plan]
+    insert = f"INSERT INTO {target} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    summary = {'target': target, 'source': name, 'resumed_from': rows_done, 'rows_read': rows_done,
+               'loaded': loaded, 'rejected': rejected, 'samples': [], 'seconds': 0.0, 'rows_per_sec': 0.0}
+    started = time.perf_counter()
+    loaded_now = 0
+    while True:
+        chunk = list(itertools.islice(rows, batch_size))
+        if not chunk:
+            break
+        # data rows are numbered from 1, after the header line
+        valid, rejects = validate(conn, target, plan, chunk, rows_done + 1)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(insert, valid)
+            rows_done += len(chunk)
+            loaded += len(valid)
+            rejected += len(rejects)
+            conn.execute("UPDATE import_jobs SET rows_done = ?, rows_loaded = ?, rows_rejected = ? WHERE job_key = ?",
+                         (rows_done, loaded, rejected, job_key))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        loaded_now += len(valid)
+        summary['samples'] += rejects[:MAX_REJECT_SAMPLES - len(summary['samples'])]
+        summary['seconds'] = time.perf_counter() - started
+        summary.update(rows_read=rows_done, loaded=loaded, rejected=rejected,
+                       rows_per_sec=loaded_now / summary['seconds'] if summary['seconds'] else 0.0)
+        if on_batch:
+            on_batch(summary)
+
+    if deferred_sql is not None:
+        _restore_objects(conn, target, json.loads(deferred_sql))
+    conn.execute("UPDATE import_jobs SET status = 'done', deferred_sql = NULL, finished_at = datetime('now') WHERE job_key = ?",
+                 (job_key,))
+    conn.commit()
+    summary['seconds'] = time.perf_counter() - started
+    return summary
+
+def import_panel(target):
+    """Upload tab body: import a CSV/Parquet file into target from the browser."""
+    import streamlit as st
+    from cache import bump
+    from pool import get_conn
+
+    names = ', '.join(column for column, *_ in TARGETS[target]['columns'])
+    st.caption(f"CSV or Parquet with a header row. Columns: {names}. Dates as YYYY-MM-DD, times as HH:MM or 02:30 PM.")
+    upload = st.file_uploader("File", type=['csv', 'parquet', 'pq'], key=f"import_{target}")
+    col1, col2 = st.columns(2)
+    defer = col1.checkbox("Defer indexes until the load finishes (large files)", key=f"import_{target}_defer")
+    restart = col2.checkbox("Load again if this file was already imported", key=f"import_{target}_restart")
+    if upload is not None and st.button("📥 Import", key=f"import_{target}_go"):
+        status = st.empty()
+
+        def report(summary):
+            status.info(f"{summary['rows_read']:,} rows read · {summary['loaded']:,} loaded · "
+                        f"{summary['rejected']:,} rejected · {summary['rows_per_sec']:,.0f} rows/s")
+        try:
+            summary = import_rows(get_conn(), target, upload, name=f"upload:{upload.name}", size=upload.size,
+                                  fmt=detect_format(upload.name), defer_indexes=defer, restart=restart,
+                                  on_batch=report)
+        except (ValueError, ImportError) as e:
+            st.error(str(e))
+        else:
+            report(summary)
+            st.success(f"✅ Imported {summary['loaded']:,} rows into {target} in {summary['seconds']:.1f}s")
+            if summary['samples']:
+                st.warning(f"{summary['rejected']:,} rows rejected. First few:")
+                st.dataframe([{'Row': n, 'Reason': reason} for n, reason in summary['samples']],
+                             use_container_width=True)
+        finally:
+            bump(target)
+
+def main(argv=None):
+    from db import DB_NAME, bootstrap
+    from pool import ConnectionPool
+
+    parser = argparse.ArgumentParser(description="Bulk-load a CSV or Parquet file into the hospital database.")
+    parser.add_argument('target', choices=sorted(TARGETS))
+    parser.add_argument('path')
+    parser.add_argument('--db', default=DB_NAME)
+    parser.add_argument('--format', choices=('csv', 'parquet'))
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--defer-indexes', action='store_true',
+                        help="drop the target's indexes and triggers during the load and rebuild them at the end")
+    parser.add_argument('--restart', action='store_true', help="load the file again even if a previous run finished")
+    args = parser.parse_args(argv)
+
+    bootstrap(args.db)
+    conn = ConnectionPool(args.db).get()
+
+    def report(summary):
+        print(f"{summary['rows_read']:>12,} read {summary['loaded']:>12,} loaded {summary['rejected']:>8,} rejected "
+              f"{summary['rows_per_sec']:>10,.0f} rows/s", flush=True)
+
+    try:
+        summary = import_rows(conn, args.target, args.path, fmt=args.format, batch_size=args.batch_size,
+                              defer_indexes=args.defer_indexes, restart=args.restart, on_batch=report)
+    except (ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if summary['resumed_from']:
+        print(f"resumed after row {summary['resumed_from']:,}")
+    print(f"{args.target}: {summary['loaded']:,} loaded, {summary['rejected']:,} rejected "
+          f"in {summary['seconds']:.1f}s ({summary['rows_per_sec']:,.0f} rows/s)")
+    for number, reason in summary['samples']:
+        print(f"  row {number}: {reason}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# Batch billing run: one Pending invoice for every completed, unbilled appointment
+#
+# An invoice is the doctor's consultation fee plus the charges that came out
+# of the visit: the lab tests of the patient on the appointment date and the
+# prescriptions that doctor issued them that day. When a patient has several
+# completed appointments on one day, the lab tests go on the first one's
+# invoice and each doctor's prescriptions on the first one with that doctor,
+# so nothing is charged twice.
+#
+# "Unbilled" is an anti-join on billing.appointment_id, so the run is
+# idempotent: running it again, or after an interruption, bills only what is
+# still missing. Appointments are walked in appointment_id ranges, one
+# INSERT ... SELECT and one transaction per range.
+#
+#   python invoicing.py [--db hospital.db] [--batch-size 50000]
+import argparse
+import sys
+import time
+
+BATCH_SIZE = 50000  # appointment ids per transaction
+
+def _first_of_day(same_doctor):
+    doctor = " AND f.doctor_id = a.doctor_id" if same_doctor else ""
+    return f"""a.appointment_id = (SELECT MIN(f.appointment_id) FROM appointments f
+               WHERE f.patient_id = a.patient_id AND f.appointment_date = a.appointment_date
+                 AND f.status = 'Completed'{doctor})"""
+
+INVOICE_SQL = f"""
+    INSERT INTO billing (patient_id, appointment_id, amount, payment_status, payment_date)
+    SELECT a.patient_id, a.appointment_id,
+           COALESCE(d.consultation_fee, 0)
+           + CASE WHEN {_first_of_day(False)} THEN
+                 (SELECT TOTAL(l.cost) FROM lab_tests l
+                  WHERE l.patient_id = a.patient_id AND l.test_date = a.appointment_date)
+             ELSE 0 END
+           + CASE WHEN {_first_of_day(True)} THEN
+                 (SELECT TOTAL(ph.price) FROM pharmacy ph
+                  WHERE ph.patient_id = a.patient_id AND ph.issue_date = a.appointment_date
+                    AND ph.doctor_id = a.doctor_id)
+             ELSE 0 END,
+           'Pending', NULL
+    FROM appointments a
+    LEFT JOIN doctors d ON d.doctor_id = a.doctor_id
+    WHERE a.appointment_id > ? AND a.appointment_id <= ? AND a.status = 'Completed'
+      AND NOT EXISTS (SELECT 1 FROM billing b WHERE b.appointment_id = a.appointment_id)
+    RETURNING amount
+"""
+
+def run_billing(conn, batch_size=BATCH_SIZE, on_batch=None):
+    """Invoice every completed, unbilled appointment; return a summary dict.
+
+    on_batch is called with the running summary after each committed range.
+    """
+    started = time.monotonic()
+    last = conn.execute("SELECT COALESCE(MAX(appointment_id), 0) FROM appointments").fetchone()[0]
+    summary = {'scanned_to': 0, 'last_id': last, 'invoices': 0, 'amount': 0.0, 'seconds': 0.0}
+    after = 0
+    while after < last:
+        upto = min(after + batch_size, last)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            amounts = [row[0] for row in conn.execute(INVOICE_SQL, (after, upto))]
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        summary['invoices'] += len(amounts)
+        summary['amount'] += sum(amounts)
+        summary['scanned_to'] = after = upto
+        summary['seconds'] = time.monotonic() - started
+        if on_batch:
+            on_batch(summary)
+    summary['seconds'] = time.monotonic() - started
+    return summary
+
+def billing_run_panel():
+    """Billing-page panel that runs the batch job and reports what it billed."""
+    import streamlit as st
+
+    from cache import bump
+    from pool import get_conn
+
+    st.caption("Creates a Pending invoice for every completed appointment that has none: "
+               "consultation fee plus that day's lab tests and prescriptions. Safe to run repeatedly.")
+    if st.button("⚙️ Run Billing", key="billing_run"):
+        progress = st.progress(0.0)
+
+        def report(summary):
+            progress.progress(summary['scanned_to'] / summary['last_id'],
+                              f"{summary['invoices']:,} invoices, Rs. {summary['amount']:,.0f}")
+        summary = run_billing(get_conn(), on_batch=report)
+        if summary['invoices']:
+            bump('billing')
+            st.success(f"✅ {summary['invoices']:,} invoices created, Rs. {summary['amount']:,.0f} "
+                       f"in {summary['seconds']:.1f}s")
+        else:
+            st.info("Every completed appointment is already billed")
+
+def main(argv=None):
+    from db import DB_NAME, bootstrap
+    from pool import ConnectionPool
+
+    parser = argparse.ArgumentParser(description="Invoice every completed appointment that has no bill yet.")
+    parser.add_argument('--db', default=DB_NAME)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="appointment ids per transaction")
+    args = parser.parse_args(argv)
+
+    bootstrap(args.db)
+    conn = ConnectionPool(args.db).get()
+
+    def report(summary):
+        print(f"{summary['scanned_to']:>12,} of {summary['last_id']:,} appointments "
+              f"{summary['invoices']:>12,} invoices {summary['seconds']:>8.1f}s", flush=True)
+
+    summary = run_billing(conn, args.batch_size, report)
+    print(f"billing: {summary['invoices']:,} invoices, Rs. {summary['amount']:,.2f} in {summary['seconds']:.1f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
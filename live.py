@@ -0,0 +1,172 @@
+# Live Monitoring engine: one background poller per process, any number of viewers
+#
+# The poller holds its own connection and reads PRAGMA data_version every
+# POLL_SECONDS. That value changes only when another connection commits, so
+# while nothing is written a poll is a single pragma and the metrics are not
+# re-queried. On a change (or after MAX_AGE_SECONDS, so that date('now')
+# metrics roll over at midnight) the metrics, hourly flow and department load
+# are recomputed once and published as a new snapshot. Viewers only read
+# the snapshot in memory, so each open monitor costs no queries at all.
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import charts
+from db import DB_NAME
+from rollups import DEPT_LOAD_TODAY_SQL
+
+POLL_SECONDS = 5
+MAX_AGE_SECONDS = 300
+IDLE_SECONDS = 120  # stop polling when no viewer has asked for this long
+
+LIVE_METRICS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM appointments WHERE appointment_date = date('now')),
+        (SELECT COUNT(*) FROM appointments WHERE appointment_date = date('now')
+                AND (reason LIKE '%emergency%' OR reason LIKE '%urgent%')),
+        (SELECT COUNT(*) FROM beds WHERE status = 'Occupied'),
+        (SELECT COUNT(*) FROM beds),
+        (SELECT COUNT(*) FROM lab_tests WHERE status != 'Completed'),
+        (SELECT COUNT(*) FROM lab_tests WHERE status = 'Completed' AND test_date = date('now')),
+        (SELECT TOTAL(amount) FROM billing WHERE payment_date = date('now') AND payment_status = 'Paid'),
+        (SELECT TOTAL(amount) FROM billing_totals WHERE payment_status = 'Pending'),
+        (SELECT COUNT(*) FROM ambulance WHERE status = 'Available'),
+        (SELECT group_concat(blood_group, ', ') FROM
+            (SELECT blood_group FROM blood_bank GROUP BY blood_group HAVING SUM(units) < 5))
+"""
+
+LIVE_METRIC_KEYS = ('today_appointments', 'emergency_cases', 'occupied_beds', 'total_beds', 'pending_tests',
+                    'completed_today', 'today_revenue', 'pending_amount', 'available_ambulances', 'low_blood')
+
+# appointment_time is free text ('10:30 AM' from the booking form), so it is
+# grouped as stored and folded into hours in Python
+HOURLY_FLOW_SQL = """
+    SELECT appointment_time, COUNT(*)
+    FROM appointments
+    WHERE appointment_date = date('now')
+    GROUP BY appointment_time
+"""
+
+def _hour(text):
+    for fmt in ('%I:%M %p', '%H:%M', '%H:%M:%S'):
+        try:
+            return datetime.strptime(text.strip(), fmt).hour
+        except (ValueError, AttributeError):
+            pass
+    return None
+
+def hourly_flow(rows):
+    """[(hour label, appointments)] for every hour from the first to the last booked one."""
+    counts = {}
+    for text, count in rows:
+        hour = _hour(text)
+        if hour is not None:
+            counts[hour] = counts.get(hour, 0) + count
+    if not counts:
+        return []
+    return [(f"{hour:02d}:00", counts.get(hour, 0)) for hour in range(min(counts), max(counts) + 1)]
+
+class Snapshot:
+    def __init__(self, version, metrics, hourly, dept_load, changed):
+        self.version = version
+        self.taken = datetime.now()
+        self.metrics = metrics
+        self.hourly = hourly
+        self.dept_load = dept_load
+        self.changed = changed  # metric keys that differ from the previous snapshot
+        self._figures = {}
+        self._lock = threading.Lock()
+
+    def figure(self, name):
+        """Plotly figure dict for 'hourly' or 'dept_load', built once per snapshot."""
+        with self._lock:
+            if name not in self._figures:
+                if name == 'hourly':
+                    rows, fig = self.hourly, charts.line_figure
+                    args = ('Hour', 'Patients', 'Patient Flow Today')
+                else:
+                    rows, fig = self.dept_load, charts.pie_figure
+                    args = ('dept_name', 'load', "Today's Department Workload")
+                self._figures[name] = json.loads(fig(rows, *args).to_json()) if rows else None
+            return self._figures[name]
+
+class LiveMonitor:
+    def __init__(self, db_name=DB_NAME, poll_seconds=POLL_SECONDS):
+        self.db_name = db_name
+        self.poll_seconds = poll_seconds
+        self.polls = 0
+        self.refreshes = 0
+        self._conn = None
+        self._data_version = None
+        self._computed = 0.0
+        self._last_read = 0.0
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_name, timeout=10, check_same_thread=False)
+        return self._conn
+
+    def refresh(self, force=False):
+        """Recompute the snapshot if the database changed; return True if a new one was published."""
+        with self._lock:
+            conn = self._connect()
+            self.polls += 1
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            stale = time.monotonic() - self._computed > MAX_AGE_SECONDS
+            if not force and self._snapshot is not None and data_version == self._data_version and not stale:
+                return False
+            # one read transaction, so the metrics and charts agree with each other
+            conn.execute("BEGIN")
+            try:
+                metrics = dict(zip(LIVE_METRIC_KEYS, conn.execute(LIVE_METRICS_SQL).fetchone()))
+                metrics['available_beds'] = metrics['total_beds'] - metrics['occupied_beds']
+                hourly = hourly_flow(conn.execute(HOURLY_FLOW_SQL).fetchall())
+                dept_load = conn.execute(DEPT_LOAD_TODAY_SQL).fetchall()
+            finally:
+                conn.rollback()
+            previous = self._snapshot
+            changed = {key for key in metrics if previous is None or previous.metrics[key] != metrics[key]}
+            if previous is not None and not changed and previous.hourly == hourly and previous.dept_load == dept_load:
+                self._data_version, self._computed = data_version, time.monotonic()
+                return False
+            self._snapshot = Snapshot((previous.version if previous else 0) + 1, metrics, hourly, dept_load, changed)
+            self._data_version, self._computed = data_version, time.monotonic()
+            self.refreshes += 1
+            return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            if time.monotonic() - self._last_read > IDLE_SECONDS:
+                continue
+            try:
+                self.refresh()
+            except sqlite3.Error:
+                pass  # busy or mid-migration; the next poll retries
+
+    def snapshot(self):
+        """Latest snapshot; starts the poller on first use and catches up after an idle spell."""
+        idle = time.monotonic() - self._last_read > IDLE_SECONDS
+        self._last_read = time.monotonic()
+        if self._snapshot is None or idle:
+            self.refresh()
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="live-monitor", daemon=True)
+                    self._thread.start()
+        return self._snapshot
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+def monitor(db_name=DB_NAME):
+    with _monitors_lock:
+        if db_name not in _monitors:
+            _monitors[db_name] = LiveMonitor(db_name)
+        return _monitors[db_name]
@@ -0,0 +1,86 @@
+# id -> label maps for selectboxes, cached until their tables are written
+import json
+
+import streamlit as st
+
+from cache import cached
+from pool import get_conn
+from search import search_patients
+
+PICKER_LIMIT = 50
+
+# name: SQL returning (id, label) rows
+LOOKUPS = {
+    'departments': "SELECT dept_id, dept_name FROM departments ORDER BY dept_id",
+    'doctors': "SELECT doctor_id, name FROM doctors ORDER BY name",
+    'inventory': "SELECT item_id, item_name || ' (Current: ' || quantity || ')' FROM inventory ORDER BY item_name",
+    'medicines': """SELECT item_id, item_name || ' (' || quantity || ' in stock, Rs. ' || unit_price || ')'
+                   FROM inventory WHERE category = 'Medicine' ORDER BY item_name COLLATE NOCASE""",
+    'available_ambulances': "SELECT ambulance_id, vehicle_number FROM ambulance WHERE status = 'Available'",
+    'pending_tests': """SELECT l.test_id, l.test_name || ' - ' || p.name
+                       FROM lab_tests l JOIN patients p ON l.patient_id = p.patient_id
+                       WHERE l.status != 'Completed'""",
+    'pending_bills': f"""SELECT b.bill_id, 'Bill #' || b.bill_id || ' - ' || p.name || ' - Rs. ' || b.amount
+                        FROM billing b JOIN patients p ON b.patient_id = p.patient_id
+                        WHERE b.payment_status = 'Pending'
+                        ORDER BY b.bill_id DESC LIMIT {PICKER_LIMIT}""",
+}
+
+# Pending bills whose bill_id or patient_id is in a JSON array, newest first
+PENDING_BILLS_SQL = """
+    SELECT b.bill_id, 'Bill #' || b.bill_id || ' - ' || p.name || ' - Rs. ' || b.amount
+    FROM billing b JOIN patients p ON b.patient_id = p.patient_id
+    WHERE b.payment_status = 'Pending' AND b.{column} IN (SELECT value FROM json_each(?))
+    ORDER BY b.bill_id DESC LIMIT ?
+"""
+
+def labels(name):
+    """Return the cached {id: label} dict for a LOOKUPS entry, rebuilt after writes to its tables."""
+    sql = LOOKUPS[name]
+    return cached(sql, lambda: dict(get_conn().execute(sql).fetchall()))
+
+def entity_picker(label, kind, key):
+    """Searchable patient or doctor selectbox that only loads PICKER_LIMIT options.
+
+    Widgets inside st.form do not rerun on input, so call this above the form.
+    """
+    query = st.text_input(f"🔍 Find {label.rstrip('*')}", key=f"{key}_search")
+    if kind == 'patients':
+        if query:
+            names, rows = search_patients(get_conn(), query, limit=PICKER_LIMIT)
+            options = {row[0]: f"{row[names.index('name')]} (#{row[0]})" for row in rows}
+        else:
+            rows = get_conn().execute("SELECT patient_id, name FROM patients ORDER BY patient_id DESC LIMIT ?",
+                                      (PICKER_LIMIT,))
+            options = {pid: f"{name} (#{pid})" for pid, name in rows}
+    else:
+        doctors = labels('doctors')
+        needle = query.lower()
+        options = {did: name for did, name in doctors.items() if needle in name.lower()}
+    return st.selectbox(label, list(options), format_func=options.get, key=key)
+
+def _pending_bills(column, ids, limit=PICKER_LIMIT):
+    if not ids:
+        return {}
+    sql = PENDING_BILLS_SQL.format(column=column)
+    return dict(get_conn().execute(sql, (json.dumps(ids), limit)).fetchall())
+
+def bill_picker(label, key):
+    """Searchable multiselect of Pending bills that only loads PICKER_LIMIT options.
+
+    Search by patient or by bill number; bills already picked stay selected
+    while the search changes, until they are no longer Pending.
+    """
+    query = st.text_input("🔍 Find bills by patient or bill #", key=f"{key}_search").strip()
+    if query.lstrip('#').isdigit():
+        options = _pending_bills('bill_id', [int(query.lstrip('#'))])
+    elif query:
+        _, rows = search_patients(get_conn(), query, limit=PICKER_LIMIT)
+        options = _pending_bills('patient_id', [row[0] for row in rows])
+    else:
+        options = labels('pending_bills')
+    picked = st.session_state.get(key, [])
+    picked = _pending_bills('bill_id', picked, len(picked))
+    st.session_state[key] = list(picked)
+    options = {**picked, **options}
+    return st.multiselect(label, list(options), format_func=options.get, key=key)
@@ -0,0 +1,151 @@
+# Versioned schema migrations tracked in PRAGMA user_version
+#
+#   python migrations.py [hospital.db]    upgrade a database in place
+import sys
+
+import changes
+import dispensing
+import rollups
+import scheduler
+import stock
+
+# Each entry moves the schema from version N-1 to N. Append new migrations;
+# never edit one that has already shipped.
+MIGRATIONS = [
+    # 1: secondary indexes for the filters, joins and sorts used by the pages
+    [
+        "CREATE INDEX IF NOT EXISTS idx_appointments_status ON appointments(status)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_date ON appointments(appointment_date)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_doctor ON appointments(doctor_id, status, appointment_date)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_patient ON appointments(patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_billing_status ON billing(payment_status, payment_date, amount)",
+        "CREATE INDEX IF NOT EXISTS idx_billing_pending ON billing(patient_id, amount) WHERE payment_status = 'Pending'",
+        "CREATE INDEX IF NOT EXISTS idx_billing_patient ON billing(patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_billing_appointment ON billing(appointment_id)",
+        "CREATE INDEX IF NOT EXISTS idx_beds_status ON beds(status, ward_type)",
+        "CREATE INDEX IF NOT EXISTS idx_lab_tests_status ON lab_tests(status, test_date)",
+        "CREATE INDEX IF NOT EXISTS idx_lab_tests_open ON lab_tests(test_date) WHERE status != 'Completed'",
+        "CREATE INDEX IF NOT EXISTS idx_lab_tests_date ON lab_tests(test_date)",
+        "CREATE INDEX IF NOT EXISTS idx_lab_tests_patient ON lab_tests(patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_blood_bank_group ON blood_bank(blood_group, units)",
+        "CREATE INDEX IF NOT EXISTS idx_ambulance_status ON ambulance(status)",
+        "CREATE INDEX IF NOT EXISTS idx_patients_age ON patients(age)",
+        "CREATE INDEX IF NOT EXISTS idx_doctors_dept ON doctors(dept_id)",
+        "CREATE INDEX IF NOT EXISTS idx_staff_dept ON staff(dept_id)",
+        "CREATE INDEX IF NOT EXISTS idx_medical_records_date ON medical_records(record_date)",
+        "CREATE INDEX IF NOT EXISTS idx_medical_records_patient ON medical_records(patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_pharmacy_date ON pharmacy(issue_date)",
+        "CREATE INDEX IF NOT EXISTS idx_pharmacy_patient ON pharmacy(patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_inventory_name ON inventory(item_name)",
+        "ANALYZE",
+    ],
+    # 2: sort orders offered by the paged table views
+    [
+        "DROP INDEX IF EXISTS idx_appointments_status",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_status_date ON appointments(status, appointment_date)",
+        "CREATE INDEX IF NOT EXISTS idx_patients_name ON patients(name)",
+        "CREATE INDEX IF NOT EXISTS idx_patients_registration ON patients(registration_date)",
+        "CREATE INDEX IF NOT EXISTS idx_billing_amount ON billing(amount)",
+        "CREATE INDEX IF NOT EXISTS idx_billing_status_amount ON billing(payment_status, amount)",
+        "CREATE INDEX IF NOT EXISTS idx_inventory_quantity ON inventory(quantity)",
+    ],
+    # 3: full-text patient search kept in sync by triggers (see search.py)
+    [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5(
+            name, phone, email, address,
+            content='patients', content_rowid='patient_id', prefix='2 3'
+        )""",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts_vocab USING fts5vocab(patients_fts, 'row')",
+        """CREATE TRIGGER IF NOT EXISTS patients_fts_insert AFTER INSERT ON patients BEGIN
+            INSERT INTO patients_fts(rowid, name, phone, email, address)
+            VALUES (new.patient_id, new.name, new.phone, new.email, new.address);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS patients_fts_delete AFTER DELETE ON patients BEGIN
+            INSERT INTO patients_fts(patients_fts, rowid, name, phone, email, address)
+            VALUES ('delete', old.patient_id, old.name, old.phone, old.email, old.address);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS patients_fts_update AFTER UPDATE OF name, phone, email, address ON patients BEGIN
+            INSERT INTO patients_fts(patients_fts, rowid, name, phone, email, address)
+            VALUES ('delete', old.patient_id, old.name, old.phone, old.email, old.address);
+            INSERT INTO patients_fts(rowid, name, phone, email, address)
+            VALUES (new.patient_id, new.name, new.phone, new.email, new.address);
+        END""",
+        "INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')",
+    ],
+    # 4: trigger-maintained appointment and billing rollups, backfilled
+    rollups.SCHEMA + rollups.REBUILD_SQL,
+    # 5: progress of bulk imports, so an interrupted load resumes (see importer.py)
+    [
+        """CREATE TABLE IF NOT EXISTS import_jobs (
+            job_key TEXT PRIMARY KEY,
+            target TEXT NOT NULL,
+            source TEXT NOT NULL,
+            rows_done INTEGER NOT NULL DEFAULT 0,
+            rows_loaded INTEGER NOT NULL DEFAULT 0,
+            rows_rejected INTEGER NOT NULL DEFAULT 0,
+            deferred_sql TEXT,
+            status TEXT NOT NULL DEFAULT 'running',
+            started_at DATETIME,
+            finished_at DATETIME
+        )""",
+    ],
+    # 6: date-range exports of billing without a status filter (see exporter.py)
+    [
+        "CREATE INDEX IF NOT EXISTS idx_billing_date ON billing(payment_date)",
+    ],
+    # 7: change log of every write to the base tables (see changes.py)
+    changes.SCHEMA,
+    # 8: "does this patient already hold a bed" check of every admission (see allocation.py)
+    [
+        "CREATE INDEX IF NOT EXISTS idx_beds_patient ON beds(patient_id) WHERE patient_id IS NOT NULL",
+    ],
+    # 9: sortable appointment start and the per-doctor conflict check (see scheduler.py)
+    scheduler.SCHEMA,
+    # 10: the batch billing run's charge lookups (see invoicing.py) and per-doctor billed revenue
+    [
+        "DROP INDEX IF EXISTS idx_lab_tests_patient",
+        "DROP INDEX IF EXISTS idx_pharmacy_patient",
+        "DROP INDEX IF EXISTS idx_appointments_patient",
+        "CREATE INDEX IF NOT EXISTS idx_lab_tests_patient_date ON lab_tests(patient_id, test_date)",
+        "CREATE INDEX IF NOT EXISTS idx_pharmacy_patient_date ON pharmacy(patient_id, issue_date)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_patient_date ON appointments(patient_id, appointment_date)",
+    ] + rollups.REVENUE_SCHEMA + rollups.REVENUE_REBUILD_SQL,
+    # 11: stock movement ledger, per-item reorder levels and the low-stock index (see stock.py)
+    stock.SCHEMA,
+    # 12: dispensing from inventory (see dispensing.py) and the per-day pharmacy revenue rollup
+    dispensing.SCHEMA + rollups.PHARMACY_SCHEMA + rollups.PHARMACY_REBUILD_SQL,
+    # 13: bounded Dashboard reads: patient, appointment and open lab test counts kept by
+    # triggers (see rollups.py), and beds listed in bed-number order
+    rollups.COUNTS_SCHEMA + rollups.COUNTS_REBUILD_SQL + [
+        "CREATE INDEX IF NOT EXISTS idx_beds_number ON beds(bed_number)",
+    ],
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn):
+    version = get_version(conn)
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in MIGRATIONS[target - 1]:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return get_version(conn)
+
+if __name__ == '__main__':
+    import sqlite3
+    from db import DB_NAME, init_db
+
+    db_name = sys.argv[1] if len(sys.argv) > 1 else DB_NAME
+    init_db(db_name, sample_data=False)
+    conn = sqlite3.connect(db_name)
+    print(f"{db_name}: schema version {get_version(conn)}")
+    conn.close()
@@ -0,0 +1,109 @@
+# Server-side paged tables: keyset pagination with sorting and filtering in SQL
+import streamlit as st
+
+from pool import get_conn
+
+PAGE_SIZES = [25, 50, 100, 250]
+COUNT_CAP = 10000
+
+def _continuations(sort_col, key_col, descending, after):
+    """(clauses, args) that, read in order, hold every row after the cursor.
+
+    SQLite sorts NULLs first ascending and last descending, and a row-value
+    comparison is never true against NULL, so a cursor on either side of the
+    NULL group needs a second range: the rest of the NULLs, then the values
+    (ascending), or the rest of the values, then the NULLs (descending).
+    Each range stays an index range read.
+    """
+    if after is None:
+        return [([], [])]
+    value, key = after
+    op = '<' if descending else '>'
+    if value is None:
+        nulls = ([f"{sort_col} IS NULL", f"{key_col} {op} ?"], [key])
+        return [nulls] if descending else [nulls, ([f"{sort_col} IS NOT NULL"], [])]
+    values = ([f"({sort_col}, {key_col}) {op} (?, ?)"], [value, key])
+    return [values, ([f"{sort_col} IS NULL"], [])] if descending else [values]
+
+def fetch_page(conn, columns, source, key_col, sort_col, descending=False,
+               where=(), params=(), after=None, page_size=50):
+    """Return (rows, column_names, next_cursor) for one page.
+
+    Pages are addressed by the (sort value, key) of the last row of the previous
+    page, so every page is an index range read no matter how deep it is. The
+    sort value may be NULL; key_col must be unique and NOT NULL.
+    """
+    direction = 'DESC' if descending else 'ASC'
+    rows, names = [], None
+    for clauses, args in _continuations(sort_col, key_col, descending, after):
+        clauses = list(where) + clauses
+        args = list(params) + args
+        sql = f"SELECT {sort_col}, {key_col}, {columns} FROM {source}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {sort_col} {direction}, {key_col} {direction} LIMIT ?"
+        args.append(page_size + 1 - len(rows))
+
+        cursor = conn.execute(sql, args)
+        names = [d[0] for d in cursor.description[2:]]
+        rows += cursor.fetchall()
+        if len(rows) > page_size:
+            break
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = tuple(rows[-1][:2])
+    return [row[2:] for row in rows], names, next_cursor
+
+def approx_count(conn, source, where=(), params=()):
+    """Cheap row-count label for the pager.
+
+    Unfiltered tables use MAX(rowid), an O(log n) lookup that ignores gaps left by
+    deletes. Filtered queries count at most COUNT_CAP rows and report "N+" beyond.
+    """
+    if not where:
+        table = source.split()[0]
+        count = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+        return f"≈ {count:,} rows"
+    sql = f"SELECT COUNT(*) FROM (SELECT 1 FROM {source} WHERE {' AND '.join(where)} LIMIT {COUNT_CAP + 1})"
+    count = conn.execute(sql, list(params)).fetchone()[0]
+    return f"{COUNT_CAP:,}+ rows" if count > COUNT_CAP else f"{count:,} rows"
+
+def _go_next(key, cursor):
+    st.session_state[key]['cursors'].append(cursor)
+
+def _go_prev(key):
+    st.session_state[key]['cursors'].pop()
+
+def paged_table(key, columns, source, key_col, sort_options, where=(), params=(), default_desc=True):
+    """Render one page of a query as a dataframe with sort and pager controls.
+
+    sort_options maps the labels offered to the user to SQL sort expressions;
+    where/params are extra filter clauses ANDed together.
+    """
+    state = st.session_state.setdefault(key, {'signature': None, 'cursors': [None]})
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    sort_label = col1.selectbox("Sort by", list(sort_options), key=f"{key}_sort")
+    order = col2.radio("Order", ["Descending", "Ascending"], index=0 if default_desc else 1,
+                       horizontal=True, key=f"{key}_order")
+    page_size = col3.selectbox("Rows", PAGE_SIZES, index=1, key=f"{key}_size")
+    descending = order == "Descending"
+
+    signature = (sort_label, descending, page_size, tuple(where), tuple(params))
+    if state['signature'] != signature:
+        state['signature'] = signature
+        state['cursors'] = [None]
+
+    import pandas as pd
+
+    conn = get_conn()
+    rows, names, next_cursor = fetch_page(conn, columns, source, key_col, sort_options[sort_label],
+                                          descending, where, params, state['cursors'][-1], page_size)
+    st.dataframe(pd.DataFrame(rows, columns=names), use_container_width=True, hide_index=True)
+
+    page = len(state['cursors'])
+    col1, col2, col3 = st.columns([1, 3, 1])
+    col1.button("◀ Previous", key=f"{key}_prev", disabled=page == 1, on_click=_go_prev, args=(key,))
+    col2.caption(f"Page {page} · {approx_count(conn, source, where, params)}")
+    col3.button("Next ▶", key=f"{key}_next", disabled=next_cursor is None, on_click=_go_next, args=(key, next_cursor))
@@ -0,0 +1,214 @@
+# Payments: bulk "Mark as Paid" and reconciliation of a bank payments file
+#
+#   python payments.py payments.csv [--db hospital.db] [--dry-run]
+#
+# A payments file has one row per payment: amount plus either bill_id or
+# patient_id, and optionally paid_on (YYYY-MM-DD, default today). A row with a
+# bill_id must match that Pending bill's amount; a row without one is matched
+# to the patient's oldest Pending bill of that amount (idx_billing_pending).
+# Each bill is settled at most once per file. Matching and the update happen
+# in one BEGIN IMMEDIATE transaction, so the summary is exactly what was
+# applied; with dry_run it is rolled back and the summary is a preview.
+import argparse
+import json
+import sys
+from datetime import date
+
+from importer import _date, _int, _real, detect_format, open_rows
+
+MAX_PROBLEM_SAMPLES = 200
+AMOUNT_TOLERANCE = 0.005
+
+COLUMNS = ('bill_id', 'patient_id', 'amount', 'paid_on')
+ALIASES = {'bill': 'bill_id', 'invoice': 'bill_id', 'invoice_id': 'bill_id', 'patient': 'patient_id',
+           'paid': 'amount', 'date': 'paid_on', 'payment_date': 'paid_on', 'value_date': 'paid_on'}
+
+# one statement for any number of bills: [[bill_id, paid_on], ...] as JSON
+PAY_SQL = """
+    UPDATE billing SET payment_status = 'Paid', payment_date = p.value ->> 1
+    FROM json_each(?) p
+    WHERE billing.bill_id = p.value ->> 0 AND billing.payment_status = 'Pending'
+    RETURNING billing.bill_id, billing.amount
+"""
+
+# no ORDER BY: sorting by bill_id would steer the planner off the partial index;
+# a patient has few pending bills of one amount, so they are sorted in Python
+BY_PATIENT_SQL = """
+    SELECT bill_id FROM billing
+    WHERE patient_id = ? AND payment_status = 'Pending' AND amount BETWEEN ? AND ?
+"""
+
+def _pay(conn, payments):
+    """Settle [(bill_id, paid_on)] that are still Pending; return {bill_id: amount} of those paid."""
+    if not payments:
+        return {}
+    return dict(conn.execute(PAY_SQL, (json.dumps(payments),)).fetchall())
+
+def mark_paid(conn, bill_ids, paid_on=None):
+    """Mark the given bills Paid in one transaction; return {bill_id: amount} of those that were Pending."""
+    paid_on = paid_on or date.today().isoformat()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        paid = _pay(conn, [(bill_id, paid_on) for bill_id in bill_ids])
+        conn.commit()
+        return paid
+    except Exception:
+        conn.rollback()
+        raise
+
+def _plan(header):
+    positions = {}
+    for index, name in enumerate(header):
+        column = str(name).strip().lower().replace(' ', '_')
+        column = ALIASES.get(column, column)
+        if column in COLUMNS and column not in positions:
+            positions[column] = index
+    if 'amount' not in positions or not {'bill_id', 'patient_id'} & set(positions):
+        raise ValueError(f"a payments file needs amount and bill_id or patient_id columns; "
+                         f"file has {', '.join(map(str, header))}")
+    return positions
+
+def _match(conn, row, claimed):
+    """(bill_id, how) for one parsed payment row, or (None, reason)."""
+    bill_id, patient_id, amount = row['bill_id'], row['patient_id'], row['amount']
+    if amount is None:
+        return None, "amount is required"
+    if bill_id is not None:
+        bill = conn.execute("SELECT amount, payment_status FROM billing WHERE bill_id = ?", (bill_id,)).fetchone()
+        if bill is None:
+            return None, f"no bill #{bill_id}"
+        if bill_id in claimed:
+            return None, f"bill #{bill_id} is paid by an earlier row"
+        if bill[1] != 'Pending':
+            return None, f"bill #{bill_id} is already {bill[1]}"
+        if abs((bill[0] or 0) - amount) > AMOUNT_TOLERANCE:
+            return None, f"amount {amount:,.2f} does not match bill #{bill_id} ({bill[0] or 0:,.2f})"
+        return bill_id, 'bill id'
+    if patient_id is None:
+        return None, "bill_id or patient_id is required"
+    candidates = conn.execute(BY_PATIENT_SQL, (patient_id, amount - AMOUNT_TOLERANCE, amount + AMOUNT_TOLERANCE))
+    for candidate in sorted(bill_id for bill_id, in candidates):
+        if candidate not in claimed:
+            return candidate, 'patient + amount'
+    return None, f"patient #{patient_id} has no unmatched Pending bill of {amount:,.2f}"
+
+def reconcile(conn, source, fmt='csv', dry_run=False):
+    """Match a payments file to Pending bills and mark them Paid; return a summary dict.
+
+    The summary lists every match as (row, bill_id, amount, paid_on, how) and
+    the first MAX_PROBLEM_SAMPLES unmatched rows as (row, reason).
+    """
+    header, rows = open_rows(source, fmt)
+    positions = _plan(header)
+    converters = {'bill_id': _int, 'patient_id': _int, 'amount': _real, 'paid_on': _date}
+    today = date.today().isoformat()
+    summary = {'rows': 0, 'matched': 0, 'unmatched': 0, 'amount': 0.0, 'dry_run': dry_run,
+               'matches': [], 'problems': []}
+    claimed = {}
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for number, values in enumerate(rows, start=2):
+            summary['rows'] += 1
+            try:
+                row = {column: converters[column](values[positions[column]])
+                       if column in positions and positions[column] < len(values) else None
+                       for column in COLUMNS}
+                bill_id, how = _match(conn, row, claimed)
+            except ValueError as e:
+                bill_id, how = None, str(e)
+            if bill_id is None:
+                summary['unmatched'] += 1
+                if len(summary['problems']) < MAX_PROBLEM_SAMPLES:
+                    summary['problems'].append((number, how))
+                continue
+            claimed[bill_id] = (number, row['paid_on'] or today, how)
+        paid = _pay(conn, [(bill_id, paid_on) for bill_id, (_, paid_on, _) in claimed.items()])
+        summary['matches'] = [(number, bill_id, paid[bill_id], paid_on, how)
+                              for bill_id, (number, paid_on, how) in claimed.items() if bill_id in paid]
+        summary['matched'] = len(paid)
+        summary['amount'] = sum(paid.values())
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return summary
+
+def payment_panel():
+    """Payment tab body: multi-select Mark as Paid, and reconciliation of an uploaded payments file."""
+    import streamlit as st
+
+    from cache import bump
+    from lookups import bill_picker, labels
+    from pool import get_conn
+
+    if labels('pending_bills'):
+        bill_ids = bill_picker("Select Bills to Pay", "pay_bills")
+        if st.button("💳 Mark as Paid", disabled=not bill_ids):
+            paid = mark_paid(get_conn(), bill_ids)
+            bump('billing')
+            st.success(f"✅ {len(paid)} payment(s) recorded, Rs. {sum(paid.values()):,.0f}")
+            st.rerun()
+    else:
+        st.info("No pending bills")
+
+    st.subheader("🏦 Reconcile Payments File")
+    st.caption("CSV or Parquet with amount and bill_id or patient_id, optionally paid_on (YYYY-MM-DD). "
+               "Rows without a bill_id are matched to the patient's oldest pending bill of that amount.")
+    upload = st.file_uploader("Payments file", type=['csv', 'parquet', 'pq'], key="reconcile_file")
+    col1, col2 = st.columns(2)
+    preview = col1.button("🔍 Preview", disabled=upload is None, key="reconcile_preview")
+    apply = col2.button("✅ Apply", disabled=upload is None, key="reconcile_apply")
+    if upload is not None and (preview or apply):
+        upload.seek(0)
+        try:
+            summary = reconcile(get_conn(), upload, detect_format(upload.name), dry_run=not apply)
+        except (ValueError, ImportError) as e:
+            st.error(str(e))
+            return
+        if apply and summary['matched']:
+            bump('billing')
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rows", f"{summary['rows']:,}")
+        col2.metric("Matched" if apply else "Would match", f"{summary['matched']:,}",
+                    f"Rs. {summary['amount']:,.0f}", delta_color="off")
+        col3.metric("Unmatched", f"{summary['unmatched']:,}")
+        if summary['matches']:
+            st.dataframe([{'Row': n, 'Bill': bill_id, 'Amount': amount, 'Paid on': paid_on, 'Matched by': how}
+                          for n, bill_id, amount, paid_on, how in summary['matches']],
+                         use_container_width=True, hide_index=True)
+        if summary['problems']:
+            st.warning(f"{summary['unmatched']:,} row(s) not matched" +
+                       (f"; first {len(summary['problems'])}:" if summary['unmatched'] > len(summary['problems']) else ":"))
+            st.dataframe([{'Row': n, 'Reason': reason} for n, reason in summary['problems']],
+                         use_container_width=True, hide_index=True)
+
+def main(argv=None):
+    from db import DB_NAME, bootstrap
+    from pool import ConnectionPool
+
+    parser = argparse.ArgumentParser(description="Match a payments file to pending bills and mark them paid.")
+    parser.add_argument('path')
+    parser.add_argument('--db', default=DB_NAME)
+    parser.add_argument('--format', choices=('csv', 'parquet'))
+    parser.add_argument('--dry-run', action='store_true', help="report the matches without applying them")
+    args = parser.parse_args(argv)
+
+    bootstrap(args.db)
+    conn = ConnectionPool(args.db).get()
+    try:
+        summary = reconcile(conn, args.path, args.format or detect_format(args.path), args.dry_run)
+    except (ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    for number, reason in summary['problems']:
+        print(f"row {number}: {reason}")
+    verb = "would mark" if args.dry_run else "marked"
+    print(f"{summary['rows']:,} rows: {verb} {summary['matched']:,} bills paid (Rs. {summary['amount']:,.2f}), "
+          f"{summary['unmatched']:,} unmatched")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# Shared SQLite connection layer used by every page
+import queue
+import sqlite3
+import threading
+import weakref
+
+from db import DB_NAME
+from profiler import ProfiledConnection
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+class ConnectionPool:
+    """Hands each thread one tuned connection and takes it back when the thread ends.
+
+    Streamlit runs every rerun on a script thread, so a thread-local lease keeps
+    all queries of one rerun on the same connection while the connections
+    themselves (and their prepared-statement caches) outlive the thread.
+    """
+
+    def __init__(self, db_name=DB_NAME, max_idle=16, cached_statements=256):
+        self.db_name = db_name
+        self.cached_statements = cached_statements
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+        self._local = threading.local()
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_name, timeout=10, check_same_thread=False,
+                               cached_statements=self.cached_statements, factory=ProfiledConnection)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def get(self):
+        lease = getattr(self._local, 'lease', None)
+        if lease is None:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+            lease = _Lease(conn)
+            weakref.finalize(lease, self._release, conn)
+            self._local.lease = lease
+        return lease.conn
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+class _Lease:
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
+
+_pool = ConnectionPool()
+
+def get_conn():
+    return _pool.get()
@@ -0,0 +1,208 @@
+# Per-rerun profiler: times every query and page section of one script run
+#
+# Pooled connections hand out ProfiledCursor objects only while a profile is
+# active on the current thread, so a normal rerun pays one thread-local lookup
+# per query. A profile records the SQL, rows fetched and wall time (execute plus
+# fetches) of each query, the memory of each DataFrame built from a query, and
+# the time of each section. finish() explains the slow queries and appends the
+# whole run as one JSON line to PROFILE_LOG.
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+SLOW_QUERY_MS = 50
+PROFILE_LOG = 'profile.jsonl'
+
+_local = threading.local()
+
+class Profile:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.created = datetime.now().isoformat(timespec='seconds')
+        self.section = page
+        self.sections = {}
+        self.queries = []
+        self.frames = []
+        self.total_ms = None
+
+    def to_dict(self):
+        # parameters stay out of the log: they can hold patient details
+        return {
+            'created': self.created,
+            'page': self.page,
+            'total_ms': self.total_ms,
+            'sections': self.sections,
+            'queries': [{k: v for k, v in q.items() if k != 'params'} for q in self.queries],
+            'frames': self.frames,
+        }
+
+def current():
+    return getattr(_local, 'profile', None)
+
+def start(page, enabled=True):
+    """Begin profiling this thread's rerun; with enabled False, stop any profile left over."""
+    _local.profile = Profile(page) if enabled else None
+    return _local.profile
+
+@contextmanager
+def section(name):
+    """Attribute queries and time to name; usable alongside st.columns, e.g. `with col1, section("Chart"):`."""
+    profile = current()
+    if profile is None:
+        yield
+        return
+    outer, profile.section = profile.section, name
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.sections[name] = round(profile.sections.get(name, 0) + (time.perf_counter() - started) * 1000, 2)
+        profile.section = outer
+
+def _sql_text(sql):
+    return ' '.join(sql.split())
+
+def note_cache_hit(sql):
+    profile = current()
+    if profile is not None:
+        profile.queries.append({'sql': _sql_text(sql), 'section': profile.section, 'rows': None,
+                                'ms': 0.0, 'cached': True})
+
+def note_frame(sql, df):
+    profile = current()
+    if profile is not None:
+        profile.frames.append({'sql': _sql_text(sql), 'section': profile.section, 'rows': len(df),
+                               'bytes': int(df.memory_usage(deep=True).sum())})
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that adds its execute and fetch time and row count to one query record."""
+
+    _record = None
+
+    def _begin(self, method, sql, params):
+        profile = current()
+        started = time.perf_counter()
+        try:
+            return method(sql, params)
+        finally:
+            if profile is not None:
+                self._record = {'sql': _sql_text(sql), 'section': profile.section, 'rows': 0,
+                                'ms': round((time.perf_counter() - started) * 1000, 3), 'cached': False,
+                                'params': params}
+                profile.queries.append(self._record)
+
+    def _fetched(self, started, rows):
+        if self._record is not None:
+            self._record['rows'] += rows
+            self._record['ms'] = round(self._record['ms'] + (time.perf_counter() - started) * 1000, 3)
+
+    def execute(self, sql, params=()):
+        return self._begin(super().execute, sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._begin(super().executemany, sql, seq_of_params)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(started, len(rows))
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows))
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        row = super().__next__()
+        self._fetched(started, 1)
+        return row
+
+class ProfiledConnection(sqlite3.Connection):
+    # Connection.execute makes its cursor in C without calling cursor(), so the
+    # shortcuts are routed through a ProfiledCursor explicitly
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = ProfiledCursor if current() is not None else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        if current() is None:
+            return super().execute(sql, params)
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        if current() is None:
+            return super().executemany(sql, seq_of_params)
+        return self.cursor().executemany(sql, seq_of_params)
+
+def explain(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN as an indented tree, the way the sqlite3 shell prints it."""
+    depth, lines = {0: -1}, []
+    for node, parent, _, detail in conn.execute("EXPLAIN QUERY PLAN " + sql, params):
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return "\n".join(lines)
+
+def finish(log_path=PROFILE_LOG):
+    """Close this thread's profile, explain its slow queries and log it; return the profile or None."""
+    profile = current()
+    if profile is None:
+        return None
+    _local.profile = None
+    profile.total_ms = round((time.perf_counter() - profile.started) * 1000, 2)
+
+    from pool import get_conn
+    conn = get_conn()
+    for query in profile.queries:
+        slow = not query['cached'] and query['ms'] >= SLOW_QUERY_MS
+        if slow and query['sql'].upper().startswith(('SELECT', 'WITH')):
+            try:
+                query['plan'] = explain(conn, query['sql'], query['params'])
+            except sqlite3.Error as e:
+                query['plan'] = f"EXPLAIN failed: {e}"
+    if log_path:
+        with open(log_path, 'a') as f:
+            f.write(json.dumps(profile.to_dict()) + "\n")
+    return profile
+
+def profiler_panel(profile):
+    """Developer sidebar panel for a finished profile."""
+    import streamlit as st
+    import pandas as pd
+
+    queries = [q for q in profile.queries if not q['cached']]
+    with st.sidebar.expander(f"🧪 Profiler · {profile.total_ms:,.0f} ms", expanded=True):
+        col1, col2 = st.columns(2)
+        col1.metric("Queries", len(queries))
+        col2.metric("Cache hits", len(profile.queries) - len(queries))
+        col1.metric("DB time", f"{sum(q['ms'] for q in queries):,.1f} ms")
+        col2.metric("Frames", f"{sum(f['bytes'] for f in profile.frames) / 1024:,.0f} KB")
+        if profile.sections:
+            st.markdown("**Sections**")
+            st.dataframe(pd.DataFrame(sorted(profile.sections.items(), key=lambda s: -s[1]),
+                                      columns=['section', 'ms']), hide_index=True)
+        if profile.queries:
+            st.markdown("**Queries**")
+            st.dataframe(pd.DataFrame([(q['section'], q['ms'], q['rows'], q['cached'], q['sql'])
+                                       for q in sorted(profile.queries, key=lambda q: -q['ms'])],
+                                      columns=['section', 'ms', 'rows', 'cached', 'sql']), hide_index=True)
+        for query in profile.queries:
+            if 'plan' in query:
+                st.warning(f"🐢 {query['ms']:,.0f} ms · {query['rows']} rows")
+                st.code(query['sql'], language='sql')
+                st.code(query['plan'], language='text')
+        st.download_button("⬇️ Profile JSON", json.dumps(profile.to_dict(), indent=2),
+                           file_name=f"profile-{profile.created}.json", mime='application/json')
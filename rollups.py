@@ -0,0 +1,280 @@
+# Materialized rollups of appointments and billing, kept current by triggers
+#
+# doctor_daily_stats / dept_daily_stats hold appointment counts per day, plus the
+# consultation fees of completed ones priced at the doctor's fee when the row was
+# written. billing_totals holds bill count and amount per payment status.
+# doctor_revenue holds billed count and amount per doctor (through the bill's
+# appointment) and payment status. pharmacy_daily holds prescriptions, units and
+# revenue dispensed per day. row_counts holds the Dashboard's unfiltered counts
+# (patients, appointments, open lab tests). refresh_rollups() rebuilds them all
+# from the base tables, e.g. after fees change.
+
+def _appointment_delta(row, sign):
+    completed = f"CASE WHEN {row}.status = 'Completed' THEN 1 ELSE 0 END"
+    fee = f"COALESCE((SELECT consultation_fee FROM doctors WHERE doctor_id = {row}.doctor_id), 0)"
+    dept = f"COALESCE((SELECT dept_id FROM doctors WHERE doctor_id = {row}.doctor_id), 0)"
+    return f"""
+        INSERT INTO doctor_daily_stats (doctor_id, day, appointments, completed, completed_fees)
+        VALUES (COALESCE({row}.doctor_id, 0), COALESCE({row}.appointment_date, ''),
+                {sign}, {sign} * {completed}, {sign} * {completed} * {fee})
+        ON CONFLICT (doctor_id, day) DO UPDATE SET
+            appointments = appointments + excluded.appointments,
+            completed = completed + excluded.completed,
+            completed_fees = completed_fees + excluded.completed_fees;
+        INSERT INTO dept_daily_stats (dept_id, day, appointments, completed, completed_fees)
+        VALUES ({dept}, COALESCE({row}.appointment_date, ''),
+                {sign}, {sign} * {completed}, {sign} * {completed} * {fee})
+        ON CONFLICT (dept_id, day) DO UPDATE SET
+            appointments = appointments + excluded.appointments,
+            completed = completed + excluded.completed,
+            completed_fees = completed_fees + excluded.completed_fees;"""
+
+def _billing_delta(row, sign):
+    return f"""
+        INSERT INTO billing_totals (payment_status, bills, amount)
+        VALUES (COALESCE({row}.payment_status, ''), {sign}, {sign} * COALESCE({row}.amount, 0))
+        ON CONFLICT (payment_status) DO UPDATE SET
+            bills = bills + excluded.bills,
+            amount = amount + excluded.amount;"""
+
+def _revenue_delta(row, sign):
+    doctor = f"COALESCE((SELECT doctor_id FROM appointments WHERE appointment_id = {row}.appointment_id), 0)"
+    return f"""
+        INSERT INTO doctor_revenue (doctor_id, payment_status, bills, amount)
+        VALUES ({doctor}, COALESCE({row}.payment_status, ''), {sign}, {sign} * COALESCE({row}.amount, 0))
+        ON CONFLICT (doctor_id, payment_status) DO UPDATE SET
+            bills = bills + excluded.bills,
+            amount = amount + excluded.amount;"""
+
+def _pharmacy_delta(row, sign):
+    return f"""
+        INSERT INTO pharmacy_daily (day, prescriptions, units, revenue)
+        VALUES (COALESCE({row}.issue_date, ''), {sign}, {sign} * COALESCE({row}.quantity, 0),
+                {sign} * COALESCE({row}.price, 0))
+        ON CONFLICT (day) DO UPDATE SET
+            prescriptions = prescriptions + excluded.prescriptions,
+            units = units + excluded.units,
+            revenue = revenue + excluded.revenue;"""
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS doctor_daily_stats (
+        doctor_id INTEGER NOT NULL,
+        day DATE NOT NULL,
+        appointments INTEGER NOT NULL,
+        completed INTEGER NOT NULL,
+        completed_fees REAL NOT NULL,
+        PRIMARY KEY (doctor_id, day)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS dept_daily_stats (
+        dept_id INTEGER NOT NULL,
+        day DATE NOT NULL,
+        appointments INTEGER NOT NULL,
+        completed INTEGER NOT NULL,
+        completed_fees REAL NOT NULL,
+        PRIMARY KEY (dept_id, day)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS billing_totals (
+        payment_status TEXT NOT NULL PRIMARY KEY,
+        bills INTEGER NOT NULL,
+        amount REAL NOT NULL
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_dept_daily_stats_day ON dept_daily_stats(day)",
+    f"""CREATE TRIGGER IF NOT EXISTS appointments_rollup_insert AFTER INSERT ON appointments BEGIN
+        {_appointment_delta('new', 1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS appointments_rollup_delete AFTER DELETE ON appointments BEGIN
+        {_appointment_delta('old', -1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS appointments_rollup_update
+        AFTER UPDATE OF doctor_id, appointment_date, status ON appointments BEGIN
+        {_appointment_delta('old', -1)}
+        {_appointment_delta('new', 1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS billing_rollup_insert AFTER INSERT ON billing BEGIN
+        {_billing_delta('new', 1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS billing_rollup_delete AFTER DELETE ON billing BEGIN
+        {_billing_delta('old', -1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS billing_rollup_update AFTER UPDATE OF payment_status, amount ON billing BEGIN
+        {_billing_delta('old', -1)}
+        {_billing_delta('new', 1)}
+    END""",
+]
+
+REBUILD_SQL = [
+    "DELETE FROM doctor_daily_stats",
+    "DELETE FROM dept_daily_stats",
+    "DELETE FROM billing_totals",
+    """INSERT INTO doctor_daily_stats (doctor_id, day, appointments, completed, completed_fees)
+       SELECT COALESCE(a.doctor_id, 0), COALESCE(a.appointment_date, ''), COUNT(*),
+              COUNT(CASE WHEN a.status = 'Completed' THEN 1 END),
+              TOTAL(CASE WHEN a.status = 'Completed' THEN d.consultation_fee END)
+       FROM appointments a LEFT JOIN doctors d ON d.doctor_id = a.doctor_id
+       GROUP BY 1, 2""",
+    """INSERT INTO dept_daily_stats (dept_id, day, appointments, completed, completed_fees)
+       SELECT COALESCE(d.dept_id, 0), COALESCE(a.appointment_date, ''), COUNT(*),
+              COUNT(CASE WHEN a.status = 'Completed' THEN 1 END),
+              TOTAL(CASE WHEN a.status = 'Completed' THEN d.consultation_fee END)
+       FROM appointments a LEFT JOIN doctors d ON d.doctor_id = a.doctor_id
+       GROUP BY 1, 2""",
+    """INSERT INTO billing_totals (payment_status, bills, amount)
+       SELECT COALESCE(payment_status, ''), COUNT(*), TOTAL(amount)
+       FROM billing
+       GROUP BY 1""",
+]
+
+# added after SCHEMA and REBUILD_SQL shipped in migration 4, so kept apart from them
+REVENUE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS doctor_revenue (
+        doctor_id INTEGER NOT NULL,
+        payment_status TEXT NOT NULL,
+        bills INTEGER NOT NULL,
+        amount REAL NOT NULL,
+        PRIMARY KEY (payment_status, doctor_id)
+    ) WITHOUT ROWID""",
+    f"""CREATE TRIGGER IF NOT EXISTS billing_revenue_insert AFTER INSERT ON billing BEGIN
+        {_revenue_delta('new', 1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS billing_revenue_delete AFTER DELETE ON billing BEGIN
+        {_revenue_delta('old', -1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS billing_revenue_update
+        AFTER UPDATE OF payment_status, amount, appointment_id ON billing BEGIN
+        {_revenue_delta('old', -1)}
+        {_revenue_delta('new', 1)}
+    END""",
+    # a bill follows its appointment to another doctor
+    """CREATE TRIGGER IF NOT EXISTS appointments_revenue_update AFTER UPDATE OF doctor_id ON appointments
+        WHEN old.doctor_id IS NOT new.doctor_id BEGIN
+        INSERT INTO doctor_revenue (doctor_id, payment_status, bills, amount)
+        SELECT doctor, COALESCE(b.payment_status, ''), sign * COUNT(*), sign * TOTAL(b.amount)
+        FROM billing b, (SELECT COALESCE(old.doctor_id, 0) AS doctor, -1 AS sign
+                         UNION ALL SELECT COALESCE(new.doctor_id, 0), 1)
+        WHERE b.appointment_id = new.appointment_id
+        GROUP BY doctor, sign, 2
+        ON CONFLICT (doctor_id, payment_status) DO UPDATE SET
+            bills = bills + excluded.bills,
+            amount = amount + excluded.amount;
+    END""",
+]
+
+REVENUE_REBUILD_SQL = [
+    "DELETE FROM doctor_revenue",
+    """INSERT INTO doctor_revenue (doctor_id, payment_status, bills, amount)
+       SELECT COALESCE(a.doctor_id, 0), COALESCE(b.payment_status, ''), COUNT(*), TOTAL(b.amount)
+       FROM billing b LEFT JOIN appointments a ON a.appointment_id = b.appointment_id
+       GROUP BY 1, 2""",
+]
+
+PHARMACY_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS pharmacy_daily (
+        day DATE NOT NULL PRIMARY KEY,
+        prescriptions INTEGER NOT NULL,
+        units INTEGER NOT NULL,
+        revenue REAL NOT NULL
+    ) WITHOUT ROWID""",
+    f"""CREATE TRIGGER IF NOT EXISTS pharmacy_rollup_insert AFTER INSERT ON pharmacy BEGIN
+        {_pharmacy_delta('new', 1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS pharmacy_rollup_delete AFTER DELETE ON pharmacy BEGIN
+        {_pharmacy_delta('old', -1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS pharmacy_rollup_update AFTER UPDATE OF issue_date, quantity, price ON pharmacy BEGIN
+        {_pharmacy_delta('old', -1)}
+        {_pharmacy_delta('new', 1)}
+    END""",
+]
+
+PHARMACY_REBUILD_SQL = [
+    "DELETE FROM pharmacy_daily",
+    """INSERT INTO pharmacy_daily (day, prescriptions, units, revenue)
+       SELECT COALESCE(issue_date, ''), COUNT(*), COALESCE(SUM(quantity), 0), TOTAL(price)
+       FROM pharmacy
+       GROUP BY 1""",
+]
+
+def _count_delta(name, change):
+    return f"""
+        INSERT INTO row_counts (name, value) VALUES ('{name}', {change})
+        ON CONFLICT (name) DO UPDATE SET value = value + excluded.value;"""
+
+def _open_test(row):
+    # the same rows as idx_lab_tests_open: NULL status is not counted
+    return f"CASE WHEN {row}.status != 'Completed' THEN 1 ELSE 0 END"
+
+COUNTS_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS row_counts (
+        name TEXT NOT NULL PRIMARY KEY,
+        value INTEGER NOT NULL
+    ) WITHOUT ROWID""",
+    f"""CREATE TRIGGER IF NOT EXISTS patients_count_insert AFTER INSERT ON patients BEGIN
+        {_count_delta('patients', 1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS patients_count_delete AFTER DELETE ON patients BEGIN
+        {_count_delta('patients', -1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS appointments_count_insert AFTER INSERT ON appointments BEGIN
+        {_count_delta('appointments', 1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS appointments_count_delete AFTER DELETE ON appointments BEGIN
+        {_count_delta('appointments', -1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS lab_tests_count_insert AFTER INSERT ON lab_tests BEGIN
+        {_count_delta('open_lab_tests', _open_test('new'))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS lab_tests_count_delete AFTER DELETE ON lab_tests BEGIN
+        {_count_delta('open_lab_tests', f"-{_open_test('old')}")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS lab_tests_count_update AFTER UPDATE OF status ON lab_tests
+        WHEN old.status IS NOT new.status BEGIN
+        {_count_delta('open_lab_tests', f"{_open_test('new')} - {_open_test('old')}")}
+    END""",
+]
+
+COUNTS_REBUILD_SQL = [
+    "DELETE FROM row_counts",
+    """INSERT INTO row_counts (name, value)
+       SELECT 'patients', COUNT(*) FROM patients
+       UNION ALL SELECT 'appointments', COUNT(*) FROM appointments
+       UNION ALL SELECT 'open_lab_tests', COUNT(*) FROM lab_tests WHERE status != 'Completed'""",
+]
+
+def refresh_rollups(conn):
+    with conn:
+        for statement in REBUILD_SQL + REVENUE_REBUILD_SQL + PHARMACY_REBUILD_SQL + COUNTS_REBUILD_SQL:
+            conn.execute(statement)
+
+# Analytics reads: O(days x doctors) rows instead of O(appointments)
+# paid bills, not consultation fees, so lab and pharmacy charges count too
+REVENUE_BY_DOCTOR_SQL = """
+    SELECT d.name, r.amount as revenue
+    FROM doctor_revenue r
+    JOIN doctors d ON d.doctor_id = r.doctor_id
+    WHERE r.payment_status = 'Paid' AND r.amount > 0
+    ORDER BY revenue DESC
+"""
+
+DEPT_PERFORMANCE_SQL = """
+    SELECT d.dept_name, SUM(s.completed) as appointments, SUM(s.completed_fees) as total_revenue
+    FROM dept_daily_stats s
+    JOIN departments d ON d.dept_id = s.dept_id
+    GROUP BY s.dept_id
+    HAVING SUM(s.completed) > 0
+"""
+
+# one row per dispensing day instead of every prescription
+PHARMACY_REVENUE_SQL = """
+    SELECT TOTAL(revenue), TOTAL(CASE WHEN day = date('now') THEN revenue END),
+           TOTAL(CASE WHEN day = date('now') THEN prescriptions END)
+    FROM pharmacy_daily
+"""
+
+DEPT_LOAD_TODAY_SQL = """
+    SELECT d.dept_name, SUM(s.appointments) as load
+    FROM dept_daily_stats s
+    JOIN departments d ON d.dept_id = s.dept_id
+    WHERE s.day = date('now')
+    GROUP BY s.dept_id
+    HAVING SUM(s.appointments) > 0
+"""
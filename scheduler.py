@@ -0,0 +1,180 @@
+# Appointment scheduling: conflict-checked booking and a per-doctor interval index
+#
+# appointments.starts_at is a generated 'YYYY-MM-DD HH:MM' column derived from
+# appointment_date and the free-text appointment_time ('10:30 AM', '14:30'),
+# so starts sort and range-query as text and idx_appointments_doctor_start
+# answers "does this doctor have anything near 10:30" with one index seek.
+#
+# Every appointment is taken to last SLOT_MINUTES; two Scheduled appointments
+# of one doctor conflict when their starts are less than that apart. book()
+# checks and inserts inside BEGIN IMMEDIATE, so of two desks booking the same
+# slot one succeeds and the other gets a ValueError.
+#
+# ScheduleIndex keeps each doctor's upcoming Scheduled starts as a sorted list,
+# synced from the change log (see changes.py), and finds free slots with
+# bisect instead of querying per candidate slot.
+import heapq
+import threading
+from bisect import bisect_right, insort
+from datetime import date, datetime, timedelta
+
+from changes import catch_up
+
+SLOT_MINUTES = 30
+DAY_START = 9   # first slot of the day, hour
+DAY_END = 17    # no slot starts at or after this hour
+MAX_DAYS_AHEAD = 60
+
+STARTS_AT_FORMAT = '%Y-%m-%d %H:%M'
+
+def _starts_at_sql():
+    time = "trim(appointment_time)"
+    hour = f"CAST(substr({time}, 1, instr({time}, ':') - 1) AS INTEGER)"
+    minute = f"CAST(substr({time}, instr({time}, ':') + 1, 2) AS INTEGER)"
+    pm = f"(upper({time}) LIKE '%PM')"
+    twelve_hour = f"(upper({time}) LIKE '%AM' OR {pm})"
+    return f"""CASE WHEN appointment_date IS NULL OR instr(COALESCE(appointment_time, ''), ':') = 0 THEN NULL
+        ELSE appointment_date || ' ' || printf('%02d:%02d',
+            CASE WHEN {twelve_hour} THEN {hour} % 12 + {pm} * 12 ELSE {hour} END, {minute}) END"""
+
+SCHEMA = [
+    f"ALTER TABLE appointments ADD COLUMN starts_at TEXT GENERATED ALWAYS AS ({_starts_at_sql()}) VIRTUAL",
+    "CREATE INDEX IF NOT EXISTS idx_appointments_doctor_start ON appointments(doctor_id, status, starts_at)",
+]
+
+CONFLICT_SQL = """
+    SELECT appointment_id, starts_at FROM appointments
+    WHERE doctor_id = ? AND status = 'Scheduled' AND starts_at > ? AND starts_at < ?
+    LIMIT 1
+"""
+
+# upcoming appointments by idx_appointments_status_date; starts_at is computed per row
+UPCOMING_SQL = """
+    SELECT appointment_id, doctor_id, starts_at FROM appointments
+    WHERE status = 'Scheduled' AND appointment_date >= ? AND starts_at IS NOT NULL
+"""
+
+def _text(moment):
+    return moment.strftime(STARTS_AT_FORMAT)
+
+def book(conn, patient_id, doctor_id, start, reason=None):
+    """Insert a Scheduled appointment at start (a datetime); return its id.
+
+    Raises ValueError, with nothing written, when the doctor already has a
+    Scheduled appointment less than SLOT_MINUTES away.
+    """
+    window = timedelta(minutes=SLOT_MINUTES)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        clash = conn.execute(CONFLICT_SQL, (doctor_id, _text(start - window), _text(start + window))).fetchone()
+        if clash:
+            raise ValueError(f"the doctor already has appointment #{clash[0]} at {clash[1]}")
+        appointment_id = conn.execute(
+            """INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, status, reason)
+               VALUES (?, ?, ?, ?, 'Scheduled', ?)""",
+            (patient_id, doctor_id, start.strftime('%Y-%m-%d'), start.strftime('%I:%M %p'), reason)).lastrowid
+        conn.commit()
+        return appointment_id
+    except Exception:
+        conn.rollback()
+        raise
+
+def _first_slot(after):
+    """The first slot boundary at or after the datetime after."""
+    minutes = after.hour * 60 + after.minute + (after.second > 0 or after.microsecond > 0)
+    minutes = -(-minutes // SLOT_MINUTES) * SLOT_MINUTES
+    return datetime.combine(after.date(), datetime.min.time()) + timedelta(minutes=minutes)
+
+def _slots(after):
+    """Every slot from after onwards within working hours, for MAX_DAYS_AHEAD days."""
+    slot = _first_slot(after)
+    last_day = after.date() + timedelta(days=MAX_DAYS_AHEAD)
+    step = timedelta(minutes=SLOT_MINUTES)
+    while slot.date() < last_day:
+        if slot.hour < DAY_START:
+            slot = slot.replace(hour=DAY_START, minute=0)
+        elif slot.hour >= DAY_END:
+            slot = datetime.combine(slot.date() + timedelta(days=1), datetime.min.time()).replace(hour=DAY_START)
+        else:
+            yield slot
+            slot += step
+
+class ScheduleIndex:
+    """Upcoming Scheduled starts per doctor, as sorted lists of datetimes, synced from the change log."""
+
+    def __init__(self):
+        self.seq = None
+        self.day = None
+        self.loads = 0
+        self._starts = {}        # doctor_id -> sorted [datetime]
+        self._appointments = {}  # appointment_id -> (doctor_id, datetime)
+        self._lock = threading.Lock()
+
+    def _put(self, appointment_id, row):
+        old = self._appointments.pop(appointment_id, None)
+        if old is not None:
+            starts = self._starts[old[0]]
+            del starts[bisect_right(starts, old[1]) - 1]
+        if row is not None:
+            doctor_id, starts_at = row
+            try:
+                start = datetime.strptime(starts_at, STARTS_AT_FORMAT)
+            except ValueError:
+                return  # an out-of-range time such as '25:00', written by an import or a legacy row
+            if start.date() >= self.day:
+                self._appointments[appointment_id] = (doctor_id, start)
+                insort(self._starts.setdefault(doctor_id, []), start)
+
+    def _load(self, conn):
+        self._starts, self._appointments = {}, {}
+        for appointment_id, *row in conn.execute(UPCOMING_SQL, (self.day.isoformat(),)):
+            self._put(appointment_id, row)
+        self.loads += 1
+
+    def _apply(self, conn, ids):
+        rows = {appointment_id: row for appointment_id, *row in conn.execute(
+            f"{UPCOMING_SQL} AND appointment_id IN ({', '.join('?' * len(ids))})", (self.day.isoformat(), *ids))}
+        for appointment_id in ids:
+            self._put(appointment_id, rows.get(appointment_id))
+
+    def sync(self, conn):
+        """Apply appointment changes committed since the last sync; reload once a day to drop past ones."""
+        with self._lock:
+            if self.day != date.today():
+                self.day, self.seq = date.today(), None
+            conn.execute("BEGIN")
+            try:
+                self.seq = catch_up(conn, 'appointments', self.seq, lambda: self._load(conn),
+                                    lambda ids: self._apply(conn, ids))
+            finally:
+                conn.rollback()
+
+    def _free(self, doctor_id, after):
+        starts = self._starts.get(doctor_id, [])
+        window = timedelta(minutes=SLOT_MINUTES)
+        for slot in _slots(after):
+            i = bisect_right(starts, slot - window)
+            if i == len(starts) or starts[i] >= slot + window:
+                yield slot, doctor_id
+
+    def free_slots(self, doctor_ids, count=10, after=None):
+        """The first count free [(start, doctor_id)] across doctor_ids, earliest first."""
+        after = after or datetime.now()
+        with self._lock:
+            merged = heapq.merge(*(self._free(doctor_id, after) for doctor_id in doctor_ids))
+            return [slot for slot, _ in zip(merged, range(count))]
+
+    def booked(self, doctor_id):
+        """Upcoming Scheduled starts of doctor_id."""
+        with self._lock:
+            return list(self._starts.get(doctor_id, ()))
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def schedule_index(conn, db_name):
+    """The process-wide ScheduleIndex for db_name, synced through conn."""
+    with _indexes_lock:
+        index = _indexes.setdefault(db_name, ScheduleIndex())
+    index.sync(conn)
+    return index
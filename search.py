@@ -0,0 +1,90 @@
+# Ranked patient search over the patients_fts index (migration 3)
+import re
+
+TOKEN = re.compile(r'\w+', re.UNICODE)
+MIN_TOKEN_LENGTH = 2
+MIN_FUZZY_LENGTH = 4
+RANK_LIMIT = 500
+
+# bm25 has to score every matching row, so ranking is only used when the match
+# set is small enough; broad prefixes ("kh", "ali") list the newest patients first.
+RANKED_SQL = """
+    SELECT p.*
+    FROM patients_fts f
+    JOIN patients p ON p.patient_id = f.rowid
+    WHERE patients_fts MATCH ?
+    ORDER BY f.rank
+    LIMIT ?
+"""
+
+NEWEST_SQL = """
+    SELECT p.*
+    FROM patients_fts f
+    JOIN patients p ON p.patient_id = f.rowid
+    WHERE patients_fts MATCH ?
+    ORDER BY f.rowid DESC
+    LIMIT ?
+"""
+
+COUNT_SQL = f"SELECT COUNT(*) FROM (SELECT 1 FROM patients_fts WHERE patients_fts MATCH ? LIMIT {RANK_LIMIT + 1})"
+
+def within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion, substitution or transposition."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:]
+    if len(a) > len(b):
+        return a[i + 1:] == b[i:]
+    return a[i:] == b[i + 1:]
+
+def similar_terms(conn, token):
+    """Index terms one edit away from token, read from the fts5vocab table.
+
+    Only terms sharing the first letter are considered, which keeps the vocab
+    read to a single term range.
+    """
+    first = token[0]
+    rows = conn.execute(
+        "SELECT term FROM patients_fts_vocab WHERE term >= ? AND term < ?",
+        (first, chr(ord(first) + 1)),
+    )
+    return [term for (term,) in rows if within_one_edit(token, term)]
+
+def build_match(tokens, alternatives=None):
+    """FTS5 MATCH expression: every token must match, as a prefix or a listed alternative."""
+    groups = []
+    for token in tokens:
+        options = [f'"{token}"*']
+        options += [f'"{term}"' for term in (alternatives or {}).get(token, ()) if term != token]
+        groups.append(options[0] if len(options) == 1 else '(' + ' OR '.join(options) + ')')
+    return ' AND '.join(groups)
+
+def search_patients(conn, text, limit=50):
+    """Return (column_names, rows) for the best matches of text, best first.
+
+    Tokens of MIN_TOKEN_LENGTH or more characters are matched as prefixes, so results update as the user types. If that
+    finds nothing, tokens of MIN_FUZZY_LENGTH or more characters are widened to
+    index terms one typo away. Match sets larger than RANK_LIMIT come back
+    newest first instead of by relevance.
+    """
+    tokens = [t.lower() for t in TOKEN.findall(text) if len(t) >= MIN_TOKEN_LENGTH]
+    if not tokens:
+        return [], []
+    match = build_match(tokens)
+    hits = conn.execute(COUNT_SQL, (match,)).fetchone()[0]
+    if not hits:
+        alternatives = {t: similar_terms(conn, t) for t in tokens
+                        if len(t) >= MIN_FUZZY_LENGTH and not t.isdigit()}
+        if any(alternatives.values()):
+            match = build_match(tokens, alternatives)
+            hits = conn.execute(COUNT_SQL, (match,)).fetchone()[0]
+    cursor = conn.execute(RANKED_SQL if hits <= RANK_LIMIT else NEWEST_SQL, (match, limit))
+    return [d[0] for d in cursor.description], cursor.fetchall()
@@ -0,0 +1,112 @@
+# Inventory stock ledger: every movement recorded, current stock read from one row
+#
+# stock_movements is append-only: one row per receipt, issue or adjustment,
+# with the signed change and the item's balance after it. inventory.quantity
+# is the running balance, moved in the same statement that checks it cannot
+# go negative, so reading current stock stays a primary-key lookup and
+# SUM(change) over an item's movements always equals its quantity.
+#
+# Items below their own reorder_level are in the partial index
+# idx_inventory_low, which holds only those rows; the low_stock view and the
+# assistant's stock answers read it instead of scanning inventory.
+from datetime import datetime
+
+DEFAULT_REORDER_LEVEL = 100  # the fixed threshold the low-stock warning used before
+
+KINDS = ('opening', 'receive', 'issue', 'adjust', 'dispense')
+
+# opening balance for items that have stock but no movements yet
+OPENING_SQL = """
+    INSERT INTO stock_movements (item_id, change, balance, kind, moved_at)
+    SELECT i.item_id, i.quantity, i.quantity, 'opening', COALESCE(i.last_updated, date('now'))
+    FROM inventory i
+    WHERE COALESCE(i.quantity, 0) != 0
+      AND NOT EXISTS (SELECT 1 FROM stock_movements m WHERE m.item_id = i.item_id)
+"""
+
+SCHEMA = [
+    f"ALTER TABLE inventory ADD COLUMN reorder_level INTEGER NOT NULL DEFAULT {DEFAULT_REORDER_LEVEL}",
+    """CREATE TABLE IF NOT EXISTS stock_movements (
+        movement_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        item_id INTEGER NOT NULL,
+        change INTEGER NOT NULL,
+        balance INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        reference TEXT,
+        moved_at DATETIME NOT NULL DEFAULT (datetime('now')),
+        FOREIGN KEY (item_id) REFERENCES inventory(item_id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_stock_movements_item ON stock_movements(item_id, movement_id)",
+    "CREATE INDEX IF NOT EXISTS idx_inventory_low ON inventory(quantity) WHERE quantity < reorder_level",
+    """CREATE VIEW IF NOT EXISTS low_stock AS
+        SELECT item_id, item_name, quantity, reorder_level, reorder_level - quantity AS shortfall
+        FROM inventory WHERE quantity < reorder_level""",
+    # items added by the form or an import start with an opening movement
+    """CREATE TRIGGER IF NOT EXISTS inventory_opening AFTER INSERT ON inventory
+        WHEN COALESCE(new.quantity, 0) != 0 BEGIN
+        INSERT INTO stock_movements (item_id, change, balance, kind, moved_at)
+        VALUES (new.item_id, new.quantity, new.quantity, 'opening', COALESCE(new.last_updated, date('now')));
+    END""",
+    OPENING_SQL,
+]
+
+MOVE_SQL = """
+    UPDATE inventory SET quantity = COALESCE(quantity, 0) + :change, last_updated = :day
+    WHERE item_id = :item AND COALESCE(quantity, 0) + :change >= 0
+    RETURNING quantity
+"""
+
+LOW_STOCK_SQL = "SELECT item_name, quantity, reorder_level, shortfall FROM low_stock ORDER BY quantity"
+
+def _move(conn, item_id, change, kind, reference, day):
+    row = conn.execute(MOVE_SQL, {'change': change, 'item': item_id, 'day': day}).fetchone()
+    if row is None:
+        have = conn.execute("SELECT item_name, quantity FROM inventory WHERE item_id = ?", (item_id,)).fetchone()
+        if have is None:
+            raise ValueError(f"no inventory item #{item_id}")
+        raise ValueError(f"{have[0]}: only {have[1] or 0} in stock, {-change} needed")
+    conn.execute("INSERT INTO stock_movements (item_id, change, balance, kind, reference) VALUES (?, ?, ?, ?, ?)",
+                 (item_id, change, row[0], kind, reference))
+    return row[0]
+
+def move_many(conn, movements, kind, reference=None, in_transaction=False):
+    """Apply [(item_id, change)] all or nothing; return {item_id: new balance}.
+
+    A change is positive for stock in and negative for stock out; an entry
+    may carry its own reference as a third element. If any item would go
+    below zero, nothing is applied and the ValueError names every
+    shortfall. With in_transaction the caller owns BEGIN/COMMIT.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"unknown movement kind {kind!r}; expected one of {', '.join(KINDS)}")
+    day = datetime.now().strftime('%Y-%m-%d')
+    if not in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        balances, problems = {}, []
+        for item_id, change, *note in movements:
+            if not change:
+                continue
+            try:
+                balances[item_id] = _move(conn, item_id, change, kind, note[0] if note else reference, day)
+            except ValueError as e:
+                problems.append(str(e))
+        if problems:
+            raise ValueError("; ".join(problems))
+        if not in_transaction:
+            conn.commit()
+        return balances
+    except Exception:
+        if not in_transaction:
+            conn.rollback()
+        raise
+
+def receive(conn, item_id, quantity, reference=None):
+    return move_many(conn, [(item_id, quantity)], 'receive', reference)[item_id]
+
+def issue(conn, item_id, quantity, reference=None):
+    return move_many(conn, [(item_id, -quantity)], 'issue', reference)[item_id]
+
+def set_reorder_level(conn, item_id, level):
+    with conn:
+        conn.execute("UPDATE inventory SET reorder_level = ? WHERE item_id = ?", (level, item_id))
@@ -0,0 +1,28 @@
+# Page registry: sidebar label -> module in this package with a render() function.
+# A page module, and whatever it imports (plotly, pandas, ...), is loaded the
+# first time that page is shown rather than at app startup.
+from importlib import import_module
+
+PAGES = {
+    "🏠 Dashboard": 'dashboard',
+    "🤖 AI Assistant": 'ai_chat',
+    "👥 Patient Management": 'patients',
+    "👨⚕️ Doctor Management": 'doctors',
+    "📅 Appointments": 'appointments',
+    "📊 Analytics & Reports": 'analytics',
+    "📋 Medical Records": 'medical_records',
+    "💰 Billing & Finance": 'billing',
+    "👷 Staff Management": 'staff',
+    "📦 Inventory Control": 'inventory',
+    "🛏️ Bed Management": 'beds',
+    "🔬 Laboratory": 'laboratory',
+    "💊 Pharmacy": 'pharmacy',
+    "🚑 Emergency Services": 'emergency',
+    "🩸 Blood Bank": 'blood_bank',
+    "📊 Live Monitoring": 'live_monitoring',
+    "🔐 Security Center": 'security',
+    "📱 Mobile App": 'mobile',
+}
+
+def render_page(label):
+    import_module(f"{__name__}.{PAGES[label]}").render()
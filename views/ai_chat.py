@@ -0,0 +1,31 @@
+# AI Assistant page
+import streamlit as st
+
+from assistant import ai_query
+
+def render():
+    st.header("🤖 AI Chat Assistant")
+    st.info("💡 Ask: 'How many patients?', 'Top doctor in cardiology?', 'Show cardiology patients', 'Completed appointments last 30 days', 'Revenue this month?', 'Available beds?', 'Pending bills?', 'Low stock items?'")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if st.button("👥 Patients"):
+            st.session_state['ai_response'] = ai_query("How many patients?")
+    with col2:
+        if st.button("💰 Revenue"):
+            st.session_state['ai_response'] = ai_query("Total revenue")
+    with col3:
+        if st.button("💵 Pending Bills"):
+            st.session_state['ai_response'] = ai_query("Pending bills")
+    with col4:
+        if st.button("📦 Low Stock"):
+            st.session_state['ai_response'] = ai_query("Low stock items")
+    
+    if 'ai_response' in st.session_state:
+        st.success(st.session_state['ai_response'])
+    
+    query = st.text_input("💬 Your question:")
+    if st.button("Ask") and query:
+        with st.spinner("Thinking..."):
+            response = ai_query(query)
+            st.success(response)
@@ -0,0 +1,35 @@
+# Analytics & Reports page
+import streamlit as st
+
+from cache import cached_df
+from rollups import REVENUE_BY_DOCTOR_SQL, DEPT_PERFORMANCE_SQL
+import charts
+
+def render():
+    st.header("📊 Advanced Analytics")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("💰 Revenue by Doctor")
+        chart = charts.bar(REVENUE_BY_DOCTOR_SQL, 'name', 'revenue', 'Revenue by Doctor')
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+    
+    with col2:
+        st.subheader("📈 Appointment Status")
+        chart = charts.pie("SELECT status, COUNT(*) as count FROM appointments GROUP BY status",
+                           'status', 'count', 'Appointment Status Distribution')
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+    
+    st.subheader("📅 Appointments over Time")
+    # per day and department from the rollup; appointments without a date are kept under day ''
+    chart = charts.time_series('dept_daily_stats', 'day', 'Appointments per Period', y='appointments',
+                               where=("day > ''",), value="SUM(appointments)")
+    if chart:
+        st.plotly_chart(chart, use_container_width=True)
+    
+    st.subheader("🏥 Department Performance")
+    dept_perf = cached_df(DEPT_PERFORMANCE_SQL)
+    st.dataframe(dept_perf, use_container_width=True)
@@ -0,0 +1,75 @@
+# Appointments page
+from datetime import datetime
+
+import streamlit as st
+
+from pool import get_conn
+from paging import paged_table
+from cache import bump, cached
+from db import DB_NAME
+from lookups import entity_picker, labels
+from scheduler import schedule_index, book
+from importer import import_panel
+from exporter import export_panel
+
+FREE_SLOTS_SHOWN = 20
+
+DEPT_DOCTORS_SQL = "SELECT doctor_id FROM doctors WHERE dept_id = ?"
+
+def render():
+    st.header("📅 Appointment Management")
+    
+    tab1, tab2, tab3 = st.tabs(["📋 View Appointments", "➕ Book Appointment", "📥 Bulk Import"])
+    
+    with tab1:
+        status_filter = st.selectbox("Filter by Status:", ["All", "Scheduled", "Completed", "Cancelled"])
+        where, params = [], []
+        if status_filter != "All":
+            where, params = ["a.status = ?"], [status_filter]
+        paged_table("appointments_view",
+                    """a.appointment_id, p.name as Patient, d.name as Doctor,
+                       a.appointment_date, a.appointment_time, a.status, a.reason""",
+                    """appointments a
+                       JOIN patients p ON a.patient_id = p.patient_id
+                       JOIN doctors d ON a.doctor_id = d.doctor_id""",
+                    "a.appointment_id",
+                    {"Date": "a.appointment_date", "Appointment ID": "a.appointment_id"},
+                    where, params)
+        with st.expander("📤 Export"):
+            export_panel('appointments', status_filter)
+    
+    with tab2:
+        patient = entity_picker("Patient*", 'patients', "appointment_patient")
+        by = st.radio("Book with", ["A doctor", "Anyone in a department"], horizontal=True, key="appointment_by")
+        if by == "A doctor":
+            doctor_ids = [entity_picker("Doctor*", 'doctors', "appointment_doctor")]
+        else:
+            departments = labels('departments')
+            dept = st.selectbox("Department*", list(departments), format_func=departments.get, key="appointment_dept")
+            doctor_ids = [row[0] for row in cached(DEPT_DOCTORS_SQL, lambda: get_conn().execute(
+                DEPT_DOCTORS_SQL, (dept,)).fetchall(), (dept,))]
+        doctor_ids = [doctor_id for doctor_id in doctor_ids if doctor_id is not None]
+        start = st.date_input("From", datetime.now(), key="appointment_from")
+        after = max(datetime.now(), datetime.combine(start, datetime.min.time()))
+        slots = schedule_index(get_conn(), DB_NAME).free_slots(doctor_ids, FREE_SLOTS_SHOWN, after)
+        doctors = labels('doctors')
+
+        with st.form("book_appointment"):
+            slot = st.selectbox("Free slot*", slots, format_func=lambda s: f"{s[0]:%a %d %b %I:%M %p} - {doctors.get(s[1], s[1])}")
+            reason = st.text_area("Reason")
+            
+            if st.form_submit_button("Book Appointment"):
+                if patient is None or slot is None:
+                    st.error("Pick a patient and a free slot!")
+                else:
+                    try:
+                        book(get_conn(), patient, slot[1], slot[0], reason)
+                    except ValueError as e:
+                        st.error(f"❌ {e}; pick another slot")
+                    else:
+                        bump('appointments')
+                        st.success("✅ Appointment booked!")
+                        st.rerun()
+    
+    with tab3:
+        import_panel('appointments')
@@ -0,0 +1,115 @@
+# Bed Management page
+import re
+
+import streamlit as st
+
+from pool import get_conn
+from paging import paged_table
+from cache import bump
+from db import DB_NAME
+from lookups import entity_picker
+from allocation import WARD_TYPES, admit, admit_many, bed_index, discharge_many
+
+def render():
+    st.header("🛏️ Bed Management")
+
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 View Beds", "➕ Add Bed", "🔄 Update Status", "🚨 Batch Admit"])
+    index = bed_index(get_conn(), DB_NAME)
+    counts = index.counts()
+
+    with tab1:
+        available = sum(free for free, _ in counts.values())
+        total = sum(total for _, total in counts.values())
+        col1, col2, col3 = st.columns(3)
+        col1.metric("✅ Available", available)
+        col2.metric("🛌 Occupied", total - available)
+        col3.metric("📊 Occupancy Rate", f"{((total - available)/total*100):.1f}%" if total > 0 else "0%")
+        if counts:
+            st.dataframe({"Ward": [str(ward) for ward in counts],
+                          "Available": [free for free, _ in counts.values()],
+                          "Total": [total for _, total in counts.values()]},
+                         use_container_width=True, hide_index=True)
+
+        col1, col2 = st.columns(2)
+        ward_filter = col1.selectbox("Ward", ["All", *WARD_TYPES], key="beds_ward")
+        status_filter = col2.selectbox("Status", ["All", "Available", "Occupied"], key="beds_status")
+        where, params = [], []
+        if ward_filter != "All":
+            where.append("b.ward_type = ?")
+            params.append(ward_filter)
+        if status_filter != "All":
+            where.append("b.status = ?")
+            params.append(status_filter)
+        paged_table("beds_view",
+                    "b.bed_id, b.bed_number, b.ward_type, b.status, p.name as patient_name, b.admission_date",
+                    "beds b LEFT JOIN patients p ON b.patient_id = p.patient_id",
+                    "b.bed_id",
+                    {"Bed Number": "b.bed_number", "Bed ID": "b.bed_id"},
+                    where, params, default_desc=False)
+
+    with tab2:
+        with st.form("add_bed"):
+            bed_number = st.text_input("Bed Number*")
+            ward_type = st.selectbox("Ward Type", WARD_TYPES)
+
+            if st.form_submit_button("Add Bed"):
+                if bed_number:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    c.execute("INSERT INTO beds (bed_number, ward_type, status, patient_id, admission_date) VALUES (?, ?, ?, ?, ?)",
+                             (bed_number, ward_type, 'Available', None, None))
+                    conn.commit()
+                    bump('beds')
+                    st.success(f"✅ Bed {bed_number} added!")
+                    st.rerun()
+                else:
+                    st.error("Bed number is required!")
+
+    with tab3:
+        action = st.radio("Action", ["Admit Patient", "Discharge Patient"])
+
+        if action == "Admit Patient":
+            patient = entity_picker("Patient", 'patients', "admit_patient")
+            ward = st.selectbox("Ward", WARD_TYPES, key="admit_ward",
+                                format_func=lambda w: f"{w} ({counts.get(w, (0, 0))[0]} free)")
+            free = index.available(ward)
+            bed_id = st.selectbox("Bed", [None, *free], key="admit_bed",
+                                  format_func=lambda b: "First available" if b is None else free[b])
+            if st.button("🛌 Admit", disabled=patient is None or not free):
+                try:
+                    _, bed_number = admit(get_conn(), patient, ward, bed_id)
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                else:
+                    bump('beds')
+                    st.success(f"✅ Patient admitted to bed {bed_number}!")
+                    st.rerun()
+        else:
+            occupied = index.occupied()
+            if occupied:
+                bed_ids = st.multiselect("Beds to discharge", list(occupied), key="discharge_beds",
+                                         format_func=lambda b: f"{occupied[b][0]} - {occupied[b][1]} (patient #{occupied[b][2]})")
+                if st.button("🚪 Discharge", disabled=not bed_ids):
+                    freed = discharge_many(get_conn(), bed_ids)
+                    bump('beds')
+                    st.success(f"✅ {len(freed)} patient(s) discharged!")
+                    st.rerun()
+            else:
+                st.info("No beds are occupied")
+
+    with tab4:
+        st.caption("Place many patients at once, e.g. during a surge: each gets the first free bed of the ward.")
+        ward = st.selectbox("Ward", WARD_TYPES, key="batch_ward",
+                            format_func=lambda w: f"{w} ({counts.get(w, (0, 0))[0]} free)")
+        text = st.text_area("Patient IDs (comma or newline separated)", key="batch_patients")
+        patient_ids = [int(token) for token in re.findall(r'\d+', text)]
+        if st.button("🚨 Admit All", disabled=not patient_ids):
+            results = admit_many(get_conn(), [(patient_id, ward) for patient_id in patient_ids])
+            placed = [row for row in results if row[1] is not None]
+            if placed:
+                bump('beds')
+            st.success(f"✅ {len(placed)} of {len(results)} patient(s) admitted")
+            st.dataframe({"Patient": [row[0] for row in results],
+                          "Bed": [row[2] if row[1] is not None else "" for row in results],
+                          "Problem": ["" if row[1] is not None else row[2] for row in results]},
+                         use_container_width=True, hide_index=True)
@@ -0,0 +1,83 @@
+# Billing & Finance page
+import streamlit as st
+
+from pool import get_conn
+from paging import paged_table
+from cache import bump, cached
+from lookups import entity_picker
+from exporter import export_panel
+from invoicing import billing_run_panel
+from payments import payment_panel
+
+# summary metrics from the billing_totals rollup (see rollups.py), one row per status
+BILL_TOTALS_SQL = """
+    SELECT COALESCE(SUM(bills), 0), TOTAL(amount),
+           TOTAL(CASE WHEN payment_status = 'Paid' THEN amount END),
+           TOTAL(CASE WHEN payment_status = 'Pending' THEN amount END)
+    FROM billing_totals
+"""
+
+def render():
+    st.header("💰 Billing Management")
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 View Bills", "➕ Create Bill", "💳 Payment", "⚙️ Billing Run"])
+    
+    with tab1:
+        status_filter = st.selectbox("Filter:", ["All", "Paid", "Pending"])
+        where, params = [], []
+        if status_filter != "All":
+            where, params = ["b.payment_status = ?"], [status_filter]
+        paged_table("bills_view",
+                    """b.bill_id, p.name as Patient, a.appointment_date,
+                       b.amount, b.payment_status, b.payment_date""",
+                    """billing b
+                       JOIN patients p ON b.patient_id = p.patient_id
+                       LEFT JOIN appointments a ON b.appointment_id = a.appointment_id""",
+                    "b.bill_id",
+                    {"Bill ID": "b.bill_id", "Amount": "b.amount"},
+                    where, params)
+        with st.expander("📤 Export"):
+            export_panel('billing', status_filter)
+        
+        totals_sql = BILL_TOTALS_SQL + (" WHERE payment_status = ?" if status_filter != "All" else "")
+        count, total, paid, pending = cached(totals_sql, lambda: get_conn().execute(totals_sql, params).fetchone(),
+                                             params)
+
+        if count:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("💵 Total", f"Rs. {total:,.0f}")
+            col2.metric("✅ Paid", f"Rs. {paid:,.0f}")
+            col3.metric("⏳ Pending", f"Rs. {pending:,.0f}")
+    
+    with tab2:
+        patient = entity_picker("Patient*", 'patients', "bill_patient")
+        
+        with st.form("create_bill"):
+            conn = get_conn()
+            appointments = dict(conn.execute(
+                """SELECT appointment_id, appointment_date FROM appointments a
+                   WHERE patient_id = ? AND NOT EXISTS (SELECT 1 FROM billing b WHERE b.appointment_id = a.appointment_id)
+                   ORDER BY appointment_date DESC""",
+                (patient,)).fetchall())
+            appointment = st.selectbox("Appointment", list(appointments),
+                                      format_func=lambda x: f"ID: {x} - {appointments[x]}")
+            amount = st.number_input("Amount (Rs.)*", 0, 100000, 1000)
+            
+            if st.form_submit_button("Create Bill"):
+                if patient is None:
+                    st.error("Pick a patient!")
+                else:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    c.execute("INSERT INTO billing (patient_id, appointment_id, amount, payment_status, payment_date) VALUES (?, ?, ?, ?, ?)",
+                             (patient, appointment, amount, 'Pending', None))
+                    conn.commit()
+                    bump('billing')
+                    st.success("✅ Bill created!")
+                    st.rerun()
+    
+    with tab3:
+        payment_panel()
+    
+    with tab4:
+        billing_run_panel()
@@ -0,0 +1,50 @@
+# Blood Bank page
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from pool import get_conn
+from paging import paged_table
+from cache import bump, cached_df
+from db import BLOOD_STOCK_SQL
+import charts
+
+def render():
+    st.header("🩸 Blood Bank Management")
+    
+    tab1, tab2 = st.tabs(["📊 View Stock", "➕ Add Donation"])
+    
+    with tab1:
+        paged_table("blood_bank_view", "*", "blood_bank", "blood_id",
+                    {"Blood Group": "blood_group", "Blood ID": "blood_id"}, default_desc=False)
+        
+        st.subheader("📊 Blood Group Availability")
+        chart = charts.bar(BLOOD_STOCK_SQL, 'blood_group', 'units', 'Blood Units by Group')
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+            
+            stock = cached_df(BLOOD_STOCK_SQL)
+            low_stock = stock[stock['Total Units'] < 10]['Blood Group'].tolist()
+            if low_stock:
+                st.warning(f"⚠️ Low stock alert for: {', '.join(low_stock)}")
+    
+    with tab2:
+        with st.form("add_donation"):
+            blood_group = st.selectbox("Blood Group*", ["A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-"])
+            units = st.number_input("Units", 1, 50, 1)
+            donor_name = st.text_input("Donor Name*")
+            
+            if st.form_submit_button("Add Donation"):
+                if donor_name:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    donation_date = datetime.now().strftime('%Y-%m-%d')
+                    expiry_date = (datetime.now() + timedelta(days=90)).strftime('%Y-%m-%d')
+                    c.execute("INSERT INTO blood_bank (blood_group, units, donor_name, donation_date, expiry_date) VALUES (?, ?, ?, ?, ?)",
+                             (blood_group, units, donor_name, donation_date, expiry_date))
+                    conn.commit()
+                    bump('blood_bank')
+                    st.success(f"✅ {units} unit(s) of {blood_group} added!")
+                    st.rerun()
+                else:
+                    st.error("Donor name is required!")
@@ -0,0 +1,79 @@
+# Dashboard page
+import streamlit as st
+
+from db import (get_stats, DASHBOARD_ROWS, STATS_SQL, DEPT_APPOINTMENTS_SQL, PATIENT_AGES_SQL, BED_STATUS_SQL,
+                LAB_STATUS_SQL, AMBULANCE_FLEET_SQL, BLOOD_STOCK_SQL, RECENT_APPOINTMENTS_SQL)
+from pool import get_conn
+from cache import cached, cached_df
+from profiler import section
+import charts
+
+def render():
+    st.header("📊 Dashboard")
+    with section("KPIs"):
+        stats = cached(STATS_SQL, lambda: get_stats(get_conn()))
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("👥 Patients", stats['patients'])
+        col2.metric("👨⚕️ Doctors", stats['doctors'])
+        col3.metric("📅 Appointments", stats['appointments'])
+        col4.metric("⏳ Pending", stats['pending'])
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("👷 Staff", stats['staff'])
+        col2.metric("💰 Revenue", f"Rs. {stats['revenue']:,.0f}")
+        col3.metric("📋 Pending Bills", stats['pending_bills'])
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("🛏️ Available Beds", stats['available_beds'])
+        col2.metric("🛌 Occupied Beds", stats['occupied_beds'])
+        col3.metric("🔬 Pending Tests", stats['pending_tests'])
+        col4.metric("🚑 Ambulances", stats['ambulance_available'])
+    
+    st.divider()
+    
+    col1, col2 = st.columns(2)
+    with col1, section("Appointments chart"):
+        chart = charts.bar(DEPT_APPOINTMENTS_SQL, 'dept_name', 'count', 'Appointments by Department')
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+    
+    with col2, section("Age chart"):
+        chart = charts.bar(PATIENT_AGES_SQL, 'age_group', 'patients', 'Patient Age Distribution', color=False)
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+    
+    st.subheader("🏥 Hospital Overview")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1, section("Bed status"):
+        st.markdown("### 🛏️ Bed Status")
+        beds = cached_df(BED_STATUS_SQL, (DASHBOARD_ROWS,))
+        st.dataframe(beds, use_container_width=True)
+    
+    with col2, section("Lab status"):
+        st.markdown("### 🔬 Lab Tests Status")
+        lab_tests = cached_df(LAB_STATUS_SQL, (DASHBOARD_ROWS,))
+        st.dataframe(lab_tests, use_container_width=True)
+    
+    st.divider()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1, section("Ambulance fleet"):
+        st.markdown("### 🚑 Ambulance Fleet")
+        ambulances = cached_df(AMBULANCE_FLEET_SQL)
+        st.dataframe(ambulances, use_container_width=True)
+    
+    with col2, section("Blood stock"):
+        st.markdown("### 🩸 Blood Bank Stock")
+        blood = cached_df(BLOOD_STOCK_SQL)
+        st.dataframe(blood, use_container_width=True)
+    
+    st.divider()
+    
+    with section("Recent appointments"):
+        st.subheader("🕒 Recent Appointments")
+        recent = cached_df(RECENT_APPOINTMENTS_SQL)
+        st.dataframe(recent, use_container_width=True)
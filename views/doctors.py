@@ -0,0 +1,46 @@
+# Doctor Management page
+import streamlit as st
+import pandas as pd
+
+from pool import get_conn
+from cache import bump
+from lookups import labels
+
+def render():
+    st.header("👨⚕️ Doctor Management")
+    
+    tab1, tab2 = st.tabs(["📋 View Doctors", "➕ Add Doctor"])
+    
+    with tab1:
+        conn = get_conn()
+        doctors = pd.read_sql("""
+            SELECT d.doctor_id, d.name, d.specialization, dept.dept_name, d.phone, 
+                   d.email, d.experience, d.consultation_fee
+            FROM doctors d
+            LEFT JOIN departments dept ON d.dept_id = dept.dept_id
+        """, conn)
+        st.dataframe(doctors, use_container_width=True)
+    
+    with tab2:
+        with st.form("add_doctor"):
+            name = st.text_input("Name*")
+            spec = st.text_input("Specialization*")
+            depts = labels('departments')
+            dept = st.selectbox("Department", list(depts), format_func=depts.get)
+            phone = st.text_input("Phone")
+            email = st.text_input("Email")
+            exp = st.number_input("Experience (years)", 0, 50, 5)
+            fee = st.number_input("Consultation Fee (Rs.)", 0, 10000, 1500)
+            
+            if st.form_submit_button("Add Doctor"):
+                if name and spec:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    c.execute("INSERT INTO doctors (name, specialization, dept_id, phone, email, experience, consultation_fee) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (name, spec, dept, phone, email, exp, fee))
+                    conn.commit()
+                    bump('doctors')
+                    st.success(f"✅ Doctor {name} added!")
+                    st.rerun()
+                else:
+                    st.error("Name and Specialization required!")
@@ -0,0 +1,76 @@
+# Emergency Services page
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+
+from pool import get_conn
+from cache import bump
+from lookups import labels, entity_picker
+
+def render():
+    st.header("🚑 Ambulance Service")
+    
+    tab1, tab2, tab3 = st.tabs(["📊 View Ambulances", "➕ Add Ambulance", "📞 Request Service"])
+    
+    with tab1:
+        conn = get_conn()
+        ambulances = pd.read_sql("""
+            SELECT a.ambulance_id, a.vehicle_number, a.driver_name, a.status,
+                   p.name as patient_name, a.pickup_location, a.destination, a.request_time
+            FROM ambulance a
+            LEFT JOIN patients p ON a.patient_id = p.patient_id
+        """, conn)
+        st.dataframe(ambulances, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        available = len(ambulances[ambulances['status']=='Available'])
+        on_duty = len(ambulances[ambulances['status']=='On Duty'])
+        col1.metric("✅ Available", available)
+        col2.metric("🚑 On Duty", on_duty)
+    
+    with tab2:
+        with st.form("add_ambulance"):
+            vehicle_number = st.text_input("Vehicle Number*")
+            driver_name = st.text_input("Driver Name*")
+            
+            if st.form_submit_button("Add Ambulance"):
+                if vehicle_number and driver_name:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    c.execute("INSERT INTO ambulance (vehicle_number, driver_name, status, patient_id, pickup_location, destination, request_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (vehicle_number, driver_name, 'Available', None, None, None, None))
+                    conn.commit()
+                    bump('ambulance')
+                    st.success(f"✅ Ambulance {vehicle_number} added!")
+                    st.rerun()
+                else:
+                    st.error("All fields are required!")
+    
+    with tab3:
+        available_amb = labels('available_ambulances')
+        
+        if available_amb:
+            patient = entity_picker("Patient", 'patients', "ambulance_patient")
+            
+            with st.form("request_ambulance"):
+                ambulance = st.selectbox("Select Ambulance", list(available_amb), format_func=available_amb.get)
+                pickup = st.text_input("Pickup Location*")
+                destination = st.text_input("Destination*")
+                
+                if st.form_submit_button("📞 Request"):
+                    if patient is None:
+                        st.error("Pick a patient!")
+                    elif pickup and destination:
+                        conn = get_conn()
+                        c = conn.cursor()
+                        c.execute("UPDATE ambulance SET status='On Duty', patient_id=?, pickup_location=?, destination=?, request_time=? WHERE ambulance_id=?",
+                                 (patient, pickup, destination, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), ambulance))
+                        conn.commit()
+                        bump('ambulance')
+                        st.success("✅ Ambulance dispatched!")
+                        st.rerun()
+                    else:
+                        st.error("All fields are required!")
+        else:
+            st.warning("No ambulances available")
@@ -0,0 +1,118 @@
+# Inventory Control page
+import re
+from datetime import datetime
+
+import streamlit as st
+
+from pool import get_conn
+from paging import paged_table
+from cache import bump, cached_df
+from lookups import labels
+from importer import import_panel
+from exporter import export_panel
+from stock import LOW_STOCK_SQL, move_many, set_reorder_level
+
+LINE = re.compile(r'(\d+)\s*[,;\s]\s*(\d+)')
+
+def render():
+    st.header("📦 Inventory Management")
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 View Inventory", "➕ Add Item", "🔄 Update Stock",
+                                            "📋 Bulk Movement", "📥 Bulk Import"])
+
+    with tab1:
+        paged_table("inventory_view", "*", "inventory", "item_id",
+                    {"Item Name": "item_name", "Item ID": "item_id"}, default_desc=False)
+        with st.expander("📤 Export"):
+            export_panel('inventory')
+
+        low_stock = cached_df(LOW_STOCK_SQL)
+        if not low_stock.empty:
+            st.warning(f"⚠️ {len(low_stock)} items below their reorder level!")
+            st.dataframe(low_stock, use_container_width=True)
+
+    with tab2:
+        with st.form("add_item"):
+            item_name = st.text_input("Item Name*")
+            category = st.selectbox("Category", ["Medicine", "Equipment", "Supplies", "Surgical"])
+            quantity = st.number_input("Quantity", 0, 10000, 100)
+            unit_price = st.number_input("Unit Price (Rs.)", 0, 100000, 50)
+            reorder_level = st.number_input("Reorder Level", 0, 10000, 100)
+            supplier = st.text_input("Supplier")
+
+            if st.form_submit_button("Add Item"):
+                if item_name:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    c.execute("""INSERT INTO inventory (item_name, category, quantity, unit_price, supplier, last_updated, reorder_level)
+                                 VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                             (item_name, category, quantity, unit_price, supplier, datetime.now().strftime('%Y-%m-%d'),
+                              reorder_level))
+                    conn.commit()
+                    bump('inventory')
+                    st.success(f"✅ Item {item_name} added!")
+                    st.rerun()
+                else:
+                    st.error("Item name is required!")
+
+    with tab3:
+        items = labels('inventory')
+
+        if items:
+            item_id = st.selectbox("Select Item", list(items), format_func=items.get)
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                add_qty = st.number_input("Add Quantity", 0, 10000, 0)
+                if st.button("➕ Add Stock", disabled=not add_qty):
+                    _apply([(item_id, add_qty)], 'receive', "✅ Stock added!")
+
+            with col2:
+                remove_qty = st.number_input("Remove Quantity", 0, 10000, 0)
+                if st.button("➖ Remove Stock", disabled=not remove_qty):
+                    _apply([(item_id, -remove_qty)], 'issue', "✅ Stock removed!")
+
+            with col3:
+                level = get_conn().execute("SELECT reorder_level FROM inventory WHERE item_id = ?", (item_id,)).fetchone()
+                reorder_level = st.number_input("Reorder Level", 0, 100000, level[0] if level else 0,
+                                                key=f"reorder_level_{item_id}")
+                if st.button("💾 Save Level"):
+                    set_reorder_level(get_conn(), item_id, reorder_level)
+                    bump('inventory')
+                    st.success("✅ Reorder level saved!")
+                    st.rerun()
+
+            st.subheader("📜 Movement History")
+            paged_table("stock_history", "movement_id, moved_at, kind, change, balance, reference",
+                        "stock_movements", "movement_id", {"Movement": "movement_id"},
+                        ["item_id = ?"], [item_id])
+
+    with tab4:
+        st.caption("Receive a delivery or issue to the wards for many items at once: one `item_id, quantity` "
+                   "per line. Either every line is applied or, if any item would go below zero, none is.")
+        kind = st.radio("Movement", ["receive", "issue"], horizontal=True, key="bulk_kind",
+                        format_func=lambda k: "➕ Receive" if k == 'receive' else "➖ Issue")
+        reference = st.text_input("Reference (delivery note, ward...)", key="bulk_reference")
+        text = st.text_area("Items", key="bulk_items", placeholder="12, 500\n15, 40")
+        parsed = [(line, LINE.fullmatch(line.strip())) for line in text.splitlines() if line.strip()]
+        lines = [(int(m[1]), int(m[2])) for _, m in parsed if m]
+        unreadable = [line for line, m in parsed if not m]
+        if unreadable:
+            st.error(f"Expected `item_id, quantity` on every line; could not read: {', '.join(unreadable[:5])}")
+        if st.button("✅ Apply Movement", disabled=not lines or bool(unreadable)):
+            sign = 1 if kind == 'receive' else -1
+            _apply([(item, sign * qty) for item, qty in lines], kind,
+                   f"✅ {len(lines)} line(s) applied", reference or None)
+
+    with tab5:
+        import_panel('inventory')
+
+def _apply(movements, kind, message, reference=None):
+    try:
+        move_many(get_conn(), movements, kind, reference)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+    else:
+        bump('inventory')
+        st.success(message)
+        st.rerun()
@@ -0,0 +1,71 @@
+# Laboratory page
+from datetime import datetime
+
+import streamlit as st
+
+from pool import get_conn
+from paging import paged_table
+from cache import bump, cached_value
+from lookups import labels, entity_picker
+from exporter import export_panel
+
+LAB_REVENUE_SQL = "SELECT TOTAL(cost) FROM lab_tests WHERE status = 'Completed'"
+
+def render():
+    st.header("🔬 Laboratory Tests")
+    
+    tab1, tab2, tab3 = st.tabs(["📊 View Tests", "➕ Order Test", "📝 Update Results"])
+    
+    with tab1:
+        paged_table("tests_view",
+                    """l.test_id, p.name as patient_name, l.test_name, l.test_date,
+                       l.result, l.status, l.cost""",
+                    """lab_tests l
+                       JOIN patients p ON l.patient_id = p.patient_id""",
+                    "l.test_id",
+                    {"Test Date": "l.test_date", "Test ID": "l.test_id"})
+        with st.expander("📤 Export"):
+            export_panel('lab_tests')
+        
+        total_revenue = cached_value(LAB_REVENUE_SQL)
+        st.metric("💰 Lab Revenue", f"Rs. {total_revenue:,.0f}")
+    
+    with tab2:
+        patient = entity_picker("Patient*", 'patients', "test_patient")
+        
+        with st.form("order_test"):
+            test_name = st.selectbox("Test Type", ["Blood Test", "X-Ray", "MRI Scan", "CT Scan", "Ultrasound", "ECG", "Urine Test"])
+            cost = st.number_input("Cost (Rs.)", 0, 50000, 1500)
+            
+            if st.form_submit_button("Order Test"):
+                if patient is None:
+                    st.error("Pick a patient!")
+                else:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    c.execute("INSERT INTO lab_tests (patient_id, test_name, test_date, result, status, cost) VALUES (?, ?, ?, ?, ?, ?)",
+                             (patient, test_name, datetime.now().strftime('%Y-%m-%d'), None, 'Scheduled', cost))
+                    conn.commit()
+                    bump('lab_tests')
+                    st.success(f"✅ {test_name} ordered!")
+                    st.rerun()
+    
+    with tab3:
+        pending_tests = labels('pending_tests')
+        
+        if pending_tests:
+            test_id = st.selectbox("Select Test", list(pending_tests), format_func=pending_tests.get)
+            
+            result = st.text_area("Test Result")
+            status = st.selectbox("Status", ["In Progress", "Completed"])
+            
+            if st.button("📝 Update"):
+                conn = get_conn()
+                c = conn.cursor()
+                c.execute("UPDATE lab_tests SET result=?, status=? WHERE test_id=?", (result, status, test_id))
+                conn.commit()
+                bump('lab_tests')
+                st.success("✅ Test updated!")
+                st.rerun()
+        else:
+            st.info("No pending tests")
@@ -0,0 +1,120 @@
+# Live Monitoring page
+import streamlit as st
+
+from live import POLL_SECONDS, monitor
+
+REFRESH_SECONDS = 30
+
+CARD = """
+<div style="background: linear-gradient(45deg, {colors}); padding: 1rem; border-radius: 15px; color: white; text-align: center;">
+    <h4>{title}</h4>
+</div>
+"""
+
+def _metric(label, key, metrics, seen, money=False):
+    """st.metric showing the change since this viewer's previous refresh, if any."""
+    value = metrics[key]
+    delta = value - seen[key] if seen and seen[key] != value else None
+    if money:
+        st.metric(label, f"Rs. {value:,.0f}", None if delta is None else f"{delta:+,.0f}")
+    else:
+        st.metric(label, f"{value:,}", None if delta is None else f"{delta:+,}")
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def live_panel():
+    snapshot = monitor().snapshot()
+    metrics = snapshot.metrics
+    seen = st.session_state.get('live_seen')
+    st.session_state['live_seen'] = metrics
+    st.caption(f"Updated {snapshot.taken.strftime('%H:%M:%S')} · snapshot #{snapshot.version}")
+
+    # Create 4 columns for live stats
+    col1, col2, col3, col4 = st.columns(4)
+    
+    # Live patient flow
+    with col1:
+        st.markdown(CARD.format(colors="#56ab2f, #a8e6cf", title="👥 Patient Flow"), unsafe_allow_html=True)
+        _metric("Today's Appointments", 'today_appointments', metrics, seen)
+        _metric("🚑 Emergency Cases Today", 'emergency_cases', metrics, seen)
+    
+    # Live bed occupancy
+    total_beds, occupied_beds = metrics['total_beds'], metrics['occupied_beds']
+    occupancy_rate = (occupied_beds / total_beds * 100) if total_beds > 0 else 0
+    with col2:
+        st.markdown(CARD.format(colors="#667eea, #764ba2", title="🛏️ Bed Status"), unsafe_allow_html=True)
+        st.metric("Occupancy Rate", f"{occupancy_rate:.1f}%")
+        _metric("Available Beds", 'available_beds', metrics, seen)
+    
+    # Live lab status
+    with col3:
+        st.markdown(CARD.format(colors="#f093fb, #f5576c", title="🔬 Lab Status"), unsafe_allow_html=True)
+        _metric("Pending Tests", 'pending_tests', metrics, seen)
+        _metric("Completed Today", 'completed_today', metrics, seen)
+    
+    # Live revenue
+    with col4:
+        st.markdown(CARD.format(colors="#ffecd2, #fcb69f", title="💰 Revenue"), unsafe_allow_html=True)
+        _metric("Today's Revenue", 'today_revenue', metrics, seen, money=True)
+        _metric("Pending Amount", 'pending_amount', metrics, seen, money=True)
+    
+    st.divider()
+    
+    # Live charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📈 Hourly Patient Flow")
+        chart = snapshot.figure('hourly')
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+        else:
+            st.info("No appointments booked for today yet")
+    
+    with col2:
+        st.subheader("🎡 Department Load")
+        chart = snapshot.figure('dept_load')
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+    
+    # Critical alerts
+    st.subheader("⚠️ Critical Alerts")
+    
+    alerts = []
+    
+    # Check bed availability
+    if occupancy_rate > 90:
+        alerts.append("🛌 High bed occupancy - Consider discharge planning")
+    
+    # Check pending tests
+    if metrics['pending_tests'] > 10:
+        alerts.append(f"🔬 {metrics['pending_tests']} tests pending - Lab capacity check needed")
+    
+    # Check blood bank
+    if metrics['low_blood']:
+        alerts.append(f"🩸 Critical blood shortage: {metrics['low_blood']}")
+    
+    # Check ambulance availability
+    if metrics['available_ambulances'] < 2:
+        alerts.append(f"🚑 Low ambulance availability - Only {metrics['available_ambulances']} unit(s) available")
+    
+    if alerts:
+        for alert in alerts:
+            st.error(alert)
+    else:
+        st.success("✅ All systems operating normally")
+
+def render():
+    st.header("📊 Real-Time Hospital Monitoring")
+    
+    st.markdown(f"""
+    <div style="background: linear-gradient(45deg, #667eea, #764ba2); padding: 1rem; border-radius: 10px; color: white; text-align: center; margin-bottom: 2rem;">
+        <h3>🔄 Live Dashboard - Auto Refresh Every {REFRESH_SECONDS} Seconds</h3>
+        <p>Real-time monitoring of all hospital operations, checked for changes every {POLL_SECONDS} seconds</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    live_panel()
+    
+    if st.button("🔄 Refresh Data", key="refresh_monitoring"):
+        monitor().refresh(force=True)
+        st.rerun()
@@ -0,0 +1,51 @@
+# Medical Records page
+from datetime import datetime
+
+import streamlit as st
+
+from pool import get_conn
+from paging import paged_table
+from cache import bump
+from lookups import entity_picker
+from exporter import export_panel
+
+def render():
+    st.header("📋 Medical Records")
+    
+    tab1, tab2 = st.tabs(["📊 View Records", "➕ Add Record"])
+    
+    with tab1:
+        paged_table("records_view",
+                    """m.record_id, p.name as Patient, d.name as Doctor,
+                       m.diagnosis, m.prescription, m.notes, m.record_date""",
+                    """medical_records m
+                       JOIN patients p ON m.patient_id = p.patient_id
+                       JOIN doctors d ON m.doctor_id = d.doctor_id""",
+                    "m.record_id",
+                    {"Record Date": "m.record_date", "Record ID": "m.record_id"})
+        with st.expander("📤 Export"):
+            export_panel('medical_records')
+    
+    with tab2:
+        patient = entity_picker("Patient*", 'patients', "record_patient")
+        doctor = entity_picker("Doctor*", 'doctors', "record_doctor")
+        
+        with st.form("add_record"):
+            diagnosis = st.text_input("Diagnosis*")
+            prescription = st.text_area("Prescription")
+            notes = st.text_area("Notes")
+            
+            if st.form_submit_button("Add Record"):
+                if patient is None or doctor is None:
+                    st.error("Pick a patient and a doctor!")
+                elif diagnosis:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    c.execute("INSERT INTO medical_records (patient_id, doctor_id, diagnosis, prescription, notes, record_date) VALUES (?, ?, ?, ?, ?, ?)",
+                             (patient, doctor, diagnosis, prescription, notes, datetime.now().strftime('%Y-%m-%d')))
+                    conn.commit()
+                    bump('medical_records')
+                    st.success("✅ Medical record added!")
+                    st.rerun()
+                else:
+                    st.error("Diagnosis is required!")
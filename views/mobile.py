@@ -0,0 +1,86 @@
+# Mobile App page
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+def render():
+    st.header("📱 MediCare Mobile App")
+    
+    st.markdown("""
+    <div style="background: linear-gradient(45deg, #00d2ff, #3a7bd5); padding: 1rem; border-radius: 10px; color: white; text-align: center; margin-bottom: 2rem;">
+        <h3>📱 Mobile Application Interface</h3>
+        <p>Patient and staff mobile access portal</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["👥 Patient Portal", "👨⚕️ Staff Portal", "📊 App Analytics"])
+    
+    with tab1:
+        st.subheader("👥 Patient Mobile Portal")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("### 📱 Patient Login")
+            patient_id = st.text_input("Patient ID")
+            password = st.text_input("Password", type="password")
+            if st.button("🔑 Login"):
+                st.success("Welcome to MediCare App!")
+        
+        with col2:
+            st.markdown("### 🌟 App Features")
+            features = [
+                "📅 Book Appointments",
+                "📋 View Medical Records",
+                "💰 Check Bills",
+                "🔬 Lab Results",
+                "💊 Prescriptions",
+                "📞 Emergency Contact"
+            ]
+            for feature in features:
+                st.markdown(f"- {feature}")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("📅 Next Appointment", "Tomorrow")
+        col2.metric("💰 Pending Bills", "Rs. 2,500")
+        col3.metric("🔬 Lab Results", "2 Ready")
+        col4.metric("💊 Prescriptions", "1 Active")
+    
+    with tab2:
+        st.subheader("👨⚕️ Staff Mobile Portal")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("### 👨⚕️ Staff Login")
+            staff_id = st.text_input("Staff ID")
+            staff_password = st.text_input("Staff Password", type="password")
+            if st.button("🔑 Staff Login"):
+                st.success("Welcome Staff Member!")
+        
+        with col2:
+            st.markdown("### 🎆 Staff Features")
+            staff_features = [
+                "📅 View Schedule",
+                "👥 Patient Info",
+                "📋 Medical Records",
+                "🔬 Lab Orders",
+                "🛏️ Bed Management",
+                "🚑 Emergency Alerts"
+            ]
+            for feature in staff_features:
+                st.markdown(f"- {feature}")
+    
+    with tab3:
+        st.subheader("📊 Mobile App Analytics")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("📱 Downloads", "15,420")
+        col2.metric("👥 Active Users", "8,750")
+        col3.metric("⭐ Rating", "4.8/5")
+        col4.metric("📈 Daily Usage", "6.2 hrs")
+        
+        # Usage chart
+        days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+        usage = [850, 920, 780, 950, 1100, 650, 580]
+        usage_data = pd.DataFrame({'Day': days, 'Users': usage})
+        fig = px.bar(usage_data, x='Day', y='Users', title='Daily App Usage')
+        st.plotly_chart(fig, use_container_width=True)
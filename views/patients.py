@@ -0,0 +1,56 @@
+# Patient Management page
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+
+from pool import get_conn
+from paging import paged_table
+from search import search_patients
+from cache import bump
+from importer import import_panel
+from exporter import export_panel
+
+def render():
+    st.header("👥 Patient Management")
+    
+    tab1, tab2, tab3 = st.tabs(["📋 View Patients", "➕ Add Patient", "📥 Bulk Import"])
+    
+    with tab1:
+        search = st.text_input("🔍 Search by name, phone, email or address:")
+        if search:
+            names, rows = search_patients(get_conn(), search)
+            st.dataframe(pd.DataFrame(rows, columns=names), use_container_width=True, hide_index=True)
+            st.caption(f"Top {len(rows)} matches")
+        else:
+            paged_table("patients_view", "*", "patients", "patient_id",
+                        {"Patient ID": "patient_id", "Name": "name", "Registration Date": "registration_date"})
+        with st.expander("📤 Export"):
+            export_panel('patients')
+    
+    with tab2:
+        with st.form("add_patient"):
+            name = st.text_input("Name*")
+            col1, col2 = st.columns(2)
+            age = col1.number_input("Age", 1, 120, 30)
+            gender = col2.selectbox("Gender", ["Male", "Female", "Other"])
+            phone = st.text_input("Phone")
+            email = st.text_input("Email")
+            address = st.text_area("Address")
+            blood = st.selectbox("Blood Group", ["A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-"])
+            
+            if st.form_submit_button("Add Patient"):
+                if name:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    c.execute("INSERT INTO patients (name, age, gender, phone, email, address, blood_group, registration_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (name, age, gender, phone, email, address, blood, datetime.now().strftime('%Y-%m-%d')))
+                    conn.commit()
+                    bump('patients')
+                    st.success(f"✅ Patient {name} added!")
+                    st.rerun()
+                else:
+                    st.error("Name is required!")
+    
+    with tab3:
+        import_panel('patients')
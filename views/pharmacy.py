@@ -0,0 +1,102 @@
+# Pharmacy page
+import streamlit as st
+
+from pool import get_conn
+from paging import paged_table
+from cache import bump, cached
+from lookups import entity_picker, labels
+from exporter import export_panel
+from rollups import PHARMACY_REVENUE_SQL
+from dispensing import dispense, dispense_many, resolve
+
+def render():
+    st.header("💊 Pharmacy Management")
+
+    tab1, tab2, tab3 = st.tabs(["📊 View Prescriptions", "➕ Issue Medicine", "📋 Dispensing Queue"])
+
+    with tab1:
+        paged_table("prescriptions_view",
+                    """ph.prescription_id, p.name as patient_name, d.name as doctor_name,
+                       ph.medicine_name, ph.dosage, ph.quantity, ph.price, ph.issue_date""",
+                    """pharmacy ph
+                       JOIN patients p ON ph.patient_id = p.patient_id
+                       JOIN doctors d ON ph.doctor_id = d.doctor_id""",
+                    "ph.prescription_id",
+                    {"Issue Date": "ph.issue_date", "Prescription ID": "ph.prescription_id"})
+        with st.expander("📤 Export"):
+            export_panel('pharmacy')
+
+        total_sales, today_sales, today_count = cached(
+            PHARMACY_REVENUE_SQL, lambda: get_conn().execute(PHARMACY_REVENUE_SQL).fetchone())
+        col1, col2 = st.columns(2)
+        col1.metric("💰 Pharmacy Revenue", f"Rs. {total_sales:,.0f}")
+        col2.metric("📅 Dispensed Today", f"Rs. {today_sales:,.0f}", f"{today_count:,.0f} line(s)", delta_color="off")
+
+    with tab2:
+        patient = entity_picker("Patient*", 'patients', "medicine_patient")
+        doctor = entity_picker("Doctor*", 'doctors', "medicine_doctor")
+
+        medicines = labels('medicines')
+        item_ids = st.multiselect("Medicines*", list(medicines), format_func=medicines.get, key="rx_items")
+        lines = []
+        for item_id in item_ids:
+            col1, col2 = st.columns([3, 1])
+            dosage = col1.text_input(f"Dosage for {medicines[item_id]}", key=f"rx_dosage_{item_id}")
+            quantity = col2.number_input("Quantity", 1, 1000, 10, key=f"rx_qty_{item_id}")
+            lines.append((item_id, dosage or None, quantity))
+
+        if st.button("💊 Dispense", disabled=patient is None or doctor is None or not lines):
+            try:
+                issued = dispense(get_conn(), patient, doctor, lines)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                bump('pharmacy', 'inventory')
+                st.success(f"✅ {len(issued)} medicine(s) issued, Rs. {sum(row[3] for row in issued):,.0f}")
+                st.rerun()
+
+    with tab3:
+        st.caption("Issue a queue of prescriptions at once: one `patient_id, doctor_id, medicine, quantity[, dosage]` "
+                   "per line. Consecutive lines for the same patient and doctor form one prescription, issued "
+                   "whole or not at all.")
+        text = st.text_area("Prescriptions", key="rx_queue",
+                            placeholder="12, 3, Paracetamol, 20, 500mg\n12, 3, Omeprazole, 14\n40, 7, Cetirizine, 10")
+        if st.button("💊 Dispense All", disabled=not text.strip()):
+            try:
+                prescriptions = _parse_queue(text)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                _dispense_queue(prescriptions)
+
+def _dispense_queue(prescriptions):
+    results = dispense_many(get_conn(), prescriptions)
+    done = [issued for issued, _ in results if issued]
+    if done:
+        bump('pharmacy', 'inventory')
+    st.success(f"✅ {len(done)} of {len(results)} prescription(s) issued, "
+               f"Rs. {sum(row[3] for issued in done for row in issued):,.0f}")
+    st.dataframe({"Patient": [patient for patient, _, _ in prescriptions],
+                  "Doctor": [doctor for _, doctor, _ in prescriptions],
+                  "Prescriptions": [", ".join(f"#{row[0]}" for row in issued) if issued else ""
+                                    for issued, _ in results],
+                  "Problem": [reason or "" for _, reason in results]},
+                 use_container_width=True, hide_index=True)
+
+def _parse_queue(text):
+    """[(patient_id, doctor_id, [(item_id, dosage, quantity)])] from the queue text."""
+    rows = []
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        fields = [field.strip() for field in line.split(',')]
+        if len(fields) not in (4, 5) or not (fields[0].isdigit() and fields[1].isdigit() and fields[3].isdigit()):
+            raise ValueError(f"line {number}: expected patient_id, doctor_id, medicine, quantity[, dosage]")
+        rows.append((int(fields[0]), int(fields[1]), fields[2], int(fields[3]), fields[4] if len(fields) == 5 else None))
+    items = resolve(get_conn(), [medicine for _, _, medicine, _, _ in rows])
+    prescriptions = []
+    for patient, doctor, medicine, quantity, dosage in rows:
+        if not prescriptions or prescriptions[-1][:2] != (patient, doctor):
+            prescriptions.append((patient, doctor, []))
+        prescriptions[-1][2].append((items[medicine], dosage, quantity))
+    return prescriptions
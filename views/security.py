@@ -0,0 +1,55 @@
+# Security Center page
+import streamlit as st
+import pandas as pd
+
+def render():
+    st.header("🔐 Hospital Security Center")
+    
+    st.markdown("""
+    <div style="background: linear-gradient(45deg, #ff6b6b, #ee5a24); padding: 1rem; border-radius: 10px; color: white; text-align: center; margin-bottom: 2rem;">
+        <h3>🛡️ Security Monitoring Dashboard</h3>
+        <p>Real-time security and access control</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["📹 CCTV Monitor", "🚪 Access Control", "🚑 Emergency Alerts"])
+    
+    with tab1:
+        st.subheader("📹 CCTV Camera Status")
+        cameras = [
+            {"Camera": "Main Entrance", "Status": "Online", "Location": "Ground Floor"},
+            {"Camera": "Emergency Ward", "Status": "Online", "Location": "1st Floor"},
+            {"Camera": "ICU Corridor", "Status": "Offline", "Location": "2nd Floor"},
+            {"Camera": "Pharmacy", "Status": "Online", "Location": "Ground Floor"}
+        ]
+        camera_df = pd.DataFrame(cameras)
+        st.dataframe(camera_df, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        online = len([c for c in cameras if c["Status"] == "Online"])
+        offline = len([c for c in cameras if c["Status"] == "Offline"])
+        col1.metric("🟢 Online", online)
+        col2.metric("🔴 Offline", offline)
+    
+    with tab2:
+        st.subheader("🚪 Access Control System")
+        access_logs = [
+            {"Time": "14:30", "Person": "Dr. Ahmed Khan", "Location": "ICU", "Access": "Granted"},
+            {"Time": "14:25", "Person": "Nurse Sarah", "Location": "Pharmacy", "Access": "Granted"},
+            {"Time": "14:20", "Person": "Unknown", "Location": "Emergency", "Access": "Denied"}
+        ]
+        access_df = pd.DataFrame(access_logs)
+        st.dataframe(access_df, use_container_width=True)
+    
+    with tab3:
+        st.subheader("🚑 Emergency Alert System")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if st.button("🚑 Fire Emergency"):
+                st.error("🔥 FIRE ALERT ACTIVATED!")
+        with col2:
+            if st.button("🚨 Medical Emergency"):
+                st.error("⚕️ MEDICAL EMERGENCY!")
+        with col3:
+            if st.button("🔒 Security Breach"):
+                st.error("🛡️ SECURITY BREACH!")
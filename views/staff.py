@@ -0,0 +1,50 @@
+# Staff Management page
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+
+from pool import get_conn
+from cache import bump
+from lookups import labels
+
+def render():
+    st.header("👷 Staff Management")
+    
+    tab1, tab2 = st.tabs(["📊 View Staff", "➕ Add Staff"])
+    
+    with tab1:
+        conn = get_conn()
+        staff = pd.read_sql("""
+            SELECT s.staff_id, s.name, s.role, d.dept_name, s.phone, s.email, s.salary, s.join_date
+            FROM staff s
+            LEFT JOIN departments d ON s.dept_id = d.dept_id
+        """, conn)
+        st.dataframe(staff, use_container_width=True)
+        
+        if not staff.empty:
+            total_salary = staff['salary'].sum()
+            st.metric("💰 Total Monthly Salary", f"Rs. {total_salary:,.0f}")
+    
+    with tab2:
+        with st.form("add_staff"):
+            name = st.text_input("Name*")
+            role = st.selectbox("Role*", ["Nurse", "Receptionist", "Lab Technician", "Pharmacist", "Cleaner", "Security", "Admin"])
+            depts = labels('departments')
+            dept = st.selectbox("Department", list(depts), format_func=depts.get)
+            phone = st.text_input("Phone")
+            email = st.text_input("Email")
+            salary = st.number_input("Salary (Rs.)", 0, 200000, 40000)
+            
+            if st.form_submit_button("Add Staff"):
+                if name:
+                    conn = get_conn()
+                    c = conn.cursor()
+                    c.execute("INSERT INTO staff (name, role, dept_id, phone, email, salary, join_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (name, role, dept, phone, email, salary, datetime.now().strftime('%Y-%m-%d')))
+                    conn.commit()
+                    bump('staff')
+                    st.success(f"✅ Staff {name} added!")
+                    st.rerun()
+                else:
+                    st.error("Name is required!")